@@ -0,0 +1,50 @@
+"""Conditional GET support (ETag / If-None-Match) for read endpoints."""
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_session
+from app.services.data_version_service import DataVersionService
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against an entity tag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_get(scope: str) -> Callable:
+    """
+    Dependency validating a request against the version of a data scope.
+
+    The version is read before the route runs its queries, so the tag can
+    only be older than the data it is sent with (the next request then
+    refetches), never newer. A matching ``If-None-Match`` ends the request
+    with ``304 Not Modified`` after that single primary key lookup;
+    otherwise the ``ETag`` is attached to the route's response.
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(get_session),
+    ) -> None:
+        version = await DataVersionService.get_version(session, scope)
+        if version is None:
+            return
+
+        etag = DataVersionService.etag(scope, version)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
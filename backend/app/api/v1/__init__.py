@@ -1,5 +1,18 @@
 """API v1 routes."""
-from app.api.v1 import admin, posts, tags, feeds, bookmarks, search, channels, scrape
+from app.api.v1 import (
+    admin, posts, tags, feeds, bookmarks, search, suggest, saved_searches, channels, scrape,
+)
 
-__all__ = ["admin", "posts", "tags", "feeds", "bookmarks", "search", "channels", "scrape"]
+__all__ = [
+    "admin",
+    "posts",
+    "tags",
+    "feeds",
+    "bookmarks",
+    "search",
+    "suggest",
+    "saved_searches",
+    "channels",
+    "scrape",
+]
 
@@ -2,8 +2,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.db.session import get_session
+from app.schemas.retag_job import RetagJobSchema
 from app.services.mock_llm_tagger import MockLLMTagger
+from app.services.retag_service import RetagService
+from app.services.search_cache import get_search_cache
+from app.services.search_service import SearchService
+from app.services.tag_count_service import TagCountService
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -32,3 +38,76 @@ async def tag_untagged_posts(
     result = await MockLLMTagger.tag_all_untagged_posts(session, limit=limit)
     return result
 
+
+
+@router.post("/reconcile-tag-counts")
+async def reconcile_tag_counts(
+    session: AsyncSession = Depends(get_session),
+) -> dict:
+    """Recompute tag usage counters from post_tags and fix any drift."""
+    corrected = await TagCountService.reconcile(session)
+    return {"corrected": corrected}
+
+
+@router.post("/retag", response_model=RetagJobSchema, status_code=202)
+async def start_retag(
+    tagger_version: str = Query(None, max_length=100, description="Target tagger version (default: current)"),
+    chunk_size: int = Query(None, ge=1, le=10000, description="Posts per chunk"),
+    concurrency: int = Query(None, ge=1, le=32, description="Chunks processed in parallel"),
+    session: AsyncSession = Depends(get_session),
+) -> RetagJobSchema:
+    """
+    Start (or resume) re-tagging the whole corpus against a tagger version.
+
+    Only LLM-authored tags are replaced; human tags are preserved. The job
+    runs in the background; poll `GET /admin/retag/{job_id}` for progress.
+    """
+    settings = get_settings()
+    job = await RetagService.get_or_create_job(
+        session,
+        tagger_version=tagger_version or settings.tagger_version,
+        chunk_size=chunk_size or settings.retag_chunk_size,
+        concurrency=concurrency or settings.retag_max_concurrency,
+    )
+    RetagService.start_in_background(job.id)
+    return RetagJobSchema.model_validate(job)
+
+
+@router.get("/retag/{job_id}", response_model=RetagJobSchema)
+async def get_retag_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_session),
+) -> RetagJobSchema:
+    """Get re-tag job progress."""
+    job = await RetagService.get_by_id(session, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Re-tag job not found")
+    return RetagJobSchema.model_validate(job)
+
+
+@router.get("/search-cache")
+async def get_search_cache_stats() -> dict:
+    """Search result cache size and hit-rate metrics (this worker only)."""
+    return get_search_cache().stats()
+
+
+@router.delete("/search-cache")
+async def clear_search_cache() -> dict:
+    """Drop every cached search result page (this worker only)."""
+    return {"cleared": get_search_cache().clear()}
+
+
+@router.post("/search-snapshot")
+async def write_search_snapshot() -> dict:
+    """
+    Write this worker's search index to the snapshot file and remap it.
+
+    Other workers pick the snapshot up on their next start.
+    """
+    if get_settings().search_backend != "memory":
+        raise HTTPException(status_code=400, detail="Search backend is not 'memory'")
+    try:
+        count = SearchService.save_snapshot()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"posts": count}
@@ -1,12 +1,16 @@
 """Bookmarks API routes."""
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import conditional_get
 from app.db.session import get_session
 from app.schemas.bookmark import BookmarkSchema
+from app.schemas.post import PostPage
 from app.services.bookmark_service import BookmarkService
+from app.services.counts import CountMode
+from app.services.post_hydrator import PostHydrator, get_post_hydrator, page_response
 
 router = APIRouter(prefix="/bookmarks", tags=["bookmarks"])
 
@@ -41,27 +45,39 @@ async def remove_bookmark(
         raise HTTPException(status_code=404, detail="Bookmark not found")
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=PostPage, dependencies=[Depends(conditional_get("posts"))])
 async def get_bookmarks(
+    response: Response,
     offset: int = Query(0, ge=0, alias="skip", description="Number of bookmarks to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of bookmarks to return"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page (overrides skip)"),
+    count: CountMode = Query("estimate", description="Total count: exact, estimate or none"),
     session: AsyncSession = Depends(get_session),
-) -> dict:
-    """Get all bookmarked posts with pagination."""
-    from app.schemas.post import PostSchema
+    hydrator: PostHydrator = Depends(get_post_hydrator),
+) -> Response:
+    """
+    Get all bookmarked posts with pagination, most recently bookmarked first.
 
-    bookmarks, total = await BookmarkService.get_all(session, skip=offset, limit=limit)
+    Pass the `next_cursor` of a page as `cursor` to get the next one.
+    `count` works as on `/posts`.
+    """
+    try:
+        bookmarks, total, next_cursor = await BookmarkService.get_all(
+            session, skip=offset, limit=limit, cursor=cursor, count=count
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Convert bookmarks to post format
-    posts_data = []
-    for bm in bookmarks:
-        post_dict = PostSchema.model_validate(bm.post).model_dump()
-        post_dict["is_bookmarked"] = True
-        posts_data.append(post_dict)
+    posts_data = await hydrator.hydrate([bm.post for bm in bookmarks], bookmarked=True)
 
-    return {
-        "data": posts_data,
-        "total": total,
-        "has_more": (offset + limit) < total,
-    }
+    return page_response(
+        {
+            "data": posts_data,
+            "total": total,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
+        },
+        response,
+    )
 
@@ -1,7 +1,7 @@
 """Channels API routes."""
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
@@ -15,6 +15,7 @@ router = APIRouter(prefix="/channels", tags=["channels"])
 
 @router.get("", response_model=List[ChannelSchema])
 async def get_channels(
+    search: Optional[str] = Query(None, description="Substring or fuzzy match on username/name"),
     session: AsyncSession = Depends(get_session),
 ) -> List[ChannelSchema]:
     """
@@ -22,7 +23,7 @@ async def get_channels(
 
     Returns all channels (both active and inactive).
     """
-    channels = await ChannelService.get_all_channels(session)
+    channels = await ChannelService.get_all_channels(session, search=search)
     return [ChannelSchema.model_validate(channel) for channel in channels]
 
 
@@ -1,9 +1,10 @@
 """Feeds API routes."""
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import conditional_get
 from app.db.session import get_session
 from app.schemas.feed import FeedSchema, FeedCreate, FeedUpdate
 from app.services.feed_service import FeedService
@@ -11,7 +12,7 @@ from app.services.feed_service import FeedService
 router = APIRouter(prefix="/feeds", tags=["feeds"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=dict, dependencies=[Depends(conditional_get("feeds"))])
 async def get_feeds(
     session: AsyncSession = Depends(get_session),
 ) -> dict:
@@ -45,7 +46,25 @@ async def get_feeds(
     return {"feeds": feeds_list}
 
 
-@router.get("/{feed_id}", response_model=dict)
+@router.get("/preview", response_model=dict)
+async def preview_feed(
+    tag_filters: Optional[List[str]] = Query(None, description="Tag names, any of which a post must carry"),
+    tag_expr: Optional[str] = Query(None, description="Boolean tag expression, e.g. `nlp AND NOT hiring`"),
+) -> dict:
+    """
+    Count the posts a feed with these filters would show.
+
+    Meant for live "N posts match" previews while a feed is edited: the
+    count comes from in-memory tag bitmaps without querying the database.
+    """
+    try:
+        count = await FeedService.preview_count(tag_filters, tag_expr)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"count": count}
+
+
+@router.get("/{feed_id}", response_model=dict, dependencies=[Depends(conditional_get("feeds"))])
 async def get_feed(
     feed_id: str,
     session: AsyncSession = Depends(get_session),
@@ -1,34 +1,67 @@
 """Posts API routes."""
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import conditional_get
 from app.db.session import get_session
-from app.schemas.post import PostSchema, PostUpdate, PostTagsUpdate
+from app.models.tag import AuthorType
+from app.schemas.post import PostPage, PostSchema, PostUpdate, PostTagsUpdate, RelatedPostsPage
+from app.schemas.tag import TagCreate
+from app.services.counts import CountMode
+from app.services.post_hydrator import (
+    RELATED_PAGE_ADAPTER,
+    PostHydrator,
+    get_post_hydrator,
+    page_response,
+)
 from app.services.post_service import PostService
-from app.services.bookmark_service import BookmarkService
-from app.services.tag_service import TagService
+from app.services.related_service import RelatedService
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=PostPage, dependencies=[Depends(conditional_get("posts"))])
 async def get_posts(
+    response: Response,
     offset: int = Query(0, ge=0, alias="skip", description="Number of posts to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of posts to return"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page (overrides skip)"),
     feed_id: Optional[str] = Query(None, description="Filter by feed ID (use 'all' for all posts)"),
     tags: Optional[List[str]] = Query(None, description="Filter by tag names (array)"),
     search: Optional[str] = Query(None, description="Search query string"),
+    tag_expr: Optional[str] = Query(None, description="Boolean tag expression, e.g. `nlp AND NOT hiring`"),
+    facets: bool = Query(False, description="Include facet counts for the full result set"),
+    facet_interval: Literal["day", "week", "month"] = Query("day", description="Date facet bucket size"),
+    facet_limit: int = Query(20, ge=1, le=100, description="Values returned per facet"),
+    count: CountMode = Query("estimate", description="Total count: exact, estimate or none"),
     session: AsyncSession = Depends(get_session),
-) -> dict:
+    hydrator: PostHydrator = Depends(get_post_hydrator),
+) -> Response:
     """
     Get paginated list of posts with optional filtering.
 
     Supports filtering by:
     - feed_id: Filter posts by feed's tag filters (use 'all' for all posts)
     - tags: Array of tag names
-    - search: Full-text search in post content
+    - search: Full-text search in post content, with the `/search` query
+      syntax (`channel:`, `tag:`, `after:`, `before:`, `"phrases"`)
+    - tag_expr: Tags combined with `AND`, `OR`, `NOT` and parentheses,
+      served from in-memory tag bitmaps (not combinable with search or facets)
+
+    With `facets=true` the response also carries post counts per tag, per
+    channel and per date bucket over all matching posts.
+
+    Every page carries a `next_cursor` (null on the last page). Passing it
+    back as `cursor` continues after the last post seen, which stays fast at
+    any depth and does not repeat posts when new ones arrive; `skip` still
+    works.
+
+    `count` picks how `total` is computed: `exact` counts every matching
+    post, `estimate` (default) uses cached tag counters or the query
+    planner's estimate, `none` returns `total: null` and is the cheapest for
+    infinite scroll, which only needs `has_more`.
     """
     # Convert feed_id string to int (handle 'all' as None)
     feed_id_int = None
@@ -38,31 +71,44 @@ async def get_posts(
         except ValueError:
             feed_id_int = None
 
-    posts_list, total = await PostService.get_all(
-        session=session,
-        skip=offset,
-        limit=limit,
-        feed_id=feed_id_int,
-        tag_names=tags,
-        search_query=search,
-    )
-
-    # Add is_bookmarked flag to each post
-    posts_with_bookmarks = []
-    for post in posts_list:
-        is_bookmarked = await BookmarkService.get_by_post_id(session, post.id) is not None
-        post_dict = PostSchema.model_validate(post).model_dump()
-        post_dict["is_bookmarked"] = is_bookmarked
-        posts_with_bookmarks.append(post_dict)
-
-    return {
-        "data": posts_with_bookmarks,
+    if tag_expr is not None and facets:
+        raise HTTPException(status_code=400, detail="Facets are not available with tag_expr")
+
+    try:
+        posts_list, total, next_cursor = await PostService.get_all(
+            session=session,
+            skip=offset,
+            limit=limit,
+            feed_id=feed_id_int,
+            tag_names=tags,
+            search_query=search,
+            cursor=cursor,
+            count=count,
+            tag_expression=tag_expr,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    page = {
+        "data": await hydrator.hydrate(posts_list),
         "total": total,
-        "has_more": (offset + limit) < total,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
     }
-
-
-@router.get("/{post_id}", response_model=PostSchema)
+    if facets:
+        page["facets"] = await PostService.get_facets(
+            session,
+            feed_id=feed_id_int,
+            tag_names=tags,
+            search_query=search,
+            interval=facet_interval,
+            limit=facet_limit,
+        )
+    # Encoded here rather than through response_model (see page_response)
+    return page_response(page, response)
+
+
+@router.get("/{post_id}", response_model=PostSchema, dependencies=[Depends(conditional_get("posts"))])
 async def get_post(
     post_id: str,
     session: AsyncSession = Depends(get_session),
@@ -72,12 +118,47 @@ async def get_post(
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    is_bookmarked = await BookmarkService.get_by_post_id(session, post_id) is not None
+    # Tags and bookmarks are eager-loaded by get_by_id
     post_dict = PostSchema.model_validate(post).model_dump()
-    post_dict["is_bookmarked"] = is_bookmarked
+    post_dict["is_bookmarked"] = bool(post.bookmarks)
     return PostSchema(**post_dict)
 
 
+@router.get("/{post_id}/related", response_model=RelatedPostsPage)
+async def get_related_posts(
+    post_id: str,
+    response: Response,
+    limit: int = Query(10, ge=1, le=50, description="Number of related posts to return"),
+    include_same_channel: bool = Query(False, description="Also return posts from the post's own channel"),
+    session: AsyncSession = Depends(get_session),
+    hydrator: PostHydrator = Depends(get_post_hydrator),
+) -> Response:
+    """
+    Get posts similar to a post ("more like this"), from other channels by default.
+
+    Candidates come from MinHash LSH buckets computed at ingest and are
+    ranked by exact word-set Jaccard `similarity`, then by `shared_tags`.
+    """
+    post = await PostService.get_by_id(session, post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    related = await RelatedService.get_related(
+        session, post, limit=limit, include_same_channel=include_same_channel
+    )
+
+    # Add tags, is_bookmarked flag and scores to each post
+    await hydrator.load(item.post for item in related)
+    posts_data = []
+    for item in related:
+        post_dict = hydrator.to_dict(item.post)
+        post_dict["similarity"] = round(item.similarity, 4)
+        post_dict["shared_tags"] = item.shared_tags
+        posts_data.append(post_dict)
+
+    return page_response({"data": posts_data}, response, RELATED_PAGE_ADAPTER)
+
+
 @router.patch("/{post_id}/tags", response_model=PostSchema)
 async def update_post_tags(
     post_id: str,
@@ -90,37 +171,16 @@ async def update_post_tags(
     Request body should contain a list of tags with name and author_type.
     This replaces all existing tags with the provided tags.
     """
-    post = await PostService.get_by_id(session, post_id)
+    tags = [
+        TagCreate(name=tag_info["name"], author_type=AuthorType(tag_info.get("author_type", "human")))
+        for tag_info in tags_data.tags
+        if tag_info.get("name")
+    ]
+
+    post = await PostService.replace_tags(session, post_id, tags)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    # Get or create tags and collect their IDs
-    tag_ids = []
-    for tag_info in tags_data.tags:
-        tag_name = tag_info.get("name")
-        if not tag_name:
-            continue
-
-        from app.schemas.tag import TagCreate
-        from app.models.tag import AuthorType
-
-        author_type = AuthorType(tag_info.get("author_type", "human"))
-        tag_create = TagCreate(name=tag_name, author_type=author_type)
-        tag = await TagService.get_or_create(session, tag_create)
-        tag_ids.append(tag.id)
-
-    # Remove all existing tags and add new ones
-    existing_tag_ids = [tag.id for tag in post.tags]
-    if existing_tag_ids:
-        await PostService.remove_tags(session, post_id, existing_tag_ids)
-
-    if tag_ids:
-        await PostService.add_tags(session, post_id, tag_ids)
-
-    # Refresh post with new tags
-    post = await PostService.get_by_id(session, post_id)
-    is_bookmarked = await BookmarkService.get_by_post_id(session, post_id) is not None
     post_dict = PostSchema.model_validate(post).model_dump()
-    post_dict["is_bookmarked"] = is_bookmarked
+    post_dict["is_bookmarked"] = bool(post.bookmarks)
     return PostSchema(**post_dict)
-
@@ -0,0 +1,122 @@
+"""Saved searches API routes."""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_session
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchSchema, SavedSearchUpdate
+from app.schemas.post import SavedSearchMatchesPage
+from app.services.post_hydrator import (
+    MATCHES_PAGE_ADAPTER,
+    PostHydrator,
+    get_post_hydrator,
+    page_response,
+)
+from app.services.saved_search_service import SavedSearchService
+
+router = APIRouter(prefix="/saved-searches", tags=["saved-searches"])
+
+
+@router.get("", response_model=List[SavedSearchSchema])
+async def get_saved_searches(
+    session: AsyncSession = Depends(get_session),
+) -> List[SavedSearchSchema]:
+    """Get all saved searches."""
+    saved_searches = await SavedSearchService.get_all(session)
+    return [SavedSearchSchema.model_validate(saved_search) for saved_search in saved_searches]
+
+
+@router.post("", response_model=SavedSearchSchema, status_code=201)
+async def create_saved_search(
+    data: SavedSearchCreate,
+    session: AsyncSession = Depends(get_session),
+) -> SavedSearchSchema:
+    """
+    Save a search query.
+
+    The query uses the `/search` syntax and needs at least one word, phrase
+    or `channel:` clause. Posts ingested from now on that match it are
+    collected under `GET /saved-searches/{id}/matches`.
+    """
+    try:
+        saved_search = await SavedSearchService.create(session, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SavedSearchSchema.model_validate(saved_search)
+
+
+@router.get("/{saved_search_id}", response_model=SavedSearchSchema)
+async def get_saved_search(
+    saved_search_id: int,
+    session: AsyncSession = Depends(get_session),
+) -> SavedSearchSchema:
+    """Get a single saved search by ID."""
+    saved_search = await SavedSearchService.get_by_id(session, saved_search_id)
+    if not saved_search:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return SavedSearchSchema.model_validate(saved_search)
+
+
+@router.patch("/{saved_search_id}", response_model=SavedSearchSchema)
+async def update_saved_search(
+    saved_search_id: int,
+    data: SavedSearchUpdate,
+    session: AsyncSession = Depends(get_session),
+) -> SavedSearchSchema:
+    """Rename a saved search or change its query (which clears its matches)."""
+    try:
+        saved_search = await SavedSearchService.update(session, saved_search_id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not saved_search:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return SavedSearchSchema.model_validate(saved_search)
+
+
+@router.delete("/{saved_search_id}", status_code=204)
+async def delete_saved_search(
+    saved_search_id: int,
+    session: AsyncSession = Depends(get_session),
+):
+    """Delete a saved search and its matches."""
+    success = await SavedSearchService.delete(session, saved_search_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+
+
+@router.get("/{saved_search_id}/matches", response_model=SavedSearchMatchesPage)
+async def get_saved_search_matches(
+    saved_search_id: int,
+    response: Response,
+    offset: int = Query(0, ge=0, alias="skip", description="Number of posts to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Number of posts to return"),
+    session: AsyncSession = Depends(get_session),
+    hydrator: PostHydrator = Depends(get_post_hydrator),
+) -> Response:
+    """Get the posts matched by a saved search, most recently matched first."""
+    saved_search = await SavedSearchService.get_by_id(session, saved_search_id)
+    if not saved_search:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+
+    matches, total = await SavedSearchService.get_matches(
+        session, saved_search_id, skip=offset, limit=limit
+    )
+
+    # Add tags, is_bookmarked flag and match time to each post
+    await hydrator.load(post for post, _ in matches)
+    posts_data = []
+    for post, match in matches:
+        post_dict = hydrator.to_dict(post)
+        post_dict["matched_at"] = match.matched_at
+        posts_data.append(post_dict)
+
+    return page_response(
+        {
+            "data": posts_data,
+            "total": total,
+            "has_more": (offset + limit) < total,
+        },
+        response,
+        MATCHES_PAGE_ADAPTER,
+    )
@@ -1,51 +1,110 @@
 """Search API routes."""
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.db.session import get_session
-from app.schemas.post import PostSchema
+from app.services.cursors import decode_offset, encode_offset
+from app.schemas.post import SearchPage
+from app.services.post_hydrator import (
+    SEARCH_PAGE_ADAPTER,
+    PostHydrator,
+    get_post_hydrator,
+    page_response,
+)
 from app.services.post_service import PostService
-from app.services.bookmark_service import BookmarkService
+from app.services.search_service import SearchService
 
 router = APIRouter(prefix="/search", tags=["search"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=SearchPage)
 async def search_posts(
+    response: Response,
     q: str = Query(..., description="Search query"),
     offset: int = Query(0, ge=0, alias="skip", description="Number of posts to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of posts to return"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page (overrides skip)"),
+    include_content: bool = Query(True, description="Include the full post content"),
+    facets: bool = Query(False, description="Include facet counts for all matching posts"),
+    facet_interval: Literal["day", "week", "month"] = Query("day", description="Date facet bucket size"),
+    facet_limit: int = Query(20, ge=1, le=100, description="Values returned per facet"),
     session: AsyncSession = Depends(get_session),
-) -> dict:
+    hydrator: PostHydrator = Depends(get_post_hydrator),
+) -> Response:
     """
     Search posts using full-text search.
 
-    Note: In Phase 6, this will use BM25 algorithm.
-    For now, it uses simple SQL LIKE search.
+    Besides plain words, the query understands `channel:name`, `tag:name`,
+    `after:date` and `before:date` (dates as `YYYY`, `YYYY-MM` or
+    `YYYY-MM-DD`) and `"quoted phrases"`. Words match if any of them occurs,
+    phrases and the other clauses must all match.
+
+    With the default `memory` backend, results are ranked by BM25 relevance
+    from the in-process inverted index; the `sql` backend falls back to a
+    substring match ordered by recency. Repeated searches are served from
+    an in-memory result cache.
+
+    Each hit carries a `snippet`: the best-matching passage of the post,
+    HTML-escaped, with matched words wrapped in `<mark>`. Pass
+    `include_content=false` to omit the full content. With `facets=true`
+    the response also carries post counts per tag, per channel and per date
+    bucket over all matching posts.
+
+    Pages carry a `next_cursor` to pass back as `cursor`. Relevance scores
+    shift as posts are ingested, so search cursors address a rank position
+    rather than a row. `total` is an estimate (`total_is_estimate`): ranked
+    retrieval may stop before counting every match. `has_more` is exact,
+    from fetching one post past the page.
     """
     if not q or not q.strip():
         raise HTTPException(status_code=400, detail="Search query cannot be empty")
 
-    posts_list, total = await PostService.get_all(
-        session=session,
-        skip=offset,
-        limit=limit,
-        search_query=q.strip(),
+    try:
+        if cursor:
+            offset = decode_offset(cursor)
+        # One post past the page tells whether another page follows: the
+        # total may be an upper bound or an extrapolation
+        posts_list, total = await SearchService.search(
+            session=session,
+            query=q.strip(),
+            skip=offset,
+            limit=limit + 1,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    has_more = len(posts_list) > limit
+    posts_list = posts_list[:limit]
+
+    snippets = SearchService.snippets(
+        posts_list, q.strip(), get_settings().search_snippet_max_chars
     )
 
-    # Add is_bookmarked flag to each post
+    # Add tags, is_bookmarked flag and snippet to each post
+    await hydrator.load(posts_list)
     posts_with_bookmarks = []
     for post in posts_list:
-        is_bookmarked = await BookmarkService.get_by_post_id(session, post.id) is not None
-        post_dict = PostSchema.model_validate(post).model_dump()
-        post_dict["is_bookmarked"] = is_bookmarked
+        post_dict = hydrator.to_dict(post)
+        post_dict["snippet"] = snippets[post.id]
+        if not include_content:
+            del post_dict["content"]
         posts_with_bookmarks.append(post_dict)
 
-    return {
+    page = {
         "data": posts_with_bookmarks,
         "total": total,
-        "has_more": (offset + limit) < total,
+        "total_is_estimate": True,
+        "has_more": has_more,
+        "next_cursor": encode_offset(offset + limit) if has_more else None,
     }
+    if facets:
+        page["facets"] = await PostService.get_facets(
+            session,
+            search_query=q.strip(),
+            interval=facet_interval,
+            limit=facet_limit,
+        )
+    return page_response(page, response, SEARCH_PAGE_ADAPTER)
 
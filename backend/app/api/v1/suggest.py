@@ -0,0 +1,31 @@
+"""Autocomplete API routes."""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import get_session
+from app.services.suggest_service import SuggestService
+
+router = APIRouter(prefix="/suggest", tags=["suggest"])
+
+
+@router.get("", response_model=dict)
+async def suggest(
+    q: str = Query(..., max_length=100, description="Prefix typed so far"),
+    limit: int = Query(5, ge=1, description="Suggestions per kind"),
+    session: AsyncSession = Depends(get_session),
+) -> dict:
+    """
+    Complete a prefix to tag names, channel usernames and frequent words.
+
+    Served from an in-memory prefix trie, so it can be called on every
+    keystroke; only a worker's first request loads the trie from the
+    database. Each kind is ranked by post count.
+    """
+    limit = min(limit, get_settings().suggest_top_n)
+    index = await SuggestService.ensure_loaded(session)
+    suggestions = index.suggest(q, limit)
+    return {
+        kind: [{"value": value, "count": count} for value, count in items]
+        for kind, items in suggestions.items()
+    }
@@ -4,14 +4,16 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
+from app.api.conditional import conditional_get
 from app.db.session import get_session
-from app.schemas.tag import TagSchema, TagCreate
+from app.schemas.tag import TagSchema, TagCreate, TagMerge, TagRename
 from app.services.tag_service import TagService
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=dict, dependencies=[Depends(conditional_get("tags"))])
 async def get_tags(
     session: AsyncSession = Depends(get_session),
 ) -> dict:
@@ -61,6 +63,54 @@ async def delete_tag(
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
 
-    await TagService.delete(session, tag.id)
+    await TagService.delete(session, tag.id, chunk_size=get_settings().tag_rewrite_chunk_size)
     return None
 
+
+@router.patch("/{tag_name}", response_model=TagSchema)
+async def rename_tag(
+    tag_name: str,
+    tag_data: TagRename,
+    session: AsyncSession = Depends(get_session),
+) -> TagSchema:
+    """
+    Rename a tag.
+
+    If a tag with the new name already exists, the tag is merged into it.
+    Feed filters are updated to the new name.
+    """
+    tag = await TagService.get_by_name(session, tag_name)
+    if not tag:
+        raise HTTPException(status_code=404, detail="Tag not found")
+
+    tag = await TagService.rename(
+        session, tag, tag_data.name, chunk_size=get_settings().tag_rewrite_chunk_size
+    )
+    return TagSchema.model_validate(tag)
+
+
+@router.post("/{tag_name}/merge", response_model=TagSchema)
+async def merge_tag(
+    tag_name: str,
+    merge_data: TagMerge,
+    session: AsyncSession = Depends(get_session),
+) -> TagSchema:
+    """
+    Merge a tag into another tag (e.g. synonyms).
+
+    Every post with the tag gets the target tag instead, feed filters are
+    rewritten, and the merged tag is deleted.
+    """
+    source = await TagService.get_by_name(session, tag_name)
+    if not source:
+        raise HTTPException(status_code=404, detail="Tag not found")
+
+    target = await TagService.get_by_name(session, merge_data.into)
+    if not target:
+        raise HTTPException(status_code=404, detail="Target tag not found")
+
+    target = await TagService.merge(
+        session, source, target, chunk_size=get_settings().tag_rewrite_chunk_size
+    )
+    return TagSchema.model_validate(target)
+
@@ -43,6 +43,79 @@ class Settings(BaseSettings):
     # scraper will fetch only this window of historical messages on first run.
     telegram_initial_history_limit: int = 100
 
+    # Tagging Settings
+    # A post claimed by a tagging worker is considered abandoned (and can be
+    # claimed again) if it is still processing after this many seconds.
+    tagging_claim_lease_seconds: int = 600
+    # How often the tag usage counters are reconciled against post_tags
+    # (0 disables the periodic repair job).
+    tag_counts_reconcile_interval_seconds: int = 3600
+    # Name of the current tagger; re-tag jobs bring every post up to it.
+    tagger_version: str = "mock-v1"
+    retag_chunk_size: int = 500
+    retag_max_concurrency: int = 4
+    # Posts rewritten per transaction when merging, renaming or deleting tags
+    tag_rewrite_chunk_size: int = 5000
+
+    # Search Settings
+    # "memory": in-process BM25 inverted index (ranked by relevance)
+    # "postgres": GIN-indexed tsvector column ranked with ts_rank_cd, for
+    #             deployments whose workers cannot each hold an index
+    # "trigram": pg_trgm-indexed substring and fuzzy match (ranked by similarity),
+    #            for identifiers like "llama-3.1" that word search tokenizes badly
+    # "sql": ILIKE substring match (ranked by recency)
+    search_backend: Literal["memory", "postgres", "trigram", "sql"] = "memory"
+    # Minimum pg_trgm word similarity for a fuzzy match (0..1)
+    search_trigram_threshold: float = 0.4
+    # Maximum number of (word, language) -> stem entries memoized by the analyzer
+    analyzer_stem_cache_size: int = 100_000
+    # Search result pages cached per worker (0 disables the cache). With the
+    # memory backend entries are also dropped as soon as a matching post is
+    # ingested; the TTL bounds staleness everywhere else.
+    search_cache_size: int = 1024
+    search_cache_ttl_seconds: float = 30.0
+    # Maximum length of the highlighted snippet returned for each search hit
+    search_snippet_max_chars: int = 200
+    # Largest set of post IDs handed to the database as a filter; broader
+    # matches are ranked from the index in windows instead
+    search_max_filter_ids: int = 10000
+    # Snapshot file of the memory index, relative to the backend directory
+    # ("" disables snapshots). Workers map it at startup and only replay posts
+    # written after it was taken, instead of rebuilding from the database.
+    search_snapshot_path: str = ""
+    # How often a worker applies posts and tag counts written by other
+    # processes to its search index, search cache and suggestions (0 never)
+    search_sync_interval_seconds: float = 2.0
+
+    # Autocomplete Settings
+    # Completions kept per prefix (upper bound for the `limit` of /suggest)
+    suggest_top_n: int = 10
+    # Posts a content word must appear in before it is suggested
+    suggest_min_term_count: int = 3
+
+    # Related Posts Settings
+    # MinHash signature length and LSH bands (rows per band = hashes / bands).
+    # 64 hashes in 16 bands of 4 rows make posts with a word-set Jaccard
+    # similarity of 0.5 candidates with ~64% probability, 0.7 with ~98%.
+    related_num_hashes: int = 64
+    related_bands: int = 16
+    # Words per shingle (1 compares word sets, 2+ also word order)
+    related_shingle_size: int = 1
+    # LSH candidates re-ranked by exact Jaccard per request
+    related_max_candidates: int = 200
+    # Posts read per LSH bucket before candidates are counted, so buckets of
+    # many near-identical posts (reposts, templates) stay cheap
+    related_max_bucket_rows: int = 1000
+    # Minimum exact Jaccard similarity of a related post
+    related_min_similarity: float = 0.1
+
+    # Feed Settings
+    # Posts per transaction when a feed's membership is (re)built
+    feed_backfill_chunk_size: int = 1000
+    # How often a worker applies posts or tags changed by other processes to
+    # its tag bitmaps (0 disables the background catch-up)
+    tag_bitmap_refresh_seconds: float = 2.0
+
     # Server Configuration
     host: str = "0.0.0.0"
     port: int = 8000
@@ -1,14 +1,20 @@
+from sqlalchemy import text
 from sqlmodel import SQLModel
 
 from app.db.session import engine
 
 # Import all models to ensure they're registered with SQLModel
-from app.models import Post, Tag, Feed, Bookmark, PostTag, Channel  # noqa: F401
+from app.models import (  # noqa: F401
+    Post, Tag, Feed, FeedPost, Bookmark, PostTag, Channel, TagCount, DataVersion, RetagJob,
+    SavedSearch, SavedSearchTerm, SavedSearchMatch, PostSignature, PostLshBucket,
+)
 
 
 async def init_db() -> None:
     """Initialize database (create tables)."""
     async with engine.begin() as conn:
+        # Trigram indexes need the pg_trgm extension
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.pool import NullPool, QueuePool
 
 from app.core.config import get_settings
+from app.db.versions import track_data_versions
 
 settings = get_settings()
 
@@ -30,6 +31,9 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Bump the data version counters (ETags) on every commit that writes
+track_data_versions()
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting async database session."""
@@ -0,0 +1,160 @@
+"""Data version bumping on commit, for HTTP validators (ETags), and after-commit callbacks."""
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.models.data_version import DataVersion
+
+# Scopes whose responses depend on each table. Tags appear by name in post
+# payloads and feed filters select posts, so both also change "posts".
+# "tag_bitmap" and "search" tell workers their in-memory tag bitmaps and
+# search structures are behind.
+TABLE_SCOPES: Dict[str, Tuple[str, ...]] = {
+    "posts": ("posts", "tag_bitmap", "search"),
+    "post_tags": ("posts", "tag_bitmap"),
+    "bookmarks": ("posts",),
+    "feed_posts": ("posts",),
+    "tags": ("posts", "tags", "tag_bitmap"),
+    "tag_counts": ("tags",),
+    "feeds": ("feeds", "posts"),
+}
+
+# Columns no response depends on (the tagging queue state of posts): writes
+# touching only these leave the versions alone
+UNTRACKED_COLUMNS: Dict[str, Set[str]] = {
+    "posts": {"tagging_status", "tagging_claimed_at", "tagger_version"},
+}
+
+_CHANGED_KEY = "changed_scopes"
+_PENDING_KEY = "pending_versions"
+_COMMITTED_KEY = "committed_versions"
+_CALLBACKS_KEY = "after_commit_callbacks"
+
+
+def mark_changed(session: Union[Session, AsyncSession], tables: Iterable[str]) -> None:
+    """
+    Record that the current transaction writes ``tables``.
+
+    Plain ORM and Core DML is recorded automatically; call this for writes
+    the session cannot see, such as DML inside a CTE of a SELECT.
+    """
+    scopes: Set[str] = session.info.setdefault(_CHANGED_KEY, set())
+    for table in tables:
+        scopes.update(TABLE_SCOPES.get(table, ()))
+
+
+def _tracked(table: str, columns: Iterable[str]) -> bool:
+    """Whether writing ``columns`` of ``table`` can change a response."""
+    return not set(columns) <= UNTRACKED_COLUMNS.get(table, set())
+
+
+def _record_statement(state: ORMExecuteState):
+    """Record DML statements that changed rows, running them to see the row count."""
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return None
+    table = state.statement.table.name
+    if state.is_update and not _tracked(
+        table, (getattr(column, "key", column) for column in state.statement._values or ())
+    ):
+        return None
+
+    result = state.invoke_statement()
+    # The row count is -1 where the driver cannot tell; count that as a change
+    if getattr(result, "rowcount", -1) != 0:
+        mark_changed(state.session, [table])
+    return result
+
+
+def _changed_columns(instance) -> Iterable[str]:
+    return [attr.key for attr in inspect(instance).attrs if attr.history.has_changes()]
+
+
+def _record_flush(session: Session, flush_context) -> None:
+    dirty = [
+        instance
+        for instance in session.dirty
+        if hasattr(instance, "__table__")
+        and session.is_modified(instance)
+        and _tracked(instance.__table__.name, _changed_columns(instance))
+    ]
+    mark_changed(
+        session,
+        [
+            instance.__table__.name
+            for instance in (*session.new, *dirty, *session.deleted)
+            if hasattr(instance, "__table__")
+        ],
+    )
+
+
+def _bump_versions(session: Session) -> None:
+    """
+    Bump the counters of the changed scopes right before the commit.
+
+    Running last keeps the counter row locks for the duration of the
+    commit only, and the sorted upsert takes them in the same order in
+    every transaction, so concurrent writers cannot deadlock on them.
+    """
+    # Flush pending objects first, so their writes are recorded and no other
+    # lock is taken once the counters are locked
+    session.flush()
+    scopes = session.info.pop(_CHANGED_KEY, None)
+    if not scopes:
+        return
+
+    stmt = insert(DataVersion).values(
+        [{"scope": scope, "version": int(time.time() * 1000)} for scope in sorted(scopes)]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DataVersion.scope],
+        set_={"version": DataVersion.version + 1},
+    ).returning(DataVersion.scope, DataVersion.version)
+    session.info[_PENDING_KEY] = dict(session.execute(stmt).all())
+
+
+def call_after_commit(session: Union[Session, AsyncSession], callback: Callable[[], None]) -> None:
+    """
+    Run ``callback`` once the current transaction of ``session`` commits.
+
+    For in-memory copies of the data: a rolled back transaction drops its
+    callbacks, so the copy never gets ahead of the database. Callbacks run
+    synchronously, in registration order.
+    """
+    callbacks: List[Callable[[], None]] = session.info.setdefault(_CALLBACKS_KEY, [])
+    callbacks.append(callback)
+
+
+def _record_commit(session: Session) -> None:
+    session.info[_COMMITTED_KEY] = session.info.pop(_PENDING_KEY, {})
+    for callback in session.info.pop(_CALLBACKS_KEY, ()):
+        callback()
+
+
+def _forget(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_CHANGED_KEY, None)
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_CALLBACKS_KEY, None)
+
+
+def committed_version(session: Union[Session, AsyncSession], scope: str) -> Optional[int]:
+    """
+    Version the last commit of ``session`` bumped ``scope`` to, if it bumped it.
+
+    Lets a worker that applies its own writes to an in-memory copy after the
+    commit tell whether any other commit came in between.
+    """
+    return session.info.get(_COMMITTED_KEY, {}).get(scope)
+
+
+def track_data_versions(session_class: type = Session) -> None:
+    """Install the session event hooks maintaining ``data_versions`` and running after-commit callbacks."""
+    event.listen(session_class, "do_orm_execute", _record_statement)
+    event.listen(session_class, "after_flush", _record_flush)
+    event.listen(session_class, "before_commit", _bump_versions)
+    event.listen(session_class, "after_commit", _record_commit)
+    event.listen(session_class, "after_transaction_end", _forget)
@@ -1,13 +1,22 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import health
-from app.api.v1 import admin, posts, tags, feeds, bookmarks, search, channels, scrape
+from app.api.v1 import (
+    admin, posts, tags, feeds, bookmarks, search, suggest, saved_searches, channels, scrape,
+)
 from app.core.config import get_settings
 from app.core.logging import setup_logging
 from app.db.base import close_db, init_db
+from app.db.session import AsyncSessionLocal
+from app.services.feed_membership_service import FeedMembershipService
+from app.services.search_service import SearchService
+from app.services.search_sync_service import SearchSyncService
+from app.services.tag_bitmap_service import TagBitmapService
+from app.services.tag_count_service import TagCountService
 
 settings = get_settings()
 
@@ -20,8 +29,39 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     await init_db()
+    async with AsyncSessionLocal() as session:
+        # Writes committed while the index loads are replayed by the catch-up
+        await SearchSyncService.start(session)
+        if settings.search_backend == "memory":
+            await SearchService.load_index(session)
+        await FeedMembershipService.resume_pending(session)
+    background_tasks = []
+    if settings.search_sync_interval_seconds > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                SearchSyncService.run_periodic_sync(settings.search_sync_interval_seconds)
+            )
+        )
+    if settings.tag_bitmap_refresh_seconds > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                TagBitmapService.run_periodic_sync(settings.tag_bitmap_refresh_seconds)
+            )
+        )
+    if settings.tag_counts_reconcile_interval_seconds > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                TagCountService.run_periodic_reconcile(
+                    settings.tag_counts_reconcile_interval_seconds
+                )
+            )
+        )
     yield
     # Shutdown
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
     await close_db()
 
 
@@ -40,6 +80,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Include routers
@@ -52,6 +93,8 @@ api_v1_router.include_router(tags.router)
 api_v1_router.include_router(feeds.router)
 api_v1_router.include_router(bookmarks.router)
 api_v1_router.include_router(search.router)
+api_v1_router.include_router(suggest.router)
+api_v1_router.include_router(saved_searches.router)
 api_v1_router.include_router(channels.router)
 api_v1_router.include_router(scrape.router)
 api_v1_router.include_router(admin.router)
@@ -64,6 +107,8 @@ api_router.include_router(tags.router)
 api_router.include_router(feeds.router)
 api_router.include_router(bookmarks.router)
 api_router.include_router(search.router)
+api_router.include_router(suggest.router)
+api_router.include_router(saved_searches.router)
 api_router.include_router(channels.router)
 api_router.include_router(scrape.router)
 api_router.include_router(admin.router)
@@ -1,10 +1,35 @@
 """Database models."""
-from app.models.post import Post
+from app.models.post import Post, TaggingStatus
 from app.models.tag import Tag, AuthorType
 from app.models.feed import Feed
+from app.models.feed_post import FeedPost
 from app.models.bookmark import Bookmark
 from app.models.post_tag import PostTag
 from app.models.channel import Channel
+from app.models.tag_count import TagCount
+from app.models.data_version import DataVersion
+from app.models.retag_job import RetagJob, RetagJobStatus
+from app.models.post_signature import PostLshBucket, PostSignature
+from app.models.saved_search import SavedSearch, SavedSearchMatch, SavedSearchTerm
 
-__all__ = ["Post", "Tag", "Feed", "Bookmark", "PostTag", "AuthorType", "Channel"]
+__all__ = [
+    "Post",
+    "TaggingStatus",
+    "Tag",
+    "Feed",
+    "FeedPost",
+    "Bookmark",
+    "PostTag",
+    "AuthorType",
+    "Channel",
+    "TagCount",
+    "DataVersion",
+    "RetagJob",
+    "RetagJobStatus",
+    "SavedSearch",
+    "SavedSearchTerm",
+    "SavedSearchMatch",
+    "PostSignature",
+    "PostLshBucket",
+]
 
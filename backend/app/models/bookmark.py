@@ -2,6 +2,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -12,6 +13,10 @@ class Bookmark(SQLModel, table=True):
     """Bookmark model for saving posts."""
 
     __tablename__ = "bookmarks"
+    __table_args__ = (
+        # Keyset pagination, newest first: ORDER BY created_at DESC, id DESC
+        Index("ix_bookmarks_created_at_id", "created_at", "id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     post_id: str = Field(foreign_key="posts.id", unique=True, index=True)
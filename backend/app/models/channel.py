@@ -1,7 +1,7 @@
 """Channel tracking model."""
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Column, DateTime, func
+from sqlalchemy import BigInteger, Column, DateTime, Index, func
 from sqlmodel import Field, SQLModel
 
 
@@ -9,6 +9,21 @@ class Channel(SQLModel, table=True):
     """Model to track channel state and latest message ID."""
 
     __tablename__ = "channels"
+    __table_args__ = (
+        # Trigram indexes for substring and fuzzy matching (pg_trgm)
+        Index(
+            "ix_channels_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_channels_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     username: str = Field(unique=True, index=True, max_length=255, description="Channel username (without @)")
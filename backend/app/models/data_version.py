@@ -0,0 +1,15 @@
+"""Data version counter model."""
+from sqlalchemy import BigInteger, Column, String
+from sqlmodel import Field, SQLModel
+
+
+class DataVersion(SQLModel, table=True):
+    """Counter bumped by every commit that changes the data behind a group of endpoints."""
+
+    __tablename__ = "data_versions"
+
+    scope: str = Field(sa_column=Column(String, primary_key=True))
+    version: int = Field(
+        sa_column=Column(BigInteger, nullable=False),
+        description="Starts at the creation time in milliseconds, then +1 per changing commit",
+    )
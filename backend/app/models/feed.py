@@ -18,4 +18,8 @@ class Feed(SQLModel, table=True):
         description="List of tag names to filter posts",
     )
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    materialized_at: datetime | None = Field(
+        default=None,
+        description="When feed_posts last became complete for the current tag filters",
+    )
 
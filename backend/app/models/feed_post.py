@@ -0,0 +1,25 @@
+"""Materialized feed membership model."""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlmodel import Field, SQLModel
+
+
+class FeedPost(SQLModel, table=True):
+    """Membership of a post in a custom feed, kept in sync with the post's tags."""
+
+    __tablename__ = "feed_posts"
+
+    # (feed_id, published_at, post_id): a feed page is a range scan of the primary key
+    feed_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("feeds.id", ondelete="CASCADE"), primary_key=True),
+    )
+    published_at: datetime = Field(sa_column=Column(DateTime, primary_key=True))
+    post_id: str = Field(
+        sa_column=Column(
+            String,
+            ForeignKey("posts.id", ondelete="CASCADE"),
+            primary_key=True,
+            index=True,
+        ),
+    )
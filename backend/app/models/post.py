@@ -1,8 +1,10 @@
 """Post model."""
 from datetime import datetime
+from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, Text
+from sqlalchemy import DDL, JSON, Computed, DateTime, Index, Text, event, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import Column, Field, Relationship, SQLModel
 
 # Import PostTag for link_model (needed at runtime)
@@ -13,10 +15,43 @@ if TYPE_CHECKING:
     from app.models.bookmark import Bookmark
 
 
+class TaggingStatus(str, Enum):
+    """LLM tagging state of a post."""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    TAGGED = "tagged"
+    FAILED = "failed"
+
+
 class Post(SQLModel, table=True):
     """Post model representing a Telegram channel message."""
 
     __tablename__ = "posts"
+    __table_args__ = (
+        # Partial index over the tagging backlog only: claiming work scans
+        # pending/processing rows instead of the whole posts table.
+        Index(
+            "ix_posts_tagging_backlog",
+            "created_at",
+            postgresql_where=text("tagging_status IN ('PENDING', 'PROCESSING')"),
+        ),
+        # Trigram indexes for substring and fuzzy matching (pg_trgm)
+        Index(
+            "ix_posts_content_trgm",
+            "content",
+            postgresql_using="gin",
+            postgresql_ops={"content": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_posts_channel_name_trgm",
+            "channel_name",
+            postgresql_using="gin",
+            postgresql_ops={"channel_name": "gin_trgm_ops"},
+        ),
+        # Keyset pagination, newest first: ORDER BY published_at DESC, id DESC
+        Index("ix_posts_published_at_id", "published_at", "id"),
+    )
 
     id: str = Field(primary_key=True, description="Unique post identifier (e.g., channel:message_id)")
     channel_name: str = Field(index=True, max_length=255)
@@ -30,6 +65,24 @@ class Post(SQLModel, table=True):
     original_url: str = Field(max_length=500, description="Original Telegram message URL")
     published_at: datetime = Field(index=True, description="When the post was published on Telegram")
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        index=True,
+        description="When the post content was last written",
+    )
+    tagging_status: TaggingStatus = Field(
+        default=TaggingStatus.PENDING,
+        description="LLM tagging state of the post",
+    )
+    tagging_claimed_at: datetime | None = Field(
+        default=None,
+        description="When a tagging worker claimed the post",
+    )
+    tagger_version: str | None = Field(
+        default=None,
+        max_length=100,
+        description="Version of the tagger that produced the post's LLM tags",
+    )
 
     # Relationships
     tags: list["Tag"] = Relationship(
@@ -39,3 +92,90 @@ class Post(SQLModel, table=True):
     )
     bookmarks: list["Bookmark"] = Relationship(back_populates="post")
 
+
+
+# Text search configurations combined into the full-text search vector
+SEARCH_TEXT_CONFIGS = ("russian", "english")
+
+# Full-text search vector used by the "postgres" search backend. It is
+# generated by the database and appended to the table without being mapped,
+# so it is never loaded along with posts.
+search_vector = Column(
+    "search_vector",
+    TSVECTOR,
+    Computed(
+        " || ".join(
+            f"to_tsvector('{config}'::regconfig, coalesce(content, ''))"
+            for config in SEARCH_TEXT_CONFIGS
+        ),
+        persisted=True,
+    ),
+)
+Post.__table__.append_column(search_vector)
+Index("ix_posts_search_vector", search_vector, postgresql_using="gin")
+
+# When a post's tags or timeline position last changed, so that workers can
+# catch their in-memory indexes up with writes of other processes by reading
+# only the posts changed since their last pass. Maintained by the database
+# (the default and the triggers below) and, like the search vector, not mapped.
+changed_at = Column(
+    "changed_at",
+    DateTime,
+    server_default=text("timezone('utc', now())"),
+    nullable=False,
+)
+Post.__table__.append_column(changed_at)
+Index("ix_posts_changed_at", changed_at)
+
+POST_CHANGE_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION touch_tagged_posts() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE posts SET changed_at = timezone('utc', now())
+        WHERE id IN (SELECT post_id FROM changed_rows);
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER post_tags_inserted AFTER INSERT ON post_tags
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_tagged_posts()
+    """,
+    """
+    CREATE TRIGGER post_tags_deleted AFTER DELETE ON post_tags
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_tagged_posts()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION touch_posts_of_renamed_tag() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE posts SET changed_at = timezone('utc', now())
+        WHERE id IN (SELECT post_id FROM post_tags WHERE tag_id = NEW.id);
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER tags_renamed AFTER UPDATE OF name ON tags
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION touch_posts_of_renamed_tag()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION touch_moved_post() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.changed_at := timezone('utc', now());
+        RETURN NEW;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER posts_moved BEFORE UPDATE OF published_at ON posts
+    FOR EACH ROW WHEN (OLD.published_at IS DISTINCT FROM NEW.published_at)
+    EXECUTE FUNCTION touch_moved_post()
+    """,
+)
+
+# post_tags is created after posts and tags, so every trigger target exists
+for statement in POST_CHANGE_TRIGGERS:
+    event.listen(PostTag.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
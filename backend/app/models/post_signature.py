@@ -0,0 +1,40 @@
+"""MinHash signature and LSH bucket models for related posts."""
+from sqlalchemy import BigInteger, Column, ForeignKey, LargeBinary, SmallInteger, String
+from sqlmodel import Field, SQLModel
+
+
+class PostSignature(SQLModel, table=True):
+    """MinHash signature and shingle set of a post, computed at ingest."""
+
+    __tablename__ = "post_signatures"
+
+    post_id: str = Field(
+        sa_column=Column(String, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True),
+    )
+    version: str = Field(max_length=50, description="MinHash parameters the row was computed with")
+    signature: bytes = Field(
+        sa_column=Column(LargeBinary, nullable=False),
+        description="MinHash values as packed uint32",
+    )
+    shingles: bytes = Field(
+        sa_column=Column(LargeBinary, nullable=False),
+        description="Sorted shingle hashes as packed uint32, for exact Jaccard re-ranking",
+    )
+
+
+class PostLshBucket(SQLModel, table=True):
+    """LSH bucket of one band of a post's signature."""
+
+    __tablename__ = "post_lsh_buckets"
+
+    # (band, bucket) first: the primary key doubles as the bucket lookup index
+    band: int = Field(sa_column=Column(SmallInteger, primary_key=True))
+    bucket: int = Field(sa_column=Column(BigInteger, primary_key=True))
+    post_id: str = Field(
+        sa_column=Column(
+            String,
+            ForeignKey("posts.id", ondelete="CASCADE"),
+            primary_key=True,
+            index=True,
+        ),
+    )
@@ -1,12 +1,25 @@
 """Post-Tag association table."""
+from enum import Enum
+
 from sqlmodel import Field, SQLModel
 
 
+class AuthorType(str, Enum):
+    """Author type enumeration."""
+
+    LLM = "llm"
+    HUMAN = "human"
+
+
 class PostTag(SQLModel, table=True):
     """Many-to-many relationship between Posts and Tags."""
 
     __tablename__ = "post_tags"
 
     post_id: str = Field(foreign_key="posts.id", primary_key=True)
-    tag_id: int = Field(foreign_key="tags.id", primary_key=True)
-
+    tag_id: int = Field(foreign_key="tags.id", primary_key=True, index=True)
+    author_type: AuthorType = Field(
+        default=AuthorType.HUMAN,
+        sa_column_kwargs={"server_default": AuthorType.HUMAN.name},
+        description="Whether the LLM tagger or a human assigned the tag to the post",
+    )
@@ -0,0 +1,34 @@
+"""Re-tagging job model."""
+from datetime import datetime
+from enum import Enum
+
+from sqlmodel import Field, SQLModel
+
+
+class RetagJobStatus(str, Enum):
+    """Re-tagging job state."""
+
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class RetagJob(SQLModel, table=True):
+    """Corpus re-tagging run against a named tagger version, with its checkpoint."""
+
+    __tablename__ = "retag_jobs"
+
+    id: int | None = Field(default=None, primary_key=True)
+    tagger_version: str = Field(index=True, max_length=100)
+    status: RetagJobStatus = Field(default=RetagJobStatus.RUNNING)
+    chunk_size: int = Field(default=500)
+    concurrency: int = Field(default=4)
+    checkpoint_post_id: str | None = Field(
+        default=None,
+        description="Every post with an ID up to and including this one has been processed",
+    )
+    processed: int = Field(default=0, description="Posts processed so far")
+    error: str | None = Field(default=None, max_length=1000)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: datetime | None = None
@@ -0,0 +1,65 @@
+"""Saved search models."""
+from datetime import datetime
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+from sqlmodel import Field, SQLModel
+
+
+class SavedSearch(SQLModel, table=True):
+    """A stored search query whose new matches are collected at ingest."""
+
+    __tablename__ = "saved_searches"
+
+    id: int | None = Field(default=None, primary_key=True)
+    name: str = Field(max_length=255)
+    query: str = Field(max_length=500, description="Query in the /search syntax")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SavedSearchTerm(SQLModel, table=True):
+    """
+    Anchor term of a saved search.
+
+    A post can only match a saved search if it contains one of its anchor
+    terms, so ingest looks up candidates by the post's terms.
+    """
+
+    __tablename__ = "saved_search_terms"
+
+    # Term first: the primary key doubles as the term -> searches lookup index
+    term: str = Field(sa_column=Column(String(255), primary_key=True))
+    saved_search_id: int = Field(
+        sa_column=Column(
+            Integer,
+            ForeignKey("saved_searches.id", ondelete="CASCADE"),
+            primary_key=True,
+            index=True,
+        ),
+    )
+
+
+class SavedSearchMatch(SQLModel, table=True):
+    """A post that matched a saved search when it was ingested."""
+
+    __tablename__ = "saved_search_matches"
+    __table_args__ = (
+        # Paging through the matches of a search, newest first
+        Index("ix_saved_search_matches_search_matched", "saved_search_id", "matched_at"),
+    )
+
+    saved_search_id: int = Field(
+        sa_column=Column(
+            Integer,
+            ForeignKey("saved_searches.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+    )
+    post_id: str = Field(
+        sa_column=Column(
+            String,
+            ForeignKey("posts.id", ondelete="CASCADE"),
+            primary_key=True,
+            index=True,
+        ),
+    )
+    matched_at: datetime = Field(default_factory=datetime.utcnow)
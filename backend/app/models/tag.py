@@ -1,24 +1,16 @@
 """Tag model."""
 from datetime import datetime
-from enum import Enum
 from typing import TYPE_CHECKING
 
 from sqlmodel import Field, Relationship, SQLModel
 
 # Import PostTag for link_model (needed at runtime)
-from app.models.post_tag import PostTag
+from app.models.post_tag import AuthorType, PostTag
 
 if TYPE_CHECKING:
     from app.models.post import Post
 
 
-class AuthorType(str, Enum):
-    """Author type enumeration."""
-
-    LLM = "llm"
-    HUMAN = "human"
-
-
 class Tag(SQLModel, table=True):
     """Tag model for categorizing posts."""
 
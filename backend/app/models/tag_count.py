@@ -0,0 +1,14 @@
+"""Tag usage counter model."""
+from sqlalchemy import Column, ForeignKey, Integer
+from sqlmodel import Field, SQLModel
+
+
+class TagCount(SQLModel, table=True):
+    """Number of posts carrying each tag, maintained on every tag add/remove."""
+
+    __tablename__ = "tag_counts"
+
+    tag_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    )
+    post_count: int = Field(default=0, description="Number of posts with this tag")
@@ -1,10 +1,10 @@
 """Post schemas."""
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, NotRequired, Optional, TypedDict
 
 from pydantic import BaseModel, Field
 
-from app.schemas.tag import TagSchema
+from app.schemas.tag import TagPayload, TagSchema
 
 
 class PostSchema(BaseModel):
@@ -25,6 +25,85 @@ class PostSchema(BaseModel):
         from_attributes = True
 
 
+class PostPayload(TypedDict):
+    """Serialized post in list responses (fields and order of ``PostSchema``)."""
+
+    id: str
+    channel_name: str
+    channel_username: str
+    content: str
+    media_urls: Optional[List[str]]
+    original_url: str
+    published_at: datetime
+    tags: List[TagPayload]
+    is_bookmarked: bool
+    created_at: datetime
+
+
+class PostPage(TypedDict):
+    """Paginated post list response."""
+
+    data: List[PostPayload]
+    total: Optional[int]
+    has_more: bool
+    next_cursor: Optional[str]
+    facets: NotRequired[Dict[str, Any]]
+
+
+class SearchHitPayload(TypedDict):
+    """Serialized search hit: a post with its snippet, content optional."""
+
+    id: str
+    channel_name: str
+    channel_username: str
+    content: NotRequired[str]
+    media_urls: Optional[List[str]]
+    original_url: str
+    published_at: datetime
+    tags: List[TagPayload]
+    is_bookmarked: bool
+    created_at: datetime
+    snippet: str
+
+
+class SearchPage(TypedDict):
+    """Paginated search response."""
+
+    data: List[SearchHitPayload]
+    total: Optional[int]
+    total_is_estimate: bool
+    has_more: bool
+    next_cursor: Optional[str]
+    facets: NotRequired[Dict[str, Any]]
+
+
+class RelatedPostPayload(PostPayload):
+    """Serialized related post with its similarity scores."""
+
+    similarity: float
+    shared_tags: int
+
+
+class RelatedPostsPage(TypedDict):
+    """Related posts response."""
+
+    data: List[RelatedPostPayload]
+
+
+class MatchedPostPayload(PostPayload):
+    """Serialized post matched by a saved search."""
+
+    matched_at: datetime
+
+
+class SavedSearchMatchesPage(TypedDict):
+    """Paginated saved search matches response."""
+
+    data: List[MatchedPostPayload]
+    total: int
+    has_more: bool
+
+
 class PostCreate(BaseModel):
     """Schema for creating a post."""
 
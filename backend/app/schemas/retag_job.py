@@ -0,0 +1,26 @@
+"""Re-tag job schemas."""
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.models.retag_job import RetagJobStatus
+
+
+class RetagJobSchema(BaseModel):
+    """Re-tag job schema for API responses."""
+
+    id: int
+    tagger_version: str
+    status: RetagJobStatus
+    chunk_size: int
+    concurrency: int
+    checkpoint_post_id: Optional[str] = None
+    processed: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,31 @@
+"""Saved search schemas."""
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class SavedSearchSchema(BaseModel):
+    """Saved search schema for API responses."""
+
+    id: int
+    name: str
+    query: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SavedSearchCreate(BaseModel):
+    """Schema for creating a saved search."""
+
+    name: str = Field(..., max_length=255)
+    query: str = Field(..., min_length=1, max_length=500, description="Query in the /search syntax")
+
+
+class SavedSearchUpdate(BaseModel):
+    """Schema for updating a saved search."""
+
+    name: Optional[str] = Field(None, max_length=255)
+    query: Optional[str] = Field(None, min_length=1, max_length=500, description="Query in the /search syntax")
@@ -1,5 +1,6 @@
 """Tag schemas."""
 from datetime import datetime
+from typing import TypedDict
 
 from pydantic import BaseModel, Field
 
@@ -18,9 +19,30 @@ class TagSchema(BaseModel):
         from_attributes = True
 
 
+class TagPayload(TypedDict):
+    """Serialized tag inside post list responses (fields of ``TagSchema``)."""
+
+    id: int
+    name: str
+    author_type: AuthorType
+    created_at: datetime
+
+
 class TagCreate(BaseModel):
     """Schema for creating a tag."""
 
     name: str = Field(..., max_length=100)
     author_type: AuthorType = Field(default=AuthorType.HUMAN)
 
+
+
+class TagRename(BaseModel):
+    """Schema for renaming a tag."""
+
+    name: str = Field(..., max_length=100, description="New tag name (merges if it already exists)")
+
+
+class TagMerge(BaseModel):
+    """Schema for merging a tag into another."""
+
+    into: str = Field(..., max_length=100, description="Name of the tag to merge into")
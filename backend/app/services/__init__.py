@@ -1,24 +1,58 @@
 """Service classes for business logic."""
 from app.services.post_service import PostService
 from app.services.tag_service import TagService
+from app.services.tag_count_service import TagCountService
 from app.services.feed_service import FeedService
 from app.services.bookmark_service import BookmarkService
 from app.services.channel_service import ChannelService
+from app.services.data_version_service import DataVersionService
 from app.services.scraper import TelegramScraper
 from app.services.scraper_base import BaseScraper, ScrapedMessage
 from app.services.scraper_orchestrator import ScraperOrchestrator
 from app.services.mock_llm_tagger import MockLLMTagger
+from app.services.post_hydrator import PostHydrator, get_post_hydrator
+from app.services.related_service import RelatedService
+from app.services.retag_service import RetagService
+from app.services.saved_search_service import SavedSearchService
+from app.services.search_cache import SearchCache, get_search_cache
+from app.services.search_index import SearchIndex, get_search_index
+from app.services.search_service import SearchService
+from app.services.search_sync_service import SearchSyncService
+from app.services.suggest_index import PrefixTrie, SuggestIndex, get_suggest_index
+from app.services.suggest_service import SuggestService
+from app.services.tag_bitmap_index import TagBitmapIndex, get_tag_bitmap_index
+from app.services.tag_bitmap_service import TagBitmapService
 
 __all__ = [
     "PostService",
     "TagService",
+    "TagCountService",
     "FeedService",
     "BookmarkService",
     "ChannelService",
+    "DataVersionService",
     "TelegramScraper",
     "BaseScraper",
     "ScrapedMessage",
     "ScraperOrchestrator",
     "MockLLMTagger",
+    "PostHydrator",
+    "get_post_hydrator",
+    "RelatedService",
+    "RetagService",
+    "SavedSearchService",
+    "SearchCache",
+    "get_search_cache",
+    "SearchIndex",
+    "get_search_index",
+    "SearchService",
+    "SearchSyncService",
+    "PrefixTrie",
+    "SuggestIndex",
+    "get_suggest_index",
+    "SuggestService",
+    "TagBitmapIndex",
+    "get_tag_bitmap_index",
+    "TagBitmapService",
 ]
 
@@ -0,0 +1,225 @@
+"""Compressed integer bitmaps (roaring layout) for the tag index."""
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+# A chunk holds the values sharing their high 16 bits
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+LOW_MASK = CHUNK_SIZE - 1
+# Above this many values a sorted array (2 bytes per value) is larger than a
+# 65536-bit bitset (8 KiB)
+ARRAY_MAX = 4096
+
+# Sparse chunks are sorted arrays of the low 16 bits, dense chunks a bitset
+# stored as a Python int (bitwise operations run in C over the whole chunk)
+Container = Union[array, int]
+
+
+def _array_to_bits(values: array) -> int:
+    data = bytearray(CHUNK_SIZE // 8)
+    for value in values:
+        data[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(data, "little")
+
+
+def _bits_to_array(bits: int) -> array:
+    values = array("H")
+    data = bits.to_bytes(CHUNK_SIZE // 8, "little")
+    for index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            values.append((index << 3) | (low.bit_length() - 1))
+            byte ^= low
+    return values
+
+
+def _bit_reader(bits: int):
+    data = bits.to_bytes(CHUNK_SIZE // 8, "little")
+    return lambda value: data[value >> 3] >> (value & 7) & 1
+
+
+def _normalize(container: Container) -> Optional[Container]:
+    """Pick the smaller representation; None for an empty chunk."""
+    if isinstance(container, int):
+        count = container.bit_count()
+        if count == 0:
+            return None
+        return _bits_to_array(container) if count <= ARRAY_MAX else container
+    if not container:
+        return None
+    return _array_to_bits(container) if len(container) > ARRAY_MAX else container
+
+
+def _and(a: Container, b: Container) -> Optional[Container]:
+    if isinstance(a, int) and isinstance(b, int):
+        return _normalize(a & b)
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        contains = _bit_reader(b)
+        return _normalize(array("H", (value for value in a if contains(value))))
+    return _normalize(array("H", sorted(set(a).intersection(b))))
+
+
+def _or(a: Container, b: Container) -> Optional[Container]:
+    if isinstance(a, int) or isinstance(b, int):
+        bits_a = a if isinstance(a, int) else _array_to_bits(a)
+        bits_b = b if isinstance(b, int) else _array_to_bits(b)
+        return _normalize(bits_a | bits_b)
+    return _normalize(array("H", sorted(set(a).union(b))))
+
+
+def _sub(a: Container, b: Container) -> Optional[Container]:
+    if isinstance(a, int):
+        bits_b = b if isinstance(b, int) else _array_to_bits(b)
+        return _normalize(a & ~bits_b)
+    if isinstance(b, int):
+        contains = _bit_reader(b)
+        return _normalize(array("H", (value for value in a if not contains(value))))
+    return _normalize(array("H", sorted(set(a).difference(b))))
+
+
+class RoaringBitmap:
+    """
+    Set of non-negative integers below 2**32, compressed the roaring way.
+
+    Values are grouped into chunks by their high 16 bits. A chunk with at
+    most ``ARRAY_MAX`` values is a sorted ``array('H')`` of the low bits
+    (2 bytes per value); a denser one is a 65536-bit bitset. Set operations
+    work chunk by chunk and only touch chunks present in both operands, so
+    sparse tags stay cheap and dense ones are combined word-wise in C.
+    """
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._chunks: Dict[int, Container] = {}
+        grouped: Dict[int, array] = {}
+        for value in values:
+            grouped.setdefault(value >> CHUNK_BITS, array("H")).append(value & LOW_MASK)
+        for high, lows in grouped.items():
+            chunk = _normalize(array("H", sorted(set(lows))))
+            if chunk is not None:
+                self._chunks[high] = chunk
+
+    @classmethod
+    def _from_chunks(cls, chunks: Dict[int, Container]) -> "RoaringBitmap":
+        bitmap = cls()
+        bitmap._chunks = chunks
+        return bitmap
+
+    def add(self, value: int) -> None:
+        high, low = value >> CHUNK_BITS, value & LOW_MASK
+        chunk = self._chunks.get(high)
+        if chunk is None:
+            self._chunks[high] = array("H", [low])
+        elif isinstance(chunk, int):
+            self._chunks[high] = chunk | (1 << low)
+        else:
+            position = bisect_left(chunk, low)
+            if position == len(chunk) or chunk[position] != low:
+                insort(chunk, low)
+                if len(chunk) > ARRAY_MAX:
+                    self._chunks[high] = _array_to_bits(chunk)
+
+    def discard(self, value: int) -> None:
+        high, low = value >> CHUNK_BITS, value & LOW_MASK
+        chunk = self._chunks.get(high)
+        if chunk is None:
+            return
+        if isinstance(chunk, int):
+            chunk = _normalize(chunk & ~(1 << low))
+        else:
+            position = bisect_left(chunk, low)
+            if position < len(chunk) and chunk[position] == low:
+                del chunk[position]
+            chunk = _normalize(chunk)
+        if chunk is None:
+            del self._chunks[high]
+        else:
+            self._chunks[high] = chunk
+
+    def __contains__(self, value: int) -> bool:
+        chunk = self._chunks.get(value >> CHUNK_BITS)
+        if chunk is None:
+            return False
+        low = value & LOW_MASK
+        if isinstance(chunk, int):
+            return bool(chunk >> low & 1)
+        position = bisect_left(chunk, low)
+        return position < len(chunk) and chunk[position] == low
+
+    def __len__(self) -> int:
+        return sum(
+            chunk.bit_count() if isinstance(chunk, int) else len(chunk)
+            for chunk in self._chunks.values()
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks)
+
+    def __and__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        chunks = {}
+        for high in self._chunks.keys() & other._chunks.keys():
+            chunk = _and(self._chunks[high], other._chunks[high])
+            if chunk is not None:
+                chunks[high] = chunk
+        return RoaringBitmap._from_chunks(chunks)
+
+    def __or__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        chunks = {
+            high: chunk if isinstance(chunk, int) else array("H", chunk)
+            for high, chunk in self._chunks.items()
+        }
+        for high, chunk in other._chunks.items():
+            if high in chunks:
+                chunks[high] = _or(chunks[high], chunk)
+            else:
+                chunks[high] = chunk if isinstance(chunk, int) else array("H", chunk)
+        return RoaringBitmap._from_chunks(chunks)
+
+    def __sub__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        chunks = {}
+        for high, chunk in self._chunks.items():
+            if high in other._chunks:
+                chunk = _sub(chunk, other._chunks[high])
+            elif not isinstance(chunk, int):
+                chunk = array("H", chunk)
+            if chunk is not None:
+                chunks[high] = chunk
+        return RoaringBitmap._from_chunks(chunks)
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self._chunks):
+            chunk = self._chunks[high]
+            base = high << CHUNK_BITS
+            lows = _bits_to_array(chunk) if isinstance(chunk, int) else chunk
+            for low in lows:
+                yield base | low
+
+    def descending(self, below: Optional[int] = None) -> Iterator[int]:
+        """Values in decreasing order, optionally only those ``< below``."""
+        for high in sorted(self._chunks, reverse=True):
+            base = high << CHUNK_BITS
+            if below is not None and base >= below:
+                continue
+            chunk = self._chunks[high]
+            limit = CHUNK_SIZE if below is None or below - base >= CHUNK_SIZE else below - base
+            if isinstance(chunk, int):
+                # Highest set bit first; stops as soon as the caller does
+                bits = chunk & ((1 << limit) - 1)
+                while bits:
+                    low = bits.bit_length() - 1
+                    yield base | low
+                    bits ^= 1 << low
+            else:
+                for position in range(bisect_left(chunk, limit) - 1, -1, -1):
+                    yield base | chunk[position]
+
+    def size_in_bytes(self) -> int:
+        """Approximate payload size (excluding Python object overhead)."""
+        return sum(
+            CHUNK_SIZE // 8 if isinstance(chunk, int) else 2 * len(chunk)
+            for chunk in self._chunks.values()
+        )
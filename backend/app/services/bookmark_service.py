@@ -1,12 +1,15 @@
 """Bookmark service for database operations."""
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.bookmark import Bookmark
 from app.models.post import Post
+from app.services.counts import CountMode, listing_total
+from app.services.cursors import decode_keyset, encode_keyset
+from app.services.post_hydrator import PAGE_LOAD_OPTIONS
 
 
 class BookmarkService:
@@ -54,24 +57,47 @@ class BookmarkService:
         session: AsyncSession,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[List[Bookmark], int]:
-        """Get all bookmarks with pagination."""
-        from sqlalchemy import func
-
-        # Get total count
-        count_result = await session.execute(select(func.count(Bookmark.id)))
-        total = count_result.scalar() or 0
-
-        # Get paginated bookmarks
+        cursor: Optional[str] = None,
+        count: CountMode = "exact",
+    ) -> tuple[List[Bookmark], Optional[int], Optional[str]]:
+        """
+        Get all bookmarks with pagination, newest first.
+
+        Pages are addressed either by ``skip`` or by a ``cursor`` from the
+        previous page (keyset pagination on ``(created_at, id)``). ``count``
+        selects the total strategy, as in ``PostService.get_all``.
+
+        Returns:
+            Tuple of (bookmarks, total or None, cursor of the next page or None)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        # Get paginated bookmarks (served by ix_bookmarks_created_at_id)
+        query = select(Bookmark).options(selectinload(Bookmark.post).options(*PAGE_LOAD_OPTIONS))
+        if cursor:
+            created_at, bookmark_id = decode_keyset(cursor, key_type=int)
+            query = query.where(tuple_(Bookmark.created_at, Bookmark.id) < (created_at, bookmark_id))
+        else:
+            query = query.offset(skip)
         result = await session.execute(
-            select(Bookmark)
-            .options(selectinload(Bookmark.post).selectinload(Post.tags))
-            .order_by(Bookmark.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+            query.order_by(Bookmark.created_at.desc(), Bookmark.id.desc()).limit(limit + 1)
         )
         bookmarks = list(result.scalars().all())
-        return bookmarks, total
+        next_cursor = None
+        if len(bookmarks) > limit:
+            bookmarks = bookmarks[:limit]
+            next_cursor = encode_keyset(bookmarks[-1].created_at, bookmarks[-1].id)
+
+        total = await listing_total(
+            session,
+            select(Bookmark.id),
+            count,
+            skip=None if cursor else skip,
+            page_size=len(bookmarks),
+            has_more=next_cursor is not None,
+        )
+        return bookmarks, total, next_cursor
 
     @staticmethod
     async def delete(session: AsyncSession, post_id: str) -> bool:
@@ -1,10 +1,13 @@
 """Channel service for database operations."""
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.models.channel import Channel
+from app.services.fulltext import set_trigram_threshold, trigram_match
+from app.services.suggest_index import get_suggest_index
 
 
 class ChannelService:
@@ -41,6 +44,7 @@ class ChannelService:
         session.add(channel)
         await session.commit()
         await session.refresh(channel)
+        get_suggest_index().add_channel_count(channel.username, 0)
         return channel
 
     @staticmethod
@@ -60,11 +64,19 @@ class ChannelService:
         return channel
 
     @staticmethod
-    async def get_all_channels(session: AsyncSession) -> List[Channel]:
-        """Get all channels."""
-        result = await session.execute(
-            select(Channel).order_by(Channel.username)
-        )
+    async def get_all_channels(
+        session: AsyncSession,
+        search: Optional[str] = None,
+    ) -> List[Channel]:
+        """Get all channels, optionally fuzzy-matching username or name."""
+        query = select(Channel).order_by(Channel.username)
+        if search:
+            await set_trigram_threshold(session, get_settings().search_trigram_threshold)
+            query = query.where(
+                or_(trigram_match(Channel.username, search), trigram_match(Channel.name, search))
+            )
+
+        result = await session.execute(query)
         return list(result.scalars().all())
 
     @staticmethod
@@ -0,0 +1,74 @@
+"""Total-count strategies for paginated listings."""
+import json
+from typing import Awaitable, Callable, Literal, Optional
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# exact: count(*) over the filtered query; estimate: cached counters or the
+# planner's row estimate; none: no total, only has_more
+CountMode = Literal["exact", "estimate", "none"]
+
+
+async def count_rows(session: AsyncSession, query: Select) -> int:
+    """Exact number of rows returned by ``query``."""
+    result = await session.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+    return result.scalar() or 0
+
+
+async def estimate_rows(session: AsyncSession, query: Select) -> int:
+    """
+    Planner estimate of the number of rows returned by ``query``.
+
+    Costs one ``EXPLAIN`` (planning only, nothing is executed). The estimate
+    follows table statistics, so it can be off for selective filters.
+    """
+    connection = await session.connection()
+    compiled = query.order_by(None).compile(
+        dialect=connection.dialect,
+        compile_kwargs={"render_postcompile": True},
+    )
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def listing_total(
+    session: AsyncSession,
+    query: Select,
+    mode: CountMode,
+    skip: Optional[int],
+    page_size: int,
+    has_more: bool,
+    estimate: Optional[Callable[[], Awaitable[int]]] = None,
+) -> Optional[int]:
+    """
+    Total of a paginated listing after one of its pages was fetched.
+
+    Args:
+        query: The filtered, unpaginated listing query
+        mode: Count strategy
+        skip: Offset of the page, None for a page fetched by cursor
+        page_size: Number of rows on the page
+        has_more: Whether a next page exists
+        estimate: Cheaper estimate to use instead of the planner's
+
+    Returns:
+        The total, or None in ``none`` mode
+    """
+    if mode == "none":
+        return None
+    # The last page of an offset listing gives the exact total for free
+    # (unless the offset is past the end)
+    if skip is not None and not has_more and (page_size or not skip):
+        return skip + page_size
+    if mode == "exact":
+        return await count_rows(session, query)
+
+    total = await estimate() if estimate else await estimate_rows(session, query)
+    # Never report fewer rows than are known to exist
+    return max(total, (skip or 0) + page_size + int(has_more))
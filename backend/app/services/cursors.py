@@ -0,0 +1,64 @@
+"""Opaque pagination cursors."""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple, Type, Union
+
+Key = Union[str, int]
+
+
+def _encode(payload: dict) -> str:
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _decode(cursor: str) -> dict:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(data)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def encode_keyset(sort_value: datetime, key: Key) -> str:
+    """Cursor positioned after the row with this ``(sort_value, key)``."""
+    return _encode({"v": sort_value.isoformat(), "k": key})
+
+
+def decode_keyset(cursor: str, key_type: Type[Key] = str) -> Tuple[datetime, Key]:
+    """
+    Read a cursor written by ``encode_keyset`` with a key of ``key_type``.
+
+    Raises:
+        ValueError: If the cursor is malformed or of another kind
+    """
+    payload = _decode(cursor)
+    try:
+        sort_value, key = datetime.fromisoformat(payload["v"]), payload["k"]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if type(key) is not key_type:
+        raise ValueError("Invalid cursor")
+    return sort_value, key
+
+
+def encode_offset(offset: int) -> str:
+    """Cursor for results that are only addressable by position (ranked search)."""
+    return _encode({"o": offset})
+
+
+def decode_offset(cursor: str) -> int:
+    """
+    Read a cursor written by ``encode_offset``.
+
+    Raises:
+        ValueError: If the cursor is malformed or of another kind
+    """
+    offset = _decode(cursor).get("o")
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
@@ -0,0 +1,30 @@
+"""Data version counters behind HTTP validators."""
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.data_version import DataVersion
+
+
+class DataVersionService:
+    """
+    Service reading the ``data_versions`` counters.
+
+    Every commit that writes a table bumps the counters of the scopes
+    depending on it (see ``app.db.versions``), so a scope's version changes
+    whenever any response in that scope may have changed.
+    """
+
+    @staticmethod
+    async def get_version(session: AsyncSession, scope: str) -> Optional[int]:
+        """Current version of a scope, or None if it has never been bumped."""
+        result = await session.execute(
+            select(DataVersion.version).where(DataVersion.scope == scope)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def etag(scope: str, version: int) -> str:
+        """Weak entity tag for a scope version (responses are equivalent, not byte-identical)."""
+        return f'W/"{scope}-{version}"'
@@ -0,0 +1,244 @@
+"""Materialized feed membership (``feed_posts``)."""
+import asyncio
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import delete, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.feed import Feed
+from app.models.feed_post import FeedPost
+from app.models.post import Post
+from app.models.post_tag import PostTag
+from app.models.tag import Tag
+
+logger = get_logger(__name__)
+
+# Backfills currently running in this process (keeps task references alive)
+_running_backfills: Dict[int, asyncio.Task] = {}
+
+
+class FeedMembershipService:
+    """
+    Keep ``feed_posts`` equal to the posts matching each feed's tag filters.
+
+    Tag writes on a post re-evaluate that post against every feed, so a
+    feed page is a range scan of the ``(feed_id, published_at, post_id)``
+    primary key instead of a join over ``post_tags`` and a sort. When a
+    feed's filters change (or the feed is new) its rows are dropped and
+    rebuilt by a background backfill in short chunked transactions; until
+    it completes, ``materialized_at`` is None and readers fall back to the
+    join. Feeds without tag filters show every post and are not
+    materialized.
+    """
+
+    @staticmethod
+    async def sync_posts(session: AsyncSession, post_ids: Iterable[str]) -> None:
+        """
+        Bring the membership of posts in line with their current tags.
+
+        Call after changing the tags of ``post_ids``. Does not commit.
+        """
+        post_ids = list(set(post_ids))
+        if not post_ids:
+            return
+
+        result = await session.execute(select(Feed.id, Feed.tag_filters))
+        feeds = [(feed_id, set(filters)) for feed_id, filters in result.all() if filters]
+        if not feeds:
+            return
+
+        result = await session.execute(
+            select(PostTag.post_id, Tag.name)
+            .join(Tag, Tag.id == PostTag.tag_id)
+            .where(PostTag.post_id.in_(post_ids))
+        )
+        tag_names: Dict[str, Set[str]] = {}
+        for post_id, name in result.all():
+            tag_names.setdefault(post_id, set()).add(name)
+
+        result = await session.execute(
+            select(Post.id, Post.published_at).where(Post.id.in_(post_ids))
+        )
+        published = dict(result.all())
+
+        wanted = {
+            (feed_id, post_id)
+            for post_id in published
+            for feed_id, filters in feeds
+            if filters & tag_names.get(post_id, set())
+        }
+        result = await session.execute(
+            select(FeedPost.feed_id, FeedPost.post_id).where(FeedPost.post_id.in_(post_ids))
+        )
+        existing = set(result.all())
+
+        stale = existing - wanted
+        if stale:
+            await session.execute(
+                delete(FeedPost).where(tuple_(FeedPost.feed_id, FeedPost.post_id).in_(list(stale)))
+            )
+        missing = wanted - existing
+        if missing:
+            await session.execute(
+                pg_insert(FeedPost)
+                .values([
+                    {"feed_id": feed_id, "published_at": published[post_id], "post_id": post_id}
+                    for feed_id, post_id in missing
+                ])
+                .on_conflict_do_nothing()
+            )
+
+    @staticmethod
+    async def reset(session: AsyncSession, feed: Feed) -> None:
+        """
+        Drop the membership of a feed whose tag filters changed.
+
+        Readers fall back to the join until ``start_in_background`` (called
+        after the commit) has rebuilt it. Does not commit.
+        """
+        FeedMembershipService.cancel_backfill(feed.id)
+        await session.execute(delete(FeedPost).where(FeedPost.feed_id == feed.id))
+        feed.materialized_at = None
+
+    @staticmethod
+    async def feeds_with_tags(session: AsyncSession, names: Iterable[str]) -> List[Feed]:
+        """Feeds whose tag filters reference any of ``names``."""
+        names = set(names)
+        result = await session.execute(select(Feed))
+        return [feed for feed in result.scalars().all() if names.intersection(feed.tag_filters or ())]
+
+    @staticmethod
+    def cancel_backfill(feed_id: int) -> None:
+        """Stop the backfill of a feed running in this process, if any."""
+        task = _running_backfills.pop(feed_id, None)
+        if task:
+            task.cancel()
+
+    @staticmethod
+    def start_in_background(feed_id: int) -> bool:
+        """
+        Backfill a feed as a background task of this process.
+
+        Returns:
+            False if the feed is already being backfilled here
+        """
+        if feed_id in _running_backfills:
+            return False
+
+        def forget(done: asyncio.Task) -> None:
+            # A reset may already have replaced this task with a newer one
+            if _running_backfills.get(feed_id) is done:
+                del _running_backfills[feed_id]
+
+        task = asyncio.create_task(FeedMembershipService.run_backfill(feed_id))
+        _running_backfills[feed_id] = task
+        task.add_done_callback(forget)
+        return True
+
+    @staticmethod
+    async def resume_pending(session: AsyncSession) -> List[int]:
+        """
+        Start backfills for every filtered feed that is not materialized.
+
+        Returns:
+            IDs of the feeds being backfilled
+        """
+        result = await session.execute(select(Feed).where(Feed.materialized_at.is_(None)))
+        feed_ids = [feed.id for feed in result.scalars().all() if feed.tag_filters]
+        for feed_id in feed_ids:
+            FeedMembershipService.start_in_background(feed_id)
+        return feed_ids
+
+    @staticmethod
+    async def run_backfill(feed_id: int) -> int:
+        """Backfill a feed in its own session."""
+        from app.db.session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as session:
+            try:
+                return await FeedMembershipService.backfill(session, feed_id)
+            except Exception as e:
+                logger.error(f"Backfill of feed {feed_id} failed: {e}", exc_info=True)
+                raise
+
+    @staticmethod
+    async def backfill(
+        session: AsyncSession,
+        feed_id: int,
+        chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Insert every post matching a feed's tag filters, then mark it materialized.
+
+        Posts carrying a filter tag are walked in ID order, ``chunk_size`` at
+        a time, each chunk in its own transaction; rows written meanwhile by
+        ``sync_posts`` are kept. The backfill stops without marking the feed
+        if its filters change under it (the reset starts a new one).
+
+        Returns:
+            Number of rows inserted
+        """
+        chunk_size = chunk_size or get_settings().feed_backfill_chunk_size
+        result = await session.execute(select(Feed.tag_filters).where(Feed.id == feed_id))
+        filters = list(result.scalar_one_or_none() or ())
+        if not filters:
+            return 0
+
+        result = await session.execute(select(Tag.id).where(Tag.name.in_(filters)))
+        tag_ids = list(result.scalars().all())
+
+        inserted = 0
+        after: Optional[str] = None
+        while tag_ids:
+            query = select(PostTag.post_id).where(PostTag.tag_id.in_(tag_ids))
+            if after is not None:
+                query = query.where(PostTag.post_id > after)
+            result = await session.execute(
+                query.distinct().order_by(PostTag.post_id).limit(chunk_size)
+            )
+            chunk = list(result.scalars().all())
+            if not chunk:
+                break
+
+            result = await session.execute(
+                pg_insert(FeedPost)
+                .from_select(
+                    ["feed_id", "published_at", "post_id"],
+                    # Re-check the tags: one may have been unlinked since the chunk was read
+                    select(literal(feed_id), Post.published_at, Post.id).where(
+                        Post.id.in_(chunk),
+                        select(PostTag.post_id)
+                        .where(PostTag.post_id == Post.id, PostTag.tag_id.in_(tag_ids))
+                        .exists(),
+                    ),
+                )
+                .on_conflict_do_nothing()
+                .returning(FeedPost.post_id)
+            )
+            inserted += len(result.all())
+            after = chunk[-1]
+            if not await FeedMembershipService._filters_unchanged(session, feed_id, filters):
+                await session.rollback()
+                logger.info(f"Backfill of feed {feed_id} superseded after {inserted} posts")
+                return inserted
+            await session.commit()
+
+        if not await FeedMembershipService._filters_unchanged(session, feed_id, filters):
+            return inserted
+        await session.execute(
+            update(Feed).where(Feed.id == feed_id).values(materialized_at=datetime.utcnow())
+        )
+        await session.commit()
+        logger.info(f"Feed {feed_id} materialized: {inserted} posts backfilled")
+        return inserted
+
+    @staticmethod
+    async def _filters_unchanged(session: AsyncSession, feed_id: int, filters: List[str]) -> bool:
+        """Whether the feed still exists with ``filters`` (else a newer backfill takes over)."""
+        result = await session.execute(select(Feed.tag_filters).where(Feed.id == feed_id))
+        current = result.scalar_one_or_none()
+        return current is not None and list(current) == filters
@@ -6,20 +6,57 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.feed import Feed
 from app.schemas.feed import FeedCreate, FeedUpdate
+from app.services.feed_membership_service import FeedMembershipService
+from app.services.tag_bitmap_service import TagBitmapService
+from app.services.tag_expression import TagAnd, any_of, parse_tag_expression
 
 
 class FeedService:
-    """Service for feed-related database operations."""
+    """
+    Service for feed-related database operations.
+
+    Feed membership is materialized in ``feed_posts`` (see
+    ``FeedMembershipService``); creating a feed or changing its tag filters
+    starts a background backfill and returns right away.
+    """
 
     @staticmethod
     async def create(session: AsyncSession, feed_data: FeedCreate) -> Feed:
-        """Create a new feed."""
+        """Create a new feed and start backfilling its membership."""
         feed = Feed(name=feed_data.name, tag_filters=feed_data.tag_filters)
         session.add(feed)
         await session.commit()
         await session.refresh(feed)
+        if feed.tag_filters:
+            FeedMembershipService.start_in_background(feed.id)
         return feed
 
+    @staticmethod
+    async def preview_count(
+        tag_filters: Optional[List[str]] = None,
+        tag_expression: Optional[str] = None,
+    ) -> int:
+        """
+        Number of posts a feed with these filters would show.
+
+        Served from the in-memory tag bitmaps, cheap enough to run on every
+        edit. With both arguments, posts must match the expression and
+        carry one of the filter tags.
+
+        Raises:
+            ValueError: If the tag expression is invalid
+        """
+        operands = []
+        if tag_expression is not None:
+            operands.append(parse_tag_expression(tag_expression))
+        if tag_filters:
+            operands.append(any_of(tag_filters))
+        index = await TagBitmapService.current_index()
+        if not operands:
+            return len(index)
+        expression = operands[0] if len(operands) == 1 else TagAnd(tuple(operands))
+        return index.count(expression)
+
     @staticmethod
     async def get_by_id(session: AsyncSession, feed_id: int) -> Optional[Feed]:
         """Get a feed by ID."""
@@ -38,27 +75,64 @@ class FeedService:
         feed_id: int,
         feed_data: FeedUpdate,
     ) -> Optional[Feed]:
-        """Update a feed."""
+        """Update a feed. New tag filters rebuild its membership in the background."""
         feed = await FeedService.get_by_id(session, feed_id)
         if not feed:
             return None
 
+        filters_changed = (
+            feed_data.tag_filters is not None and feed_data.tag_filters != feed.tag_filters
+        )
         if feed_data.name is not None:
             feed.name = feed_data.name
-        if feed_data.tag_filters is not None:
+        if filters_changed:
             feed.tag_filters = feed_data.tag_filters
+            await FeedMembershipService.reset(session, feed)
 
         await session.commit()
         await session.refresh(feed)
+        if filters_changed and feed.tag_filters:
+            FeedMembershipService.start_in_background(feed.id)
         return feed
 
+    @staticmethod
+    async def replace_tag_in_filters(
+        session: AsyncSession,
+        old_name: str,
+        new_name: Optional[str],
+    ) -> List[Feed]:
+        """
+        Rewrite ``old_name`` to ``new_name`` in every feed's tag filters.
+
+        With ``new_name=None`` the tag is dropped from the filters. Feed
+        membership is left as is: the caller resets the feeds whose matching
+        posts change. Does not commit.
+
+        Returns:
+            Feeds whose filters changed
+        """
+        changed = []
+        for feed in await FeedService.get_all(session):
+            if not feed.tag_filters or old_name not in feed.tag_filters:
+                continue
+
+            filters = [new_name if name == old_name else name for name in feed.tag_filters]
+            feed.tag_filters = [
+                name for name in dict.fromkeys(filters) if name is not None
+            ]
+            changed.append(feed)
+
+        await session.flush()
+        return changed
+
     @staticmethod
     async def delete(session: AsyncSession, feed_id: int) -> bool:
-        """Delete a feed."""
+        """Delete a feed (its ``feed_posts`` rows cascade)."""
         feed = await FeedService.get_by_id(session, feed_id)
         if not feed:
             return False
 
+        FeedMembershipService.cancel_backfill(feed.id)
         await session.delete(feed)
         await session.commit()
         return True
@@ -0,0 +1,81 @@
+"""Postgres full-text and trigram search expressions."""
+import re
+
+from sqlalchemy import func, literal_column, or_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.post import SEARCH_TEXT_CONFIGS, search_vector
+
+# Letters and digits runs: the words of a query, free of tsquery operators
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def ts_query(query: str) -> ColumnElement:
+    """
+    Build a ``tsquery`` matching any word of ``query`` under any of the text configurations.
+
+    Words are OR-ed, as in the memory index: the query is split into words
+    (so no ``tsquery`` syntax gets through) that are joined with ``|`` for
+    ``to_tsquery``, which stems them and drops stop words per configuration.
+    Phrases are matched separately (see ``ts_phrase_match``).
+    """
+    words = " | ".join(_WORD_RE.findall(query))
+    tsqueries = [
+        func.to_tsquery(literal_column(f"'{config}'::regconfig"), words)
+        for config in SEARCH_TEXT_CONFIGS
+    ]
+    combined = tsqueries[0]
+    for tsquery in tsqueries[1:]:
+        combined = combined.op("||")(tsquery)
+    return combined
+
+
+def ts_match(query: str) -> ColumnElement:
+    """Condition matching posts whose search vector satisfies ``query`` (GIN-indexed)."""
+    return search_vector.op("@@")(ts_query(query))
+
+
+def ts_phrase_match(phrase: str) -> ColumnElement:
+    """
+    Condition matching posts containing ``phrase`` with its words in order.
+
+    ``phraseto_tsquery`` checks the lexeme positions stored in the search
+    vector, after the GIN index has narrowed the candidates.
+    """
+    tsqueries = [
+        func.phraseto_tsquery(literal_column(f"'{config}'::regconfig"), phrase)
+        for config in SEARCH_TEXT_CONFIGS
+    ]
+    combined = tsqueries[0]
+    for tsquery in tsqueries[1:]:
+        combined = combined.op("||")(tsquery)
+    return search_vector.op("@@")(combined)
+
+
+def ts_rank(query: str) -> ColumnElement:
+    """Cover-density rank of a post for ``query``."""
+    return func.ts_rank_cd(search_vector, ts_query(query))
+
+
+async def set_trigram_threshold(session: AsyncSession, threshold: float) -> None:
+    """Set the ``pg_trgm`` word similarity threshold for the current transaction."""
+    await session.execute(
+        text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+        {"threshold": str(threshold)},
+    )
+
+
+def trigram_match(column: ColumnElement, query: str) -> ColumnElement:
+    """
+    Substring or typo-tolerant match of ``query`` in ``column``.
+
+    Both ``ILIKE '%query%'`` and the word similarity operator ``%>`` are
+    served by a ``gin_trgm_ops`` index on the column.
+    """
+    return or_(column.ilike(f"%{query}%"), column.op("%>")(query))
+
+
+def trigram_rank(column: ColumnElement, query: str) -> ColumnElement:
+    """Similarity of ``query`` to the best matching part of ``column``."""
+    return func.word_similarity(query, column)
@@ -0,0 +1,124 @@
+"""MinHash signatures and LSH banding for near-duplicate and related posts."""
+import random
+from array import array
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.core.config import get_settings
+from app.services.text_analyzer import ANALYZER_VERSION, TextAnalyzer, get_text_analyzer
+
+# Mersenne prime for the (a * x + b) mod p hash family
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: signatures are stored, so the permutations must never change
+SEED = 1
+
+
+def _hash32(value: str) -> int:
+    """Stable 32-bit hash of a string (``hash()`` is salted per process)."""
+    return int.from_bytes(blake2b(value.encode(), digest_size=4).digest(), "little")
+
+
+def pack(values: Sequence[int]) -> bytes:
+    """Serialize 32-bit unsigned integers."""
+    return array("I", values).tobytes()
+
+
+def unpack(data: bytes) -> array:
+    """Deserialize integers written by ``pack``."""
+    values = array("I")
+    values.frombytes(data)
+    return values
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    intersection = len(a & b)
+    return intersection / (len(a) + len(b) - intersection)
+
+
+class MinHasher:
+    """
+    MinHash over word shingles, with banding for locality-sensitive hashing.
+
+    A post is reduced to the set of hashes of its analyzed word n-grams
+    (shingles). Its signature keeps, for each of ``num_hashes`` random hash
+    functions, the minimum over the set; two signatures agree at a position
+    with probability equal to the Jaccard similarity of the sets. The
+    signature is cut into ``bands`` bands of ``num_hashes // bands`` rows and
+    each band is hashed to a bucket: posts sharing any bucket are candidate
+    neighbours. With b bands of r rows, a pair of similarity s collides with
+    probability ``1 - (1 - s**r)**b``.
+    """
+
+    def __init__(
+        self,
+        num_hashes: int = 64,
+        bands: int = 16,
+        shingle_size: int = 1,
+        analyzer: Optional[TextAnalyzer] = None,
+    ):
+        if num_hashes % bands:
+            raise ValueError("num_hashes must be a multiple of bands")
+        self.num_hashes = num_hashes
+        self.bands = bands
+        self.rows = num_hashes // bands
+        self.shingle_size = shingle_size
+        self.analyzer = analyzer or get_text_analyzer()
+
+        rng = random.Random(SEED)
+        self._params: List[Tuple[int, int]] = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_hashes)
+        ]
+
+    @property
+    def version(self) -> str:
+        """Identifies the parameters that stored signatures were computed with."""
+        return f"{self.num_hashes}x{self.bands}-k{self.shingle_size}-a{ANALYZER_VERSION}"
+
+    def shingles(self, text: str) -> Set[int]:
+        """Hashes of the word n-grams of ``text`` (stop words excluded)."""
+        terms = self.analyzer.terms(text)
+        k = self.shingle_size
+        if len(terms) < k:
+            return {_hash32(" ".join(terms))} if terms else set()
+        return {_hash32(" ".join(terms[i:i + k])) for i in range(len(terms) - k + 1)}
+
+    def signature(self, shingles: Iterable[int]) -> List[int]:
+        """MinHash signature of a shingle set (all ``MAX_HASH`` when empty)."""
+        values = list(shingles)
+        if not values:
+            return [MAX_HASH] * self.num_hashes
+        prime = MERSENNE_PRIME
+        return [
+            min((a * x + b) % prime for x in values) & MAX_HASH
+            for a, b in self._params
+        ]
+
+    def buckets(self, signature: Sequence[int]) -> List[int]:
+        """Signed 64-bit bucket key of every band of a signature."""
+        rows = self.rows
+        return [
+            int.from_bytes(
+                blake2b(pack(signature[band * rows:(band + 1) * rows]), digest_size=8).digest(),
+                "little",
+                signed=True,
+            )
+            for band in range(self.bands)
+        ]
+
+
+@lru_cache()
+def get_min_hasher() -> MinHasher:
+    """Get the MinHash configuration shared by ingest and queries."""
+    settings = get_settings()
+    return MinHasher(
+        num_hashes=settings.related_num_hashes,
+        bands=settings.related_bands,
+        shingle_size=settings.related_shingle_size,
+    )
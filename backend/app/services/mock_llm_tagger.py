@@ -4,7 +4,9 @@ from typing import List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.models.post import TaggingStatus
 from app.models.tag import AuthorType, Tag
 from app.services.post_service import PostService
 from app.services.tag_service import TagService
@@ -34,6 +36,23 @@ PREDEFINED_TAGS = [
 class MockLLMTagger:
     """Mock LLM tagger that randomly assigns tags to posts."""
 
+    @staticmethod
+    def suggest_tags(content: str = "", num_tags: int = None) -> List[str]:
+        """
+        Pick tag names for a post.
+
+        Args:
+            content: Post text content (ignored by the mock)
+            num_tags: Number of tags to pick (default: random 1-3)
+
+        Returns:
+            List of tag names
+        """
+        if num_tags is None:
+            num_tags = random.randint(1, 3)
+        num_tags = min(num_tags, len(PREDEFINED_TAGS))
+        return random.sample(PREDEFINED_TAGS, num_tags)
+
     @staticmethod
     async def tag_post(
         session: AsyncSession,
@@ -56,13 +75,8 @@ class MockLLMTagger:
             logger.warning(f"Post {post_id} not found for tagging")
             return []
 
-        # Determine number of tags (1-3, or specified)
-        if num_tags is None:
-            num_tags = random.randint(1, 3)
-        num_tags = min(num_tags, len(PREDEFINED_TAGS))
-
         # Get or create tags
-        selected_tag_names = random.sample(PREDEFINED_TAGS, num_tags)
+        selected_tag_names = MockLLMTagger.suggest_tags(post.content, num_tags)
         assigned_tags = []
 
         for tag_name in selected_tag_names:
@@ -70,14 +84,9 @@ class MockLLMTagger:
             from app.schemas.tag import TagCreate
 
             tag_data = TagCreate(name=tag_name, author_type=AuthorType.LLM)
+            # Existing tags keep the author type they were created with: the
+            # assignment to this post is recorded as LLM on post_tags
             tag = await TagService.get_or_create(session, tag_data)
-
-            # Ensure tag has LLM author type
-            if tag.author_type != AuthorType.LLM:
-                tag.author_type = AuthorType.LLM
-                await session.commit()
-                await session.refresh(tag)
-
             assigned_tags.append(tag)
 
         # Add tags to post (only if not already present)
@@ -85,9 +94,16 @@ class MockLLMTagger:
         new_tag_ids = [tag.id for tag in assigned_tags if tag.id not in existing_tag_ids]
 
         if new_tag_ids:
-            await PostService.add_tags(session, post_id, new_tag_ids)
+            await PostService.add_tags(session, post_id, new_tag_ids, author_type=AuthorType.LLM)
             logger.info(f"Tagged post {post_id} with {len(new_tag_ids)} tags: {selected_tag_names}")
 
+        await PostService.set_tagging_status(
+            session,
+            [post_id],
+            TaggingStatus.TAGGED,
+            tagger_version=get_settings().tagger_version,
+        )
+
         return assigned_tags
 
     @staticmethod
@@ -96,7 +112,10 @@ class MockLLMTagger:
         limit: int = 100,
     ) -> dict:
         """
-        Tag all posts that don't have any LLM tags.
+        Tag posts from the tagging backlog.
+
+        Posts are claimed with ``SKIP LOCKED``, so several workers can run this
+        concurrently without tagging the same post twice.
 
         Args:
             session: Database session
@@ -105,33 +124,31 @@ class MockLLMTagger:
         Returns:
             Dictionary with statistics
         """
-        from sqlalchemy import select
-        from app.models.post import Post
-        from app.models.post_tag import PostTag
-
-        from sqlalchemy import func
-
-        # Get posts without any tags
-        result = await session.execute(
-            select(Post)
-            .outerjoin(PostTag, Post.id == PostTag.post_id)
-            .group_by(Post.id)
-            .having(func.count(PostTag.tag_id) == 0)
-            .limit(limit)
+        settings = get_settings()
+
+        # Claim a disjoint batch from the tagging backlog
+        post_ids = await PostService.claim_for_tagging(
+            session,
+            limit=limit,
+            lease_seconds=settings.tagging_claim_lease_seconds,
         )
-        untagged_posts = result.scalars().all()
 
         tagged_count = 0
-        for post in untagged_posts:
+        failed_ids = []
+        for post_id in post_ids:
             try:
-                await MockLLMTagger.tag_post(session, post.id)
+                await MockLLMTagger.tag_post(session, post_id)
                 tagged_count += 1
             except Exception as e:
-                logger.error(f"Error tagging post {post.id}: {e}")
+                logger.error(f"Error tagging post {post_id}: {e}")
+                await session.rollback()
+                failed_ids.append(post_id)
+
+        await PostService.set_tagging_status(session, failed_ids, TaggingStatus.FAILED)
 
-        logger.info(f"Tagged {tagged_count} out of {len(untagged_posts)} untagged posts")
+        logger.info(f"Tagged {tagged_count} out of {len(post_ids)} untagged posts")
         return {
-            "processed": len(untagged_posts),
+            "processed": len(post_ids),
             "tagged": tagged_count,
         }
 
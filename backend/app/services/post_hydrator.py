@@ -0,0 +1,139 @@
+"""Request-scoped hydration of posts for API responses."""
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Set
+
+from fastapi import Depends, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from app.db.session import get_session
+from app.models.bookmark import Bookmark
+from app.models.post import Post
+from app.models.post_tag import PostTag
+from app.models.tag import Tag
+from app.schemas.post import (
+    PostPage,
+    PostPayload,
+    RelatedPostsPage,
+    SavedSearchMatchesPage,
+    SearchPage,
+)
+from app.schemas.tag import TagPayload
+
+# Loader options for post pages: tags and bookmark flags come from the
+# hydrator, and touching the relationships of a page post raises instead of
+# issuing a query per post
+PAGE_LOAD_OPTIONS = (raiseload(Post.tags), raiseload(Post.bookmarks))
+
+# Serializer for post pages, built once from the payload schema. pydantic-core
+# writes the page straight to JSON bytes (the encoder FastAPI itself uses),
+# skipping the per-response validation of ``response_model``.
+PAGE_ADAPTER = TypeAdapter(PostPage)
+# The same for the post lists carrying extra per-post fields
+SEARCH_PAGE_ADAPTER = TypeAdapter(SearchPage)
+RELATED_PAGE_ADAPTER = TypeAdapter(RelatedPostsPage)
+MATCHES_PAGE_ADAPTER = TypeAdapter(SavedSearchMatchesPage)
+
+
+class PostHydrator:
+    """
+    Attach tags and bookmark flags to a page of posts.
+
+    List routes load bare posts (see ``PAGE_LOAD_OPTIONS``) and hand the page
+    to the hydrator, which fetches the tags of all its posts in one query and
+    their bookmark flags in another, whatever the page size. One hydrator
+    lives for one request, so posts hydrated once are not fetched again.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._tags: Dict[str, List[TagPayload]] = {}
+        self._bookmarked: Set[str] = set()
+        self._loaded: Set[str] = set()
+
+    async def load(self, posts: Iterable[Post], bookmarked: bool = False) -> None:
+        """
+        Fetch tags and bookmark flags of the posts not loaded yet.
+
+        With ``bookmarked=True`` the posts are known to be bookmarked (the
+        bookmarks list) and only their tags are fetched.
+        """
+        post_ids = list({post.id for post in posts} - self._loaded)
+        if not post_ids:
+            return
+
+        result = await self.session.execute(
+            select(PostTag.post_id, Tag)
+            .join(Tag, Tag.id == PostTag.tag_id)
+            .where(PostTag.post_id.in_(post_ids))
+            .order_by(Tag.id)
+        )
+        tag_dumps: Dict[int, TagPayload] = {}
+        for post_id, tag in result.all():
+            if tag.id not in tag_dumps:
+                tag_dumps[tag.id] = {
+                    "id": tag.id,
+                    "name": tag.name,
+                    "author_type": tag.author_type,
+                    "created_at": tag.created_at,
+                }
+            self._tags.setdefault(post_id, []).append(tag_dumps[tag.id])
+
+        if bookmarked:
+            self._bookmarked.update(post_ids)
+        else:
+            result = await self.session.execute(
+                select(Bookmark.post_id).where(Bookmark.post_id.in_(post_ids))
+            )
+            self._bookmarked.update(result.scalars().all())
+
+        self._loaded.update(post_ids)
+
+    def to_dict(self, post: Post) -> PostPayload:
+        """
+        Serialize a loaded post with its tags and bookmark flag.
+
+        Reads the row's attributes directly into the ``PostSchema`` layout
+        instead of validating and dumping a schema per post.
+        """
+        return {
+            "id": post.id,
+            "channel_name": post.channel_name,
+            "channel_username": post.channel_username,
+            "content": post.content,
+            "media_urls": post.media_urls,
+            "original_url": post.original_url,
+            "published_at": post.published_at,
+            "tags": list(self._tags.get(post.id, ())),
+            "is_bookmarked": post.id in self._bookmarked,
+            "created_at": post.created_at,
+        }
+
+    async def hydrate(self, posts: Sequence[Post], bookmarked: bool = False) -> List[PostPayload]:
+        """Load and serialize a page of posts, keeping their order."""
+        await self.load(posts, bookmarked=bookmarked)
+        return [self.to_dict(post) for post in posts]
+
+
+def page_response(
+    page: Mapping[str, Any],
+    response: Response,
+    adapter: TypeAdapter = PAGE_ADAPTER,
+) -> Response:
+    """
+    Encode a post page to a JSON response with ``adapter`` (``PAGE_ADAPTER``).
+
+    ``response`` is the route's ``Response`` parameter; headers that
+    dependencies set on it (``ETag``) are carried over.
+    """
+    return Response(
+        content=adapter.dump_json(page),
+        media_type="application/json",
+        headers=response.headers,
+    )
+
+
+def get_post_hydrator(session: AsyncSession = Depends(get_session)) -> PostHydrator:
+    """Per-request hydrator sharing the request's database session."""
+    return PostHydrator(session)
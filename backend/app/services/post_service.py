@@ -1,15 +1,38 @@
 """Post service for database operations."""
+from datetime import datetime, timedelta
 from typing import List, Optional
 
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import ARRAY, Select, String, select, func, and_, or_, any_, literal, update, delete, distinct, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.elements import ColumnElement
 
-from app.models.post import Post
-from app.models.tag import Tag
+from app.core.config import get_settings
+from app.models.post import Post, TaggingStatus
+from app.models.tag import AuthorType, Tag
 from app.models.bookmark import Bookmark
+from app.models.feed_post import FeedPost
 from app.models.post_tag import PostTag
+from app.models.tag_count import TagCount
 from app.schemas.post import PostCreate, PostUpdate
+from app.schemas.tag import TagCreate
+from app.services.counts import CountMode, estimate_rows, listing_total
+from app.services.cursors import decode_keyset, encode_keyset
+from app.services.feed_membership_service import FeedMembershipService
+from app.services.fulltext import set_trigram_threshold, trigram_match, ts_match, ts_phrase_match
+from app.services.post_hydrator import PAGE_LOAD_OPTIONS
+from app.services.query_parser import SearchQuery, parse_query
+from app.services.related_service import RelatedService
+from app.services.saved_search_service import SavedSearchService
+from app.services.search_index import get_search_index
+from app.services.search_sync_service import SearchSyncService
+from app.services.tag_expression import TagAnd, any_of, parse_tag_expression
+from app.services.suggest_index import get_suggest_index
+from app.services.tag_bitmap_service import TagBitmapService
+from app.services.tag_count_service import TagCountService
+from app.services.tag_service import TagService
 
 
 class PostService:
@@ -38,10 +61,20 @@ class PostService:
             )
             tags = result.scalars().all()
             post.tags = tags
+            await TagCountService.apply_deltas(
+                session, TagCountService.deltas(added=[tag.id for tag in tags])
+            )
 
         session.add(post)
+        await session.flush()
+        await FeedMembershipService.sync_posts(session, [post.id])
         await session.commit()
         await session.refresh(post, ["tags"])
+        await TagBitmapService.sync_posts(session, [post.id])
+        SearchSyncService.index_post(session, post)
+        get_suggest_index().add_channel_count(post.channel_username, 1)
+        await SavedSearchService.percolate(session, post)
+        await RelatedService.index_post(session, post)
         return post
 
     @staticmethod
@@ -62,9 +95,151 @@ class PostService:
         feed_id: Optional[int] = None,
         tag_names: Optional[List[str]] = None,
         search_query: Optional[str] = None,
-    ) -> tuple[List[Post], int]:
-        """Get paginated posts with optional filtering."""
-        query = select(Post).options(selectinload(Post.tags), selectinload(Post.bookmarks))
+        cursor: Optional[str] = None,
+        count: CountMode = "exact",
+        tag_expression: Optional[str] = None,
+    ) -> tuple[List[Post], Optional[int], Optional[str]]:
+        """
+        Get paginated posts with optional filtering, newest first.
+
+        Pages are addressed either by ``skip`` or by a ``cursor`` taken from
+        the previous page. A cursor resumes right after the last post seen
+        (keyset pagination on ``(published_at, id)``), so it stays cheap at
+        any depth and does not skip or repeat posts when new ones arrive.
+
+        ``count`` selects how the total is obtained: ``exact`` runs a
+        ``count(*)`` over the filtered query, ``estimate`` reads a cached tag
+        counter or the planner's row estimate, ``none`` skips it (the total
+        is None and only the next cursor tells whether more posts exist). The
+        last page of an offset listing yields an exact total for free.
+
+        A boolean ``tag_expression`` (see ``parse_tag_expression``) is served
+        from the in-memory tag bitmaps together with the feed and tag
+        filters, with an exact total; it cannot be combined with a search.
+
+        Returns:
+            Tuple of (posts, total matching posts or None, cursor of the next page or None)
+
+        Raises:
+            ValueError: If the cursor, the search query or the tag expression is invalid
+        """
+        if tag_expression is not None:
+            if search_query:
+                raise ValueError("A tag expression cannot be combined with a search query")
+            return await PostService._get_by_tag_expression(
+                session, tag_expression, skip, limit, feed_id, tag_names, cursor, count
+            )
+
+        query = select(Post).options(*PAGE_LOAD_OPTIONS)
+        filtered, timeline = await PostService._apply_filters(
+            session, query, feed_id, tag_names, search_query
+        )
+
+        # Apply pagination and ordering (served by ix_posts_published_at_id,
+        # or the feed_posts primary key for a materialized feed)
+        if cursor:
+            published_at, post_id = decode_keyset(cursor)
+            query = filtered.where(tuple_(*timeline) < (published_at, post_id))
+        else:
+            query = filtered.offset(skip)
+        query = query.order_by(*(column.desc() for column in timeline)).limit(limit + 1)
+
+        result = await session.execute(query)
+        posts = list(result.unique().scalars().all())
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            next_cursor = encode_keyset(posts[-1].published_at, posts[-1].id)
+
+        total = await listing_total(
+            session,
+            filtered,
+            count,
+            skip=None if cursor else skip,
+            page_size=len(posts),
+            has_more=next_cursor is not None,
+            estimate=lambda: PostService._estimate_total(
+                session, filtered, feed_id, tag_names, search_query
+            ),
+        )
+        return posts, total, next_cursor
+
+    @staticmethod
+    async def _get_by_tag_expression(
+        session: AsyncSession,
+        tag_expression: str,
+        skip: int,
+        limit: int,
+        feed_id: Optional[int],
+        tag_names: Optional[List[str]],
+        cursor: Optional[str],
+        count: CountMode,
+    ) -> tuple[List[Post], Optional[int], Optional[str]]:
+        """Page of posts matching a tag expression, from the tag bitmap index."""
+        operands = [parse_tag_expression(tag_expression)]
+        if feed_id:
+            from app.models.feed import Feed
+
+            feed_result = await session.execute(select(Feed.tag_filters).where(Feed.id == feed_id))
+            feed_filters = feed_result.scalar_one_or_none()
+            if feed_filters:
+                operands.append(any_of(feed_filters))
+        if tag_names:
+            operands.append(any_of(tag_names))
+        expression = operands[0] if len(operands) == 1 else TagAnd(tuple(operands))
+
+        index = await TagBitmapService.current_index()
+        post_ids, total, has_more = index.page(
+            expression,
+            limit,
+            skip=0 if cursor else skip,
+            before=decode_keyset(cursor) if cursor else None,
+        )
+        result = await session.execute(
+            select(Post).options(*PAGE_LOAD_OPTIONS).where(Post.id.in_(post_ids))
+        )
+        loaded = {post.id: post for post in result.scalars().all()}
+        posts = [loaded[post_id] for post_id in post_ids if post_id in loaded]
+
+        next_cursor = None
+        if has_more and posts:
+            next_cursor = encode_keyset(posts[-1].published_at, posts[-1].id)
+        return posts, None if count == "none" else total, next_cursor
+
+    @staticmethod
+    async def _estimate_total(
+        session: AsyncSession,
+        filtered: Select,
+        feed_id: Optional[int],
+        tag_names: Optional[List[str]],
+        search_query: Optional[str],
+    ) -> int:
+        """Approximate number of posts matching the filters of a listing."""
+        # A single tag has a maintained counter (tag_counts)
+        if tag_names and len(set(tag_names)) == 1 and not feed_id and not search_query:
+            result = await session.execute(
+                select(TagCount.post_count)
+                .join(Tag, Tag.id == TagCount.tag_id)
+                .where(Tag.name == tag_names[0])
+            )
+            return result.scalar() or 0
+        return await estimate_rows(session, filtered)
+
+    @staticmethod
+    async def _apply_filters(
+        session: AsyncSession,
+        query: Select,
+        feed_id: Optional[int] = None,
+        tag_names: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+    ) -> tuple[Select, tuple[ColumnElement, ColumnElement]]:
+        """
+        Restrict a posts query by feed, tag names and search query.
+
+        Returns:
+            Tuple of (query, the ``(published_at, id)`` columns to order it by)
+        """
+        timeline = (Post.published_at, Post.id)
 
         # Filter by feed (tag filters)
         if feed_id:
@@ -72,31 +247,168 @@ class PostService:
 
             feed_result = await session.execute(select(Feed).where(Feed.id == feed_id))
             feed = feed_result.scalar_one_or_none()
-            if feed and feed.tag_filters:
-                # Join with tags and filter
-                query = query.join(PostTag).join(Tag).where(
-                    Tag.name.in_(feed.tag_filters)
-                ).distinct()
+            if feed and feed.tag_filters and feed.materialized_at:
+                # Materialized membership, already in timeline order
+                query = query.join(
+                    FeedPost, and_(FeedPost.post_id == Post.id, FeedPost.feed_id == feed.id)
+                )
+                timeline = (FeedPost.published_at, FeedPost.post_id)
+            elif feed and feed.tag_filters:
+                # Membership still being backfilled: evaluate the filters
+                query = query.where(Post.id.in_(PostService._tagged_with(feed.tag_filters)))
 
         # Filter by tag names
         if tag_names:
-            query = query.join(PostTag).join(Tag).where(Tag.name.in_(tag_names)).distinct()
+            query = query.where(Post.id.in_(PostService._tagged_with(tag_names)))
 
-        # Search in content
+        # Search query: channel, tag and date clauses, then words and phrases
         if search_query:
-            query = query.where(Post.content.ilike(f"%{search_query}%"))
+            parsed = parse_query(search_query)
+            query = query.where(*PostService.filter_conditions(parsed))
+            if parsed.has_text:
+                query = query.where(*await PostService.text_conditions(session, parsed))
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        count_result = await session.execute(count_query)
-        total = count_result.scalar() or 0
+        return query, timeline
 
-        # Apply pagination and ordering
-        query = query.order_by(Post.published_at.desc()).offset(skip).limit(limit)
+    @staticmethod
+    def _tagged_with(tag_names: List[str]) -> Select:
+        """IDs of the posts carrying any of ``tag_names``."""
+        return select(PostTag.post_id).join(Tag, Tag.id == PostTag.tag_id).where(
+            Tag.name.in_(tag_names)
+        )
 
-        result = await session.execute(query)
-        posts = result.unique().scalars().all()
-        return list(posts), total
+    @staticmethod
+    def filter_conditions(parsed: SearchQuery) -> List[ColumnElement]:
+        """
+        Conditions for the channel, tag and date clauses of a search query.
+
+        Each one is served by an index: ``channel_username``, the ``post_tags``
+        primary key and ``published_at``.
+        """
+        conditions = []
+        if parsed.channels:
+            conditions.append(Post.channel_username.in_(parsed.channels))
+        for tag_name in parsed.tags:
+            conditions.append(
+                Post.id.in_(
+                    select(PostTag.post_id)
+                    .join(Tag, Tag.id == PostTag.tag_id)
+                    .where(Tag.name == tag_name)
+                )
+            )
+        if parsed.after:
+            conditions.append(Post.published_at >= parsed.after)
+        if parsed.before:
+            conditions.append(Post.published_at < parsed.before)
+        return conditions
+
+    @staticmethod
+    def id_in(post_ids) -> ColumnElement:
+        """
+        ``Post.id = ANY(:ids)`` with the IDs bound as a single array parameter.
+
+        ``in_`` binds one parameter per ID, which breaks past the driver's
+        65535 parameter limit and bloats the statement for large ID sets.
+        """
+        return Post.id == any_(literal(list(post_ids), ARRAY(String)))
+
+    @staticmethod
+    async def text_conditions(session: AsyncSession, parsed: SearchQuery) -> List[ColumnElement]:
+        """
+        Conditions for the words and phrases of a search query on the configured backend.
+
+        With the memory backend the index matches are passed as one array of
+        IDs while there are at most ``search_max_filter_ids`` of them; broader
+        queries use the GIN-indexed ``search_vector`` instead.
+        """
+        settings = get_settings()
+        search_backend = settings.search_backend
+        if search_backend == "memory":
+            index = get_search_index()
+            if index.estimate(parsed.text, parsed.phrases) <= settings.search_max_filter_ids:
+                return [PostService.id_in(index.match_ids(parsed.text, parsed.phrases))]
+            search_backend = "postgres"
+
+        conditions = []
+        if search_backend == "postgres":
+            if parsed.text:
+                conditions.append(ts_match(parsed.text))
+            conditions.extend(ts_phrase_match(phrase) for phrase in parsed.phrases)
+            return conditions
+
+        if search_backend == "trigram":
+            await set_trigram_threshold(session, get_settings().search_trigram_threshold)
+            if parsed.text:
+                conditions.append(trigram_match(Post.content, parsed.text))
+        elif parsed.text:
+            conditions.append(Post.content.ilike(f"%{parsed.text}%"))
+        # Phrases are substring matches served by the content trigram index
+        conditions.extend(Post.content.ilike(f"%{phrase}%") for phrase in parsed.phrases)
+        return conditions
+
+    @staticmethod
+    async def get_facets(
+        session: AsyncSession,
+        feed_id: Optional[int] = None,
+        tag_names: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        interval: str = "day",
+        limit: int = 20,
+    ) -> dict:
+        """
+        Count the filtered posts per tag, per channel and per date bucket.
+
+        All facets come from one grouped query over the matching posts using
+        ``GROUPING SETS``, so the cost does not grow with the number of facet
+        values. Each facet keeps its ``limit`` largest values (the most recent
+        buckets for dates).
+        """
+        matched, _ = await PostService._apply_filters(
+            session,
+            select(
+                Post.id,
+                Post.channel_username,
+                func.date_trunc(interval, Post.published_at).label("bucket"),
+            ),
+            feed_id,
+            tag_names,
+            search_query,
+        )
+        matched = matched.distinct().cte("matched")
+
+        tag_name = Tag.name
+        channel = matched.c.channel_username
+        bucket = matched.c.bucket
+        result = await session.execute(
+            select(
+                func.grouping(tag_name, channel, bucket),
+                tag_name,
+                channel,
+                bucket,
+                func.count(distinct(matched.c.id)),
+            )
+            .select_from(matched)
+            .outerjoin(PostTag, PostTag.post_id == matched.c.id)
+            .outerjoin(Tag, Tag.id == PostTag.tag_id)
+            .group_by(
+                func.grouping_sets(tuple_(tag_name), tuple_(channel), tuple_(bucket))
+            )
+        )
+
+        # grouping() sets one bit per column that is NOT grouped in the row
+        facets = {"tags": [], "channels": [], "dates": []}
+        for grouping, name, username, date, count in result.all():
+            if grouping == 0b011 and name is not None:
+                facets["tags"].append({"value": name, "count": count})
+            elif grouping == 0b101:
+                facets["channels"].append({"value": username, "count": count})
+            elif grouping == 0b110:
+                facets["dates"].append({"value": date, "count": count})
+
+        facets["tags"].sort(key=lambda item: (-item["count"], item["value"]))
+        facets["channels"].sort(key=lambda item: (-item["count"], item["value"]))
+        facets["dates"].sort(key=lambda item: item["value"], reverse=True)
+        return {facet: items[:limit] for facet, items in facets.items()}
 
     @staticmethod
     async def update(
@@ -109,13 +421,18 @@ class PostService:
         if not post:
             return None
 
+        previous_content = post.content
         if post_data.content is not None:
             post.content = post_data.content
+            post.updated_at = datetime.utcnow()
         if post_data.media_urls is not None:
             post.media_urls = post_data.media_urls
 
         await session.commit()
         await session.refresh(post, ["tags"])
+        SearchSyncService.index_post(session, post, previous_content)
+        if post.content != previous_content:
+            await RelatedService.index_post(session, post)
         return post
 
     @staticmethod
@@ -123,23 +440,31 @@ class PostService:
         session: AsyncSession,
         post_id: str,
         tag_ids: List[int],
+        author_type: AuthorType = AuthorType.HUMAN,
     ) -> Optional[Post]:
-        """Add tags to a post."""
+        """
+        Add tags to a post.
+
+        Tags already on the post keep their assignment; new ones are recorded
+        as assigned by ``author_type``.
+        """
         post = await PostService.get_by_id(session, post_id)
         if not post:
             return None
 
-        result = await session.execute(select(Tag).where(Tag.id.in_(tag_ids)))
-        new_tags = result.scalars().all()
-
-        # Add only tags that aren't already associated
-        existing_tag_ids = {tag.id for tag in post.tags}
-        for tag in new_tags:
-            if tag.id not in existing_tag_ids:
-                post.tags.append(tag)
-
+        result = await session.execute(select(Tag.id).where(Tag.id.in_(tag_ids)))
+        added_tag_ids = await PostService.link_tags(
+            session,
+            [(post_id, tag_id) for tag_id in result.scalars().all()],
+            author_type=author_type,
+        )
+        await FeedMembershipService.sync_posts(session, [post_id])
         await session.commit()
         await session.refresh(post, ["tags"])
+        await TagBitmapService.sync_posts(session, [post_id])
+        if added_tag_ids:
+            # Saved searches with tag clauses can match the post now
+            await SavedSearchService.percolate(session, post)
         return post
 
     @staticmethod
@@ -153,11 +478,198 @@ class PostService:
         if not post:
             return None
 
+        removed_tag_ids = [tag.id for tag in post.tags if tag.id in tag_ids]
         post.tags = [tag for tag in post.tags if tag.id not in tag_ids]
+        await TagCountService.apply_deltas(session, TagCountService.deltas(removed=removed_tag_ids))
+        await session.flush()
+        await FeedMembershipService.sync_posts(session, [post_id])
         await session.commit()
         await session.refresh(post, ["tags"])
+        await TagBitmapService.sync_posts(session, [post_id])
+        return post
+
+    @staticmethod
+    async def replace_tags(
+        session: AsyncSession,
+        post_id: str,
+        tags_data: List[TagCreate],
+    ) -> Optional[Post]:
+        """
+        Replace all tags of a post in a single transaction.
+
+        Missing tags are created, then only the difference between the current
+        and the requested tag set is written: one delete for removed tags and
+        one insert per author type for added ones, each recorded as assigned
+        by the ``author_type`` it was requested with. Tags the post keeps are
+        confirmed by the editor and marked as assigned by a human. The
+        returned post carries the new tags without being reloaded.
+        """
+        post = await PostService.get_by_id(session, post_id)
+        if not post:
+            return None
+
+        wanted = await TagService.get_or_create_many(session, tags_data)
+        wanted_ids = {tag.id for tag in wanted.values()}
+        current_ids = {tag.id for tag in post.tags}
+
+        removed_ids = current_ids - wanted_ids
+        added_ids = wanted_ids - current_ids
+        kept_ids = current_ids & wanted_ids
+        if removed_ids:
+            await PostService.unlink_tags(
+                session,
+                PostTag.post_id == post_id,
+                PostTag.tag_id.in_(removed_ids),
+            )
+        author_types = {tag_data.name: tag_data.author_type for tag_data in tags_data}
+        added_by_author: dict[AuthorType, List[tuple[str, int]]] = {}
+        for name, tag in wanted.items():
+            if tag.id in added_ids:
+                added_by_author.setdefault(author_types[name], []).append((post_id, tag.id))
+        for author_type, pairs in added_by_author.items():
+            await PostService.link_tags(session, pairs, author_type=author_type)
+        if kept_ids:
+            await session.execute(
+                update(PostTag)
+                .where(
+                    PostTag.post_id == post_id,
+                    PostTag.tag_id.in_(kept_ids),
+                    PostTag.author_type != AuthorType.HUMAN,
+                )
+                .values(author_type=AuthorType.HUMAN)
+            )
+        if removed_ids or added_ids:
+            await FeedMembershipService.sync_posts(session, [post_id])
+
+        await session.commit()
+        set_committed_value(post, "tags", list(wanted.values()))
+        if removed_ids or added_ids:
+            await TagBitmapService.sync_posts(session, [post_id])
+        if added_ids:
+            await SavedSearchService.percolate(session, post)
         return post
 
+    @staticmethod
+    async def claim_for_tagging(
+        session: AsyncSession,
+        limit: int = 100,
+        lease_seconds: int = 600,
+    ) -> List[str]:
+        """
+        Claim a batch of posts waiting for LLM tagging.
+
+        Rows are picked from the tagging backlog index with
+        ``FOR UPDATE SKIP LOCKED`` and flipped to ``processing`` in the same
+        statement, so concurrent workers always receive disjoint batches.
+        Posts whose claim is older than ``lease_seconds`` are reclaimed.
+
+        Returns:
+            IDs of the claimed posts
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=lease_seconds)
+        claimable = (
+            select(Post.id)
+            .where(
+                or_(
+                    Post.tagging_status == TaggingStatus.PENDING,
+                    and_(
+                        Post.tagging_status == TaggingStatus.PROCESSING,
+                        Post.tagging_claimed_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(Post.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(
+            update(Post)
+            .where(Post.id.in_(claimable.scalar_subquery()))
+            .values(tagging_status=TaggingStatus.PROCESSING, tagging_claimed_at=now)
+            .returning(Post.id)
+            .execution_options(synchronize_session=False)
+        )
+        post_ids = list(result.scalars().all())
+        await session.commit()
+        return post_ids
+
+    @staticmethod
+    async def set_tagging_status(
+        session: AsyncSession,
+        post_ids: List[str],
+        status: TaggingStatus,
+        tagger_version: Optional[str] = None,
+        commit: bool = True,
+    ) -> None:
+        """Set the tagging status (and tagger version) of posts and release their claim."""
+        if not post_ids:
+            return
+
+        values = {"tagging_status": status, "tagging_claimed_at": None}
+        if tagger_version is not None:
+            values["tagger_version"] = tagger_version
+
+        await session.execute(
+            update(Post)
+            .where(Post.id.in_(post_ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
+            await session.commit()
+
+    @staticmethod
+    async def link_tags(
+        session: AsyncSession,
+        pairs: List[tuple[str, int]],
+        author_type: AuthorType = AuthorType.HUMAN,
+    ) -> List[int]:
+        """
+        Insert ``(post_id, tag_id)`` associations assigned by ``author_type`` in one statement.
+
+        Existing associations are left alone, with their original author. Tag counters are adjusted for
+        the rows actually inserted; feed membership is not (call
+        ``FeedMembershipService.sync_posts`` once all tag writes are done).
+        Does not commit.
+
+        Returns:
+            Tag IDs of the inserted associations
+        """
+        if not pairs:
+            return []
+
+        result = await session.execute(
+            pg_insert(PostTag)
+            .values([
+                {"post_id": post_id, "tag_id": tag_id, "author_type": author_type}
+                for post_id, tag_id in pairs
+            ])
+            .on_conflict_do_nothing()
+            .returning(PostTag.tag_id)
+        )
+        added = list(result.scalars().all())
+        await TagCountService.apply_deltas(session, TagCountService.deltas(added=added))
+        return added
+
+    @staticmethod
+    async def unlink_tags(session: AsyncSession, *conditions) -> List[int]:
+        """
+        Delete the ``post_tags`` rows matching ``conditions`` in one statement.
+
+        Tag counters are adjusted for the rows actually deleted; feed
+        membership is not (see ``link_tags``). Does not commit.
+
+        Returns:
+            Tag IDs of the deleted associations
+        """
+        result = await session.execute(
+            delete(PostTag).where(*conditions).returning(PostTag.tag_id)
+        )
+        removed = list(result.scalars().all())
+        await TagCountService.apply_deltas(session, TagCountService.deltas(removed=removed))
+        return removed
+
     @staticmethod
     async def is_bookmarked(session: AsyncSession, post_id: str) -> bool:
         """Check if a post is bookmarked."""
@@ -0,0 +1,113 @@
+"""Parser for the structured search query syntax."""
+import re
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
+
+# field:value, field:"quoted value", "quoted phrase" or a bare word
+TOKEN_RE = re.compile(r'(?:(\w+):)?(?:"([^"]*)"?|(\S+))')
+
+FIELDS = ("channel", "tag", "after", "before")
+
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m", "%Y")
+
+
+class SearchQuery(NamedTuple):
+    """
+    A parsed search query.
+
+    Free words match if any of them occurs in a post; every phrase must occur
+    with its words in order. Channel clauses are alternatives, tag clauses
+    all have to match. Dates are period starts: ``after:2025-01`` includes
+    January 2025, ``before:2025-01`` ends with December 2024.
+    """
+
+    text: str = ""
+    phrases: Tuple[str, ...] = ()
+    channels: Tuple[str, ...] = ()
+    tags: Tuple[str, ...] = ()
+    after: Optional[datetime] = None
+    before: Optional[datetime] = None
+
+    @property
+    def has_text(self) -> bool:
+        """Whether the query has words or phrases to match against content."""
+        return bool(self.text or self.phrases)
+
+    @property
+    def has_filters(self) -> bool:
+        """Whether the query restricts channel, tags or publication date."""
+        return bool(self.channels or self.tags or self.after or self.before)
+
+    @property
+    def match_text(self) -> str:
+        """All words of the query, for ranking and highlighting."""
+        return " ".join((self.text, *self.phrases)).strip()
+
+
+def parse_date(value: str) -> datetime:
+    """
+    Parse ``YYYY``, ``YYYY-MM`` or ``YYYY-MM-DD`` to the start of that period.
+
+    Raises:
+        ValueError: If the value is not a date in one of these forms
+    """
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date {value!r}: expected YYYY, YYYY-MM or YYYY-MM-DD")
+
+
+def parse_query(query: str) -> SearchQuery:
+    """
+    Parse ``channel:name tag:name after:date before:date "a phrase" words``.
+
+    Field names are case-insensitive and values may be quoted. A token with an
+    unknown field name (``http://...``) is kept as a plain word; an
+    unterminated quote runs to the end of the query.
+
+    Raises:
+        ValueError: If a date clause cannot be parsed
+    """
+    words: List[str] = []
+    phrases: List[str] = []
+    channels: List[str] = []
+    tags: List[str] = []
+    after: Optional[datetime] = None
+    before: Optional[datetime] = None
+
+    for match in TOKEN_RE.finditer(query):
+        field, quoted, bare = match.groups()
+        field = field.lower() if field else None
+        value = (quoted if quoted is not None else bare).strip()
+
+        if field not in FIELDS:
+            if field is None and quoted is not None:
+                if value:
+                    phrases.append(value)
+            else:
+                words.append(match.group(0).strip('"'))
+            continue
+        if not value:
+            continue
+
+        if field == "channel":
+            channels.append(value.lstrip("@"))
+        elif field == "tag":
+            tags.append(value)
+        elif field == "after":
+            start = parse_date(value)
+            after = start if after is None else max(after, start)
+        else:
+            start = parse_date(value)
+            before = start if before is None else min(before, start)
+
+    return SearchQuery(
+        text=" ".join(words),
+        phrases=tuple(dict.fromkeys(phrases)),
+        channels=tuple(dict.fromkeys(channels)),
+        tags=tuple(dict.fromkeys(tags)),
+        after=after,
+        before=before,
+    )
@@ -0,0 +1,210 @@
+"""Related posts via MinHash signatures and LSH buckets."""
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from sqlalchemy import delete, func, or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.post import Post
+from app.models.post_signature import PostLshBucket, PostSignature
+from app.models.post_tag import PostTag
+from app.services.minhash import get_min_hasher, jaccard, pack, unpack
+from app.services.post_hydrator import PAGE_LOAD_OPTIONS
+
+logger = get_logger(__name__)
+
+
+class RelatedPost(NamedTuple):
+    """A related post with the scores it was ranked by."""
+
+    post: Post
+    similarity: float  # Exact Jaccard similarity of the shingle sets
+    shared_tags: int
+
+
+class RelatedService:
+    """
+    Service for "more like this" lookups.
+
+    Every post gets a MinHash signature and one LSH bucket per signature band
+    at ingest. A lookup fetches the posts sharing a bucket with the source
+    post (indexed point lookups, independent of the corpus size), then
+    re-ranks that short candidate list by exact Jaccard similarity of the
+    stored shingle sets, breaking ties by the number of shared tags.
+    """
+
+    @staticmethod
+    async def index_post(session: AsyncSession, post: Post, commit: bool = True) -> PostSignature:
+        """Compute and store the signature and LSH buckets of a post."""
+        hasher = get_min_hasher()
+        shingles = hasher.shingles(post.content or "")
+        signature = hasher.signature(shingles)
+        values = {
+            "post_id": post.id,
+            "version": hasher.version,
+            "signature": pack(signature),
+            "shingles": pack(sorted(shingles)),
+        }
+        await session.execute(
+            pg_insert(PostSignature)
+            .values(values)
+            .on_conflict_do_update(
+                index_elements=[PostSignature.post_id],
+                set_={key: value for key, value in values.items() if key != "post_id"},
+            )
+        )
+
+        await session.execute(delete(PostLshBucket).where(PostLshBucket.post_id == post.id))
+        # Posts without words would all share every bucket
+        if shingles:
+            await session.execute(
+                pg_insert(PostLshBucket)
+                .values([
+                    {"band": band, "bucket": bucket, "post_id": post.id}
+                    for band, bucket in enumerate(hasher.buckets(signature))
+                ])
+                .on_conflict_do_nothing()
+            )
+        if commit:
+            await session.commit()
+        return PostSignature(**values)
+
+    @staticmethod
+    async def get_related(
+        session: AsyncSession,
+        post: Post,
+        limit: int = 10,
+        include_same_channel: bool = False,
+    ) -> List[RelatedPost]:
+        """
+        Posts most similar to ``post``, by default from other channels only.
+
+        Read-only: a post without an up-to-date signature (indexed before
+        signatures existed, or with other MinHash settings) gets one computed
+        in memory for this lookup; storing it is left to the backfill script.
+        """
+        settings = get_settings()
+        hasher = get_min_hasher()
+        result = await session.execute(select(PostSignature).where(PostSignature.post_id == post.id))
+        source = result.scalar_one_or_none()
+        if source is not None and source.version == hasher.version:
+            shingles = set(unpack(source.shingles))
+            signature = unpack(source.signature)
+        else:
+            shingles = hasher.shingles(post.content or "")
+            signature = hasher.signature(shingles)
+        if not shingles:
+            return []
+
+        # Candidates: posts sharing at least one band bucket, most shared bands
+        # first. Each bucket contributes at most ``related_max_bucket_rows``
+        # rows, read from the primary key before anything is grouped.
+        bucket_rows = union_all(*(
+            select(PostLshBucket.post_id)
+            .where(
+                PostLshBucket.band == band,
+                PostLshBucket.bucket == bucket,
+                PostLshBucket.post_id != post.id,
+            )
+            .limit(settings.related_max_bucket_rows)
+            for band, bucket in enumerate(hasher.buckets(signature))
+        )).subquery("bucket_rows")
+        shared_bands = func.count().label("shared_bands")
+        query = (
+            select(bucket_rows.c.post_id, shared_bands)
+            .group_by(bucket_rows.c.post_id)
+            .order_by(shared_bands.desc())
+            .limit(settings.related_max_candidates)
+        )
+        if not include_same_channel:
+            query = query.join(Post, Post.id == bucket_rows.c.post_id).where(
+                Post.channel_username != post.channel_username
+            )
+        candidate_ids = [post_id for post_id, _ in (await session.execute(query)).all()]
+        if not candidate_ids:
+            return []
+
+        candidate_shingles = await RelatedService._shingles(session, candidate_ids)
+        similarities = {
+            post_id: jaccard(shingles, candidate_shingles.get(post_id, set()))
+            for post_id in candidate_ids
+        }
+        shared_tags = await RelatedService._shared_tags(session, post, candidate_ids)
+
+        ranked = sorted(
+            (
+                post_id
+                for post_id, similarity in similarities.items()
+                if similarity >= settings.related_min_similarity
+            ),
+            key=lambda post_id: (similarities[post_id], shared_tags.get(post_id, 0)),
+            reverse=True,
+        )[:limit]
+        if not ranked:
+            return []
+
+        result = await session.execute(
+            select(Post)
+            .options(*PAGE_LOAD_OPTIONS)
+            .where(Post.id.in_(ranked))
+        )
+        posts = {related.id: related for related in result.scalars().all()}
+        return [
+            RelatedPost(posts[post_id], similarities[post_id], shared_tags.get(post_id, 0))
+            for post_id in ranked
+            if post_id in posts
+        ]
+
+    @staticmethod
+    async def _shingles(session: AsyncSession, post_ids: List[str]) -> Dict[str, Set[int]]:
+        """Stored shingle sets of posts."""
+        result = await session.execute(
+            select(PostSignature.post_id, PostSignature.shingles).where(
+                PostSignature.post_id.in_(post_ids)
+            )
+        )
+        return {post_id: set(unpack(shingles)) for post_id, shingles in result.all()}
+
+    @staticmethod
+    async def _shared_tags(session: AsyncSession, post: Post, post_ids: List[str]) -> Dict[str, int]:
+        """Number of tags each of ``post_ids`` shares with ``post``."""
+        tag_ids = [tag.id for tag in post.tags]
+        if not tag_ids:
+            return {}
+        result = await session.execute(
+            select(PostTag.post_id, func.count())
+            .where(PostTag.post_id.in_(post_ids), PostTag.tag_id.in_(tag_ids))
+            .group_by(PostTag.post_id)
+        )
+        return {post_id: count for post_id, count in result.all()}
+
+    @staticmethod
+    async def backfill(session: AsyncSession, batch_size: int = 500, limit: Optional[int] = None) -> int:
+        """
+        Index posts without an up-to-date signature, one batch per transaction.
+
+        Returns:
+            Number of posts indexed
+        """
+        version = get_min_hasher().version
+        count = 0
+        while limit is None or count < limit:
+            size = batch_size if limit is None else min(batch_size, limit - count)
+            result = await session.execute(
+                select(Post)
+                .outerjoin(PostSignature, PostSignature.post_id == Post.id)
+                .where(or_(PostSignature.post_id.is_(None), PostSignature.version != version))
+                .order_by(Post.id)
+                .limit(size)
+            )
+            posts = list(result.scalars().all())
+            if not posts:
+                break
+            for post in posts:
+                await RelatedService.index_post(session, post, commit=False)
+            await session.commit()
+            count += len(posts)
+            logger.info(f"Indexed signatures of {count} posts")
+        return count
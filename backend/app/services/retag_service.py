@@ -0,0 +1,233 @@
+"""Corpus re-tagging jobs."""
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.post import Post, TaggingStatus
+from app.models.post_tag import PostTag
+from app.models.retag_job import RetagJob, RetagJobStatus
+from app.models.tag import AuthorType
+from app.schemas.tag import TagCreate
+from app.services.feed_membership_service import FeedMembershipService
+from app.services.mock_llm_tagger import MockLLMTagger
+from app.services.post_service import PostService
+from app.services.saved_search_service import SavedSearchService
+from app.services.tag_bitmap_service import TagBitmapService
+from app.services.tag_service import TagService
+
+logger = get_logger(__name__)
+
+# Jobs currently running in this process (keeps task references alive)
+_running_jobs: dict[int, asyncio.Task] = {}
+
+
+class RetagService:
+    """
+    Re-tag the whole corpus against a named tagger version.
+
+    Posts are walked in primary-key order in chunks of ``chunk_size``; up to
+    ``concurrency`` chunks are processed at once, each in its own short
+    transaction, so only the rows of the chunk are ever locked. The job's
+    checkpoint only advances past a chunk once every chunk before it has
+    committed, and posts already at the target version are skipped, so a
+    job can be resumed after a crash without redoing finished work.
+    """
+
+    @staticmethod
+    async def get_by_id(session: AsyncSession, job_id: int) -> Optional[RetagJob]:
+        """Get a re-tag job by ID."""
+        result = await session.execute(select(RetagJob).where(RetagJob.id == job_id))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_or_create_job(
+        session: AsyncSession,
+        tagger_version: str,
+        chunk_size: int,
+        concurrency: int,
+    ) -> RetagJob:
+        """Return the unfinished job for ``tagger_version``, or create a new one."""
+        result = await session.execute(
+            select(RetagJob)
+            .where(
+                RetagJob.tagger_version == tagger_version,
+                RetagJob.status != RetagJobStatus.COMPLETED,
+            )
+            .order_by(RetagJob.created_at.desc())
+            .limit(1)
+        )
+        job = result.scalar_one_or_none()
+        if job:
+            job.status = RetagJobStatus.RUNNING
+            job.error = None
+        else:
+            job = RetagJob(tagger_version=tagger_version)
+            session.add(job)
+
+        job.chunk_size = chunk_size
+        job.concurrency = concurrency
+        job.updated_at = datetime.utcnow()
+        await session.commit()
+        await session.refresh(job)
+        return job
+
+    @staticmethod
+    def start_in_background(job_id: int) -> bool:
+        """
+        Run a job as a background task of this process.
+
+        Returns:
+            False if the job is already running here
+        """
+        if job_id in _running_jobs:
+            return False
+
+        task = asyncio.create_task(RetagService.run(job_id))
+        _running_jobs[job_id] = task
+        task.add_done_callback(lambda _: _running_jobs.pop(job_id, None))
+        return True
+
+    @staticmethod
+    async def run(job_id: int) -> RetagJob:
+        """Run (or resume) a re-tag job until the whole corpus is processed."""
+        from app.db.session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as session:
+            job = await RetagService.get_by_id(session, job_id)
+            if not job:
+                raise ValueError(f"Re-tag job {job_id} not found")
+
+            cursor = job.checkpoint_post_id
+            in_flight: deque[tuple[str, int, asyncio.Task]] = deque()
+            exhausted = False
+
+            logger.info(
+                f"Re-tag job {job.id} ({job.tagger_version}) starting after post {cursor!r}"
+            )
+            try:
+                while True:
+                    # Keep up to `concurrency` chunks in flight
+                    while not exhausted and len(in_flight) < job.concurrency:
+                        post_ids = await RetagService._next_chunk(
+                            session, cursor, job.tagger_version, job.chunk_size
+                        )
+                        if not post_ids:
+                            exhausted = True
+                            break
+                        cursor = post_ids[-1]
+                        task = asyncio.create_task(
+                            RetagService._run_chunk(post_ids, job.tagger_version)
+                        )
+                        in_flight.append((cursor, len(post_ids), task))
+
+                    if not in_flight:
+                        break
+
+                    # Checkpoint in key order so it never skips an unfinished chunk
+                    chunk_end, chunk_len, task = in_flight.popleft()
+                    await task
+                    job.checkpoint_post_id = chunk_end
+                    job.processed += chunk_len
+                    job.updated_at = datetime.utcnow()
+                    await session.commit()
+
+                job.status = RetagJobStatus.COMPLETED
+                job.finished_at = datetime.utcnow()
+                logger.info(f"Re-tag job {job.id} completed: {job.processed} posts")
+            except Exception as e:
+                for _, _, task in in_flight:
+                    task.cancel()
+                await asyncio.gather(*(task for _, _, task in in_flight), return_exceptions=True)
+                await session.rollback()
+                job.status = RetagJobStatus.FAILED
+                job.error = str(e)[:1000]
+                logger.error(f"Re-tag job {job.id} failed: {e}", exc_info=True)
+
+            job.updated_at = datetime.utcnow()
+            await session.commit()
+            return job
+
+    @staticmethod
+    async def _next_chunk(
+        session: AsyncSession,
+        after_post_id: Optional[str],
+        tagger_version: str,
+        chunk_size: int,
+    ) -> List[str]:
+        """Next ``chunk_size`` post IDs after ``after_post_id`` not yet at ``tagger_version``."""
+        query = select(Post.id).where(
+            Post.tagger_version.is_distinct_from(tagger_version)
+        )
+        if after_post_id is not None:
+            query = query.where(Post.id > after_post_id)
+        result = await session.execute(query.order_by(Post.id).limit(chunk_size))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def _run_chunk(post_ids: List[str], tagger_version: str) -> None:
+        """Re-tag one chunk in its own session and transaction."""
+        from app.db.session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as session:
+            await RetagService.retag_posts(session, post_ids, tagger_version)
+
+    @staticmethod
+    async def retag_posts(
+        session: AsyncSession,
+        post_ids: List[str],
+        tagger_version: str,
+    ) -> None:
+        """
+        Replace the LLM-assigned tags of ``post_ids`` in a single transaction.
+
+        Tags a human assigned are never removed, even if the LLM also suggests
+        or once created them.
+        """
+        result = await session.execute(
+            select(Post.id, Post.content).where(Post.id.in_(post_ids))
+        )
+        suggestions = {
+            post_id: MockLLMTagger.suggest_tags(content) for post_id, content in result.all()
+        }
+        if not suggestions:
+            return
+
+        tags = await TagService.get_or_create_many(
+            session,
+            [
+                TagCreate(name=name, author_type=AuthorType.LLM)
+                for names in suggestions.values()
+                for name in names
+            ],
+        )
+
+        await PostService.unlink_tags(
+            session,
+            PostTag.post_id.in_(list(suggestions)),
+            PostTag.author_type == AuthorType.LLM,
+        )
+        await PostService.link_tags(
+            session,
+            [
+                (post_id, tags[name].id)
+                for post_id, names in suggestions.items()
+                for name in names
+            ],
+            author_type=AuthorType.LLM,
+        )
+        await FeedMembershipService.sync_posts(session, suggestions)
+        await PostService.set_tagging_status(
+            session,
+            list(suggestions),
+            TaggingStatus.TAGGED,
+            tagger_version=tagger_version,
+            commit=False,
+        )
+        await session.commit()
+        await TagBitmapService.sync_posts(session, suggestions)
+        await SavedSearchService.percolate_posts(session, suggestions)
@@ -0,0 +1,392 @@
+"""Saved search service: stored queries matched against posts at ingest."""
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.logging import get_logger
+from app.models.post import Post
+from app.models.saved_search import SavedSearch, SavedSearchMatch, SavedSearchTerm
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchUpdate
+from app.services.counts import estimate_rows
+from app.services.fulltext import ts_match
+from app.services.post_hydrator import PAGE_LOAD_OPTIONS
+from app.services.query_parser import TOKEN_RE, SearchQuery, parse_query
+from app.services.text_analyzer import Token, get_text_analyzer
+
+logger = get_logger(__name__)
+
+# Anchor terms for channel and tag clauses; analyzed terms never contain ":"
+CHANNEL_TERM_PREFIX = "channel:"
+TAG_TERM_PREFIX = "tag:"
+
+
+def replace_tag_clause(query: str, old_name: str, new_name: Optional[str]) -> str:
+    """
+    Rewrite the ``tag:old_name`` clauses of a query to ``new_name``.
+
+    With ``new_name=None`` the clauses are dropped. The rest of the query is
+    kept as written.
+    """
+    pieces = []
+    end = 0
+    for match in TOKEN_RE.finditer(query):
+        field, quoted, bare = match.groups()
+        value = (quoted if quoted is not None else bare).strip()
+        if not field or field.lower() != "tag" or value != old_name:
+            continue
+        pieces.append(query[end:match.start()])
+        end = match.end()
+        if new_name is None:
+            # Drop the whitespace following the clause along with it
+            end += len(query[end:]) - len(query[end:].lstrip())
+        else:
+            quote = '"' if re.search(r'\s|"', new_name) else ""
+            pieces.append(f"{field}:{quote}{new_name}{quote}")
+    pieces.append(query[end:])
+    return "".join(pieces).strip()
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """
+    Convert an aware datetime to naive UTC; naive ones are already UTC.
+
+    Scraped posts carry Telegram's aware dates until they are reloaded,
+    while query dates are naive.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class SavedSearchService:
+    """
+    Service for saved searches and their matches.
+
+    Saved searches are percolated: instead of re-running every stored query,
+    each one is indexed by anchor terms it cannot match without, and an
+    ingested post is only checked against the searches anchored on one of
+    its own terms. The per-post cost follows the number of candidate
+    searches, not the number of saved searches.
+    """
+
+    @staticmethod
+    async def anchor_terms(session: AsyncSession, parsed: SearchQuery) -> List[str]:
+        """
+        Terms of which a matching post must contain at least one.
+
+        Every word of a phrase is required, so a phrase query is anchored on
+        the single rarest phrase word, by the query planner's estimate of
+        the posts containing it (``search_vector`` statistics, the same in
+        every worker and with every search backend). Free words are
+        alternatives and all become anchors. Queries without text are
+        anchored on one of their tags (all of which are required), or else
+        on their channels.
+
+        Raises:
+            ValueError: If the query has no words, phrases, tags or channels
+        """
+        analyzer = get_text_analyzer()
+        phrase_tokens = {
+            token.term: token for phrase in parsed.phrases for token in analyzer.analyze(phrase)
+        }
+        if phrase_tokens:
+            frequencies = {
+                term: await estimate_rows(session, select(Post.id).where(ts_match(token.surface)))
+                for term, token in phrase_tokens.items()
+            }
+            return [min(frequencies, key=frequencies.get)]
+
+        word_terms = list(dict.fromkeys(analyzer.terms(parsed.text)))
+        if word_terms:
+            return word_terms
+
+        if parsed.tags:
+            return [TAG_TERM_PREFIX + parsed.tags[0]]
+
+        if parsed.channels:
+            return [CHANNEL_TERM_PREFIX + channel for channel in parsed.channels]
+
+        raise ValueError("A saved search needs at least one word, phrase, tag or channel")
+
+    @staticmethod
+    async def create(session: AsyncSession, data: SavedSearchCreate) -> SavedSearch:
+        """
+        Create a saved search. It collects posts ingested from now on.
+
+        Raises:
+            ValueError: If the query cannot be parsed or anchored
+        """
+        terms = await SavedSearchService.anchor_terms(session, parse_query(data.query))
+        saved_search = SavedSearch(name=data.name, query=data.query)
+        session.add(saved_search)
+        await session.flush()
+        session.add_all(
+            SavedSearchTerm(term=term, saved_search_id=saved_search.id) for term in terms
+        )
+        await session.commit()
+        await session.refresh(saved_search)
+        return saved_search
+
+    @staticmethod
+    async def replace_tag_in_queries(
+        session: AsyncSession,
+        old_name: str,
+        new_name: Optional[str],
+    ) -> List[SavedSearch]:
+        """
+        Rewrite ``tag:old_name`` to ``new_name`` in every saved query and re-anchor it.
+
+        With ``new_name=None`` (a deleted tag) the clause is dropped, as
+        from feed filters; a query left without anything to anchor on is
+        kept unchanged (it matches again if the tag is recreated). Matches
+        collected so far are kept. Does not commit.
+
+        Returns:
+            Saved searches whose query changed
+        """
+        result = await session.execute(
+            select(SavedSearch).where(SavedSearch.query.ilike("%tag:%"))
+        )
+        changed = []
+        for saved_search in result.scalars().all():
+            try:
+                if old_name not in parse_query(saved_search.query).tags:
+                    continue
+                query = replace_tag_clause(saved_search.query, old_name, new_name)
+                terms = await SavedSearchService.anchor_terms(session, parse_query(query))
+            except ValueError:
+                continue
+
+            saved_search.query = query
+            await session.execute(
+                delete(SavedSearchTerm).where(SavedSearchTerm.saved_search_id == saved_search.id)
+            )
+            session.add_all(
+                SavedSearchTerm(term=term, saved_search_id=saved_search.id) for term in terms
+            )
+            changed.append(saved_search)
+
+        await session.flush()
+        return changed
+
+    @staticmethod
+    async def get_by_id(session: AsyncSession, saved_search_id: int) -> Optional[SavedSearch]:
+        """Get a saved search by ID."""
+        result = await session.execute(select(SavedSearch).where(SavedSearch.id == saved_search_id))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_all(session: AsyncSession) -> List[SavedSearch]:
+        """Get all saved searches."""
+        result = await session.execute(select(SavedSearch).order_by(SavedSearch.created_at.desc()))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def update(
+        session: AsyncSession,
+        saved_search_id: int,
+        data: SavedSearchUpdate,
+    ) -> Optional[SavedSearch]:
+        """
+        Update a saved search.
+
+        Changing the query re-anchors the search and drops the matches
+        collected for the previous query.
+
+        Raises:
+            ValueError: If the new query cannot be parsed or anchored
+        """
+        saved_search = await SavedSearchService.get_by_id(session, saved_search_id)
+        if not saved_search:
+            return None
+
+        if data.name is not None:
+            saved_search.name = data.name
+        if data.query is not None and data.query != saved_search.query:
+            terms = await SavedSearchService.anchor_terms(session, parse_query(data.query))
+            saved_search.query = data.query
+            await session.execute(
+                delete(SavedSearchTerm).where(SavedSearchTerm.saved_search_id == saved_search_id)
+            )
+            await session.execute(
+                delete(SavedSearchMatch).where(SavedSearchMatch.saved_search_id == saved_search_id)
+            )
+            session.add_all(
+                SavedSearchTerm(term=term, saved_search_id=saved_search_id) for term in terms
+            )
+
+        await session.commit()
+        await session.refresh(saved_search)
+        return saved_search
+
+    @staticmethod
+    async def delete(session: AsyncSession, saved_search_id: int) -> bool:
+        """Delete a saved search with its anchor terms and matches."""
+        saved_search = await SavedSearchService.get_by_id(session, saved_search_id)
+        if not saved_search:
+            return False
+
+        await session.delete(saved_search)
+        await session.commit()
+        return True
+
+    @staticmethod
+    async def get_matches(
+        session: AsyncSession,
+        saved_search_id: int,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> tuple[List[tuple[Post, SavedSearchMatch]], int]:
+        """Posts matched by a saved search, most recently matched first."""
+        count_result = await session.execute(
+            select(func.count())
+            .select_from(SavedSearchMatch)
+            .where(SavedSearchMatch.saved_search_id == saved_search_id)
+        )
+        total = count_result.scalar() or 0
+
+        result = await session.execute(
+            select(Post, SavedSearchMatch)
+            .join(SavedSearchMatch, SavedSearchMatch.post_id == Post.id)
+            .options(*PAGE_LOAD_OPTIONS)
+            .where(SavedSearchMatch.saved_search_id == saved_search_id)
+            .order_by(SavedSearchMatch.matched_at.desc(), SavedSearchMatch.post_id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return [(post, match) for post, match in result.all()], total
+
+    @staticmethod
+    async def percolate(session: AsyncSession, post: Post) -> List[int]:
+        """
+        Match a post (with its tags loaded) against the saved searches.
+
+        Runs at ingest and again whenever tags are added to the post, since
+        tagging happens after ingest. Candidates are the searches anchored on
+        one of the post's terms, tags or channel (one indexed lookup); each
+        candidate is then verified against the analyzed post. Matches found
+        earlier are kept with their original time. A search that fails to
+        evaluate is logged and skipped, so it cannot fail ingest or tagging.
+
+        Returns:
+            IDs of the matched saved searches
+        """
+        tokens = get_text_analyzer().analyze(post.content or "")
+        tag_names = {tag.name for tag in post.tags}
+        post_terms = {token.term for token in tokens}
+        post_terms.add(CHANNEL_TERM_PREFIX + post.channel_username)
+        post_terms.update(TAG_TERM_PREFIX + name for name in tag_names)
+
+        result = await session.execute(
+            select(SavedSearch)
+            .where(
+                SavedSearch.id.in_(
+                    select(SavedSearchTerm.saved_search_id)
+                    .where(SavedSearchTerm.term.in_(post_terms))
+                )
+            )
+        )
+        candidates = list(result.scalars().all())
+        if not candidates:
+            return []
+
+        positions = SavedSearchService._positions(tokens)
+        matched = []
+        for saved_search in candidates:
+            try:
+                parsed = parse_query(saved_search.query)
+            except ValueError:
+                logger.warning(f"Skipping saved search {saved_search.id} with invalid query")
+                continue
+            try:
+                if SavedSearchService._matches(parsed, post, positions, tag_names):
+                    matched.append(saved_search.id)
+            except Exception:
+                logger.exception(
+                    f"Failed to match saved search {saved_search.id} against post {post.id}"
+                )
+
+        if matched:
+            await session.execute(
+                pg_insert(SavedSearchMatch)
+                .values([
+                    {"saved_search_id": saved_search_id, "post_id": post.id}
+                    for saved_search_id in matched
+                ])
+                .on_conflict_do_nothing()
+            )
+            await session.commit()
+        return matched
+
+    @staticmethod
+    async def percolate_posts(session: AsyncSession, post_ids: Iterable[str]) -> Dict[str, List[int]]:
+        """
+        Match posts whose tags were just added against the saved searches.
+
+        Call after the tag writes are committed.
+
+        Returns:
+            Mapping of post ID to the IDs of the saved searches it matches
+        """
+        post_ids = list(set(post_ids))
+        if not post_ids:
+            return {}
+
+        result = await session.execute(
+            select(Post)
+            .options(selectinload(Post.tags))
+            .where(Post.id.in_(post_ids))
+            .execution_options(populate_existing=True)
+        )
+        return {
+            post.id: await SavedSearchService.percolate(session, post)
+            for post in result.scalars().all()
+        }
+
+    @staticmethod
+    def _positions(tokens: Sequence[Token]) -> Dict[str, Set[int]]:
+        """Positions of every term of an analyzed text."""
+        positions: Dict[str, Set[int]] = {}
+        for token in tokens:
+            positions.setdefault(token.term, set()).add(token.position)
+        return positions
+
+    @staticmethod
+    def _matches(
+        parsed: SearchQuery,
+        post: Post,
+        positions: Dict[str, Set[int]],
+        tag_names: Set[str],
+    ) -> bool:
+        """Whether a post satisfies every clause of a parsed query."""
+        if parsed.channels and post.channel_username not in parsed.channels:
+            return False
+        published_at = _naive_utc(post.published_at)
+        if parsed.after and published_at < _naive_utc(parsed.after):
+            return False
+        if parsed.before and published_at >= _naive_utc(parsed.before):
+            return False
+        if not tag_names.issuperset(parsed.tags):
+            return False
+
+        analyzer = get_text_analyzer()
+        words = analyzer.terms(parsed.text)
+        if words and not any(term in positions for term in words):
+            return False
+        for phrase in parsed.phrases:
+            phrase_tokens = analyzer.analyze(phrase)
+            if not phrase_tokens:
+                return False
+            first = phrase_tokens[0].position
+            starts = set(positions.get(phrase_tokens[0].term, ()))
+            for token in phrase_tokens[1:]:
+                offset = token.position - first
+                starts &= {position - offset for position in positions.get(token.term, ())}
+            if not starts:
+                return False
+        return True
@@ -0,0 +1,164 @@
+"""Bounded cache of search result pages."""
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from app.core.config import get_settings
+from app.services.query_parser import parse_query
+
+
+class CachedResult(NamedTuple):
+    """A cached page of search results."""
+
+    post_ids: List[str]
+    total: int
+    terms: Tuple[str, ...]  # Index terms of the query, for invalidation
+    expires_at: float
+
+
+class SearchCache:
+    """
+    LRU cache of search result pages with a TTL and term-based invalidation.
+
+    Only post IDs and the total are stored, so a hit costs a single primary
+    key lookup instead of the full query and its ``count(*)``. Every entry
+    remembers the index terms of its query; a reverse map from term to keys
+    lets ingest drop exactly the pages a new or edited post could appear in.
+    The TTL bounds staleness where that is not possible (database-side
+    backends, other workers).
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 30.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, CachedResult]" = OrderedDict()
+        self._keys_by_term: Dict[str, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def make_key(backend: str, query: str, skip: int, limit: int, **filters) -> Hashable:
+        """
+        Cache key for a normalized query, its filters and the page.
+
+        The query is keyed in parsed form. Only its words and phrases are
+        case-folded, as every backend matches them case-insensitively;
+        ``tag:`` and ``channel:`` values are compared as written.
+
+        Raises:
+            ValueError: If the query has an invalid date clause
+        """
+        parsed = parse_query(query)
+        normalized = parsed._replace(
+            text=" ".join(parsed.text.casefold().split()),
+            phrases=tuple(" ".join(phrase.casefold().split()) for phrase in parsed.phrases),
+        )
+        return (backend, normalized, tuple(sorted(filters.items())), skip, limit)
+
+    def get(self, key: Hashable) -> Optional[CachedResult]:
+        """Return a live entry and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._discard(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, post_ids: List[str], total: int, terms: Iterable[str] = ()) -> None:
+        """Store a result page, evicting the least recently used entries."""
+        if not self.enabled:
+            return
+
+        self._discard(key)
+        entry = CachedResult(
+            post_ids=list(post_ids),
+            total=total,
+            terms=tuple(dict.fromkeys(terms)),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._entries[key] = entry
+        for term in entry.terms:
+            self._keys_by_term.setdefault(term, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def invalidate_terms(self, terms: Iterable[str]) -> int:
+        """
+        Drop every entry whose query shares a term with ``terms``.
+
+        Returns:
+            Number of entries dropped
+        """
+        keys = set()
+        for term in terms:
+            keys.update(self._keys_by_term.get(term, ()))
+        for key in keys:
+            self._discard(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> int:
+        """Drop every entry."""
+        count = len(self._entries)
+        self._entries.clear()
+        self._keys_by_term.clear()
+        self.invalidations += count
+        return count
+
+    def _discard(self, key: Hashable) -> None:
+        """Remove an entry and its reverse-map references."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for term in entry.terms:
+            keys = self._keys_by_term.get(term)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_term[term]
+
+    def stats(self) -> dict:
+        """Cache size and hit-rate metrics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+@lru_cache()
+def get_search_cache() -> SearchCache:
+    """Get the process-wide search result cache."""
+    settings = get_settings()
+    return SearchCache(
+        max_size=settings.search_cache_size,
+        ttl_seconds=settings.search_cache_ttl_seconds,
+    )
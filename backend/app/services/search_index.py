@@ -0,0 +1,591 @@
+"""In-memory inverted index with BM25 ranking."""
+import heapq
+import math
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.services.bitmaps import RoaringBitmap
+from app.services.search_snapshot import IndexSnapshot, Spans, write_snapshot
+from app.services.text_analyzer import ANALYZER_VERSION, TextAnalyzer, get_text_analyzer
+
+
+class LivePostings(Mapping):
+    """
+    Postings of a term over both segments, without copying either.
+
+    Base postings of masked documents are skipped on lookup and iteration.
+    The length is the document frequency including masked base documents,
+    which keeps it O(1); masked documents are few between snapshots.
+    """
+
+    __slots__ = ("_base", "_delta", "_deleted", "_base_size")
+
+    def __init__(
+        self,
+        base: Dict[int, List[int]],
+        delta: Dict[int, List[int]],
+        deleted: RoaringBitmap,
+        base_size: int,
+    ):
+        self._base = base
+        self._delta = delta
+        self._deleted = deleted
+        self._base_size = base_size
+
+    def get(self, ordinal: int, default=None):
+        if ordinal >= self._base_size:
+            return self._delta.get(ordinal, default)
+        if ordinal in self._deleted:
+            return default
+        return self._base.get(ordinal, default)
+
+    def __getitem__(self, ordinal: int) -> List[int]:
+        positions = self.get(ordinal)
+        if positions is None:
+            raise KeyError(ordinal)
+        return positions
+
+    def __contains__(self, ordinal) -> bool:
+        return self.get(ordinal) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        deleted = self._deleted
+        if deleted:
+            yield from (ordinal for ordinal in self._base if ordinal not in deleted)
+        else:
+            yield from self._base
+        yield from self._delta
+
+    def __len__(self) -> int:
+        return len(self._base) + len(self._delta)
+
+
+class SearchIndex:
+    """
+    Inverted index over post content, updated incrementally.
+
+    Each post gets a dense ordinal; postings map ``term -> {ordinal: positions}``.
+    Adding an already indexed post replaces its previous postings, so edits
+    never require a rebuild. The character offsets of every indexed token are
+    kept per document so that hits can be highlighted without re-analyzing
+    the text.
+
+    The index may sit on top of a read-only snapshot (the base segment,
+    ordinals ``0..base_size - 1``). Posts added afterwards go to the
+    in-memory delta segment with ordinals from ``base_size`` on; a base post
+    that is edited or removed is masked out of the base and, if edited,
+    re-added to the delta.
+    """
+
+    def __init__(
+        self,
+        analyzer: Optional[TextAnalyzer] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        snapshot: Optional[IndexSnapshot] = None,
+    ):
+        self.analyzer = analyzer or get_text_analyzer()
+        self.k1 = k1
+        self.b = b
+        self._base: Optional[IndexSnapshot] = None
+        self.reset(snapshot)
+
+    def reset(self, snapshot: Optional[IndexSnapshot] = None) -> None:
+        """Drop every document, optionally starting over from ``snapshot``."""
+        if self._base is not None and self._base is not snapshot:
+            self._base.close()
+
+        self._base = snapshot
+        self._base_size = snapshot.num_docs if snapshot else 0
+        self._base_deleted = RoaringBitmap()
+        self._base_deleted_length = 0
+        self.watermark: Optional[datetime] = snapshot.watermark if snapshot else None
+
+        # Delta segment, indexed by ``ordinal - base_size``
+        self._postings: Dict[str, Dict[int, List[int]]] = {}
+        self._doc_ids: List[Optional[str]] = []
+        self._doc_lengths: List[int] = []
+        self._doc_terms: List[Tuple[str, ...]] = []
+        self._doc_spans: List[Optional[Spans]] = []
+        self._ordinals: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return self._base_size - len(self._base_deleted) + len(self._ordinals)
+
+    def __contains__(self, post_id: str) -> bool:
+        return post_id in self._ordinals or self._base_ordinal(post_id) is not None
+
+    @property
+    def snapshot(self) -> Optional[IndexSnapshot]:
+        return self._base
+
+    def _base_ordinal(self, post_id: str) -> Optional[int]:
+        """Ordinal of a live post of the base segment."""
+        if self._base is None:
+            return None
+        ordinal = self._base.ordinal(post_id)
+        if ordinal is None or ordinal in self._base_deleted:
+            return None
+        return ordinal
+
+    def _ordinal(self, post_id: str) -> Optional[int]:
+        ordinal = self._ordinals.get(post_id)
+        return ordinal if ordinal is not None else self._base_ordinal(post_id)
+
+    def _doc_id(self, ordinal: int) -> Optional[str]:
+        if ordinal < self._base_size:
+            return self._base.doc_id(ordinal)
+        return self._doc_ids[ordinal - self._base_size]
+
+    def _doc_length(self, ordinal: int) -> int:
+        if ordinal < self._base_size:
+            return self._base.doc_length(ordinal)
+        return self._doc_lengths[ordinal - self._base_size]
+
+    def _spans(self, ordinal: int) -> Spans:
+        if ordinal < self._base_size:
+            return self._base.doc_spans(ordinal)
+        return self._doc_spans[ordinal - self._base_size]
+
+    @property
+    def total_length(self) -> int:
+        base_length = self._base.total_length - self._base_deleted_length if self._base else 0
+        return base_length + self._total_length
+
+    def add(self, post_id: str, text: str, updated_at: Optional[datetime] = None) -> None:
+        """Index a post, replacing any previous version of it."""
+        self._remove_from_base(post_id)
+        ordinal = self._ordinals.get(post_id)
+        if ordinal is None:
+            ordinal = self._base_size + len(self._doc_ids)
+            self._ordinals[post_id] = ordinal
+            self._doc_ids.append(post_id)
+            self._doc_lengths.append(0)
+            self._doc_terms.append(())
+            self._doc_spans.append(None)
+        else:
+            self._unindex(ordinal)
+
+        positions: Dict[str, List[int]] = {}
+        tokens = self.analyzer.analyze(text)
+        for token in tokens:
+            positions.setdefault(token.term, []).append(token.position)
+
+        for term, term_positions in positions.items():
+            self._postings.setdefault(term, {})[ordinal] = term_positions
+
+        local = ordinal - self._base_size
+        self._doc_lengths[local] = len(tokens)
+        self._doc_terms[local] = tuple(positions)
+        self._doc_spans[local] = (
+            array("I", (token.position for token in tokens)),
+            array("I", (token.start for token in tokens)),
+            array("I", (token.end for token in tokens)),
+        )
+        self._total_length += len(tokens)
+        if updated_at is not None and (self.watermark is None or updated_at > self.watermark):
+            self.watermark = updated_at
+
+    def terms_of(self, post_id: str) -> Tuple[str, ...]:
+        """Distinct index terms of an indexed post."""
+        ordinal = self._ordinals.get(post_id)
+        if ordinal is not None:
+            return self._doc_terms[ordinal - self._base_size]
+        ordinal = self._base_ordinal(post_id)
+        return self._base.doc_terms(ordinal) if ordinal is not None else ()
+
+    def remove(self, post_id: str) -> bool:
+        """Remove a post from the index."""
+        if self._remove_from_base(post_id):
+            return True
+
+        ordinal = self._ordinals.pop(post_id, None)
+        if ordinal is None:
+            return False
+
+        self._unindex(ordinal)
+        self._doc_ids[ordinal - self._base_size] = None
+        return True
+
+    def _remove_from_base(self, post_id: str) -> bool:
+        """Mask a post out of the base segment."""
+        ordinal = self._base_ordinal(post_id)
+        if ordinal is None:
+            return False
+        self._base_deleted.add(ordinal)
+        self._base_deleted_length += self._base.doc_length(ordinal)
+        return True
+
+    def _unindex(self, ordinal: int) -> None:
+        """Drop the postings of a delta document, keeping its ordinal."""
+        local = ordinal - self._base_size
+        for term in self._doc_terms[local]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(ordinal, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths[local]
+        self._doc_lengths[local] = 0
+        self._doc_terms[local] = ()
+        self._doc_spans[local] = None
+
+    def postings(self, term: str) -> Mapping:
+        """
+        Live ``{ordinal: positions}`` of a term across both segments. Do not mutate.
+
+        Without masked base documents and delta postings for the term, this is
+        the base dict itself; otherwise a ``LivePostings`` view over both.
+        """
+        delta = self._postings.get(term)
+        if self._base is None:
+            return delta or {}
+
+        base = self._base.postings(term)
+        if not base:
+            return delta or {}
+        if not self._base_deleted and not delta:
+            return base
+        return LivePostings(base, delta or {}, self._base_deleted, self._base_size)
+
+    def _idf(self, doc_freq: int) -> float:
+        """BM25 inverse document frequency for a document frequency."""
+        n = len(self)
+        return math.log(1 + (n - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def _query_postings(self, query: str) -> Dict[str, Mapping]:
+        """Postings of the distinct query terms present in the index."""
+        query_postings = {}
+        for term in dict.fromkeys(self.analyzer.terms(query)):
+            postings = self.postings(term)
+            if postings:
+                query_postings[term] = postings
+        return query_postings
+
+    def phrase_ordinals(self, phrase: str, candidates: Optional[set] = None) -> set:
+        """
+        Ordinals of documents containing the words of ``phrase`` in order.
+
+        Candidates come from the shortest posting list, or from ``candidates``
+        if that is shorter; the other words are then checked against the
+        stored positions, at the same relative offsets as in the phrase (stop
+        words keep their positions, so "state of the art" does not match
+        "state art").
+        """
+        tokens = self.analyzer.analyze(phrase)
+        if not tokens:
+            return set()
+        lists = []
+        for token in tokens:
+            postings = self.postings(token.term)
+            if not postings:
+                return set()
+            lists.append((token.position - tokens[0].position, postings))
+        lists.sort(key=lambda item: len(item[1]))
+
+        (anchor_offset, anchor), rest = lists[0], lists[1:]
+        if candidates is None:
+            ordinals: Iterable[int] = anchor
+        elif len(candidates) < len(anchor):
+            ordinals = [ordinal for ordinal in candidates if ordinal in anchor]
+        else:
+            ordinals = [ordinal for ordinal in anchor if ordinal in candidates]
+
+        matched = set()
+        for ordinal in ordinals:
+            if not all(ordinal in postings for _, postings in rest):
+                continue
+            starts = {position - anchor_offset for position in anchor[ordinal]}
+            for offset, postings in rest:
+                starts.intersection_update(position - offset for position in postings[ordinal])
+                if not starts:
+                    break
+            if starts:
+                matched.add(ordinal)
+        return matched
+
+    def estimate(self, query: str, phrases: Sequence[str] = ()) -> int:
+        """
+        Upper bound of the number of posts matching ``query`` and ``phrases``.
+
+        Only document frequencies are read, so this is cheap enough to plan
+        with: a phrase matches at most as many posts as its rarest word.
+        """
+        bound = len(self)
+        if query:
+            bound = min(bound, sum(len(postings) for postings in self._query_postings(query).values()))
+        for phrase in phrases:
+            terms = self.analyzer.terms(phrase)
+            bound = min([bound, *(len(self.postings(term)) for term in terms)])
+        return bound
+
+    def _word_postings(self, query: str) -> Optional[Dict[str, Mapping]]:
+        """Postings of the query words, or None if the query has no words to match."""
+        return self._query_postings(query) if self.analyzer.terms(query) else None
+
+    def _restrict(
+        self,
+        query_postings: Optional[Dict[str, Mapping]],
+        phrases: Sequence[str],
+        post_ids: Optional[Iterable[str]],
+    ) -> set:
+        """
+        Ordinals matching the query words, every phrase and, if given, ``post_ids``.
+
+        The smallest set is built first and every further clause only filters
+        it, so the cost follows the most selective clause.
+        """
+        if post_ids is not None:
+            matched = {ordinal for ordinal in map(self._ordinal, post_ids) if ordinal is not None}
+        else:
+            matched = None
+
+        # Rarest phrases first: each one can only shrink the candidate set
+        for phrase in sorted(phrases, key=lambda phrase: self.estimate("", [phrase])):
+            if matched is not None and not matched:
+                break
+            matched = self.phrase_ordinals(phrase, matched)
+
+        if query_postings is not None:
+            if matched is None:
+                matched = self._match_ordinals(query_postings.values())
+            else:
+                matched = {
+                    ordinal
+                    for ordinal in matched
+                    if any(ordinal in postings for postings in query_postings.values())
+                }
+        return matched or set()
+
+    def match_ids(self, query: str, phrases: Sequence[str] = ()) -> List[str]:
+        """IDs of all posts containing at least one query word and every phrase."""
+        ordinals = self._restrict(self._word_postings(query), phrases, None)
+        return [self._doc_id(ordinal) for ordinal in ordinals]
+
+    def highlights(self, post_id: str, query: str) -> Tuple[List[Tuple[int, int, str]], Dict[str, float]]:
+        """
+        Locate the query terms in an indexed post.
+
+        Returns:
+            Tuple of (``[(start, end, term), ...]`` sorted by offset, idf per term)
+        """
+        ordinal = self._ordinal(post_id)
+        if ordinal is None:
+            return [], {}
+
+        doc_positions, starts, ends = self._spans(ordinal)
+        hits = []
+        weights = {}
+        for term, postings in self._query_postings(query).items():
+            term_positions = postings.get(ordinal)
+            if not term_positions:
+                continue
+            weights[term] = self._idf(len(postings))
+            for position in term_positions:
+                i = bisect_left(doc_positions, position)
+                hits.append((starts[i], ends[i], term))
+        hits.sort()
+        return hits, weights
+
+    def _match_ordinals(self, postings: Iterable[Mapping]) -> set:
+        """Ordinals of documents present in at least one of the posting lists."""
+        return set().union(*postings)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        phrases: Sequence[str] = (),
+        post_ids: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Tuple[str, float]], int]:
+        """
+        Rank posts against ``query`` with BM25.
+
+        Top-k retrieval uses MaxScore-style early termination: query terms are
+        visited from the highest to the lowest score upper bound, and once the
+        summed bound of the remaining terms cannot beat the current k-th best
+        score, documents that only contain those terms are never scored.
+
+        With ``phrases`` (all required) or ``post_ids`` (an allow-list, e.g.
+        the result of database filters), the matching set is built first and
+        only its documents are scored; phrase words count towards the score.
+
+        The total is exact when every query term was visited (or the matching
+        set was built). After early termination it is an upper bound: the
+        documents scored plus the posting list lengths of the skipped terms,
+        which costs nothing extra but may count a document twice.
+
+        Returns:
+            Tuple of (``[(post_id, score), ...]`` for the requested page, total matches)
+        """
+        query_postings = self._query_postings(" ".join((query, *phrases)))
+        if not query_postings:
+            return [], 0
+
+        k = offset + limit
+        avg_length = self.total_length / max(len(self), 1)
+        idf = {term: self._idf(len(postings)) for term, postings in query_postings.items()}
+
+        if phrases or post_ids is not None:
+            matched = self._restrict(self._word_postings(query), phrases, post_ids)
+            postings = list(query_postings.values())
+            weights = [idf[term] for term in query_postings]
+            top = heapq.nlargest(
+                k,
+                ((self._score(ordinal, postings, weights, avg_length), ordinal) for ordinal in matched),
+            )
+            return [(self._doc_id(ordinal), score) for score, ordinal in top[offset:]], len(matched)
+
+        # Visit terms by decreasing upper bound (idf * (k1 + 1))
+        terms = sorted(query_postings, key=lambda term: idf[term], reverse=True)
+        remaining_bound = [0.0] * (len(terms) + 1)
+        for i in range(len(terms) - 1, -1, -1):
+            remaining_bound[i] = remaining_bound[i + 1] + idf[terms[i]] * (self.k1 + 1)
+
+        postings = [query_postings[term] for term in terms]
+        weights = [idf[term] for term in terms]
+        heap: List[Tuple[float, int]] = []
+        scored = set()
+        skipped = 0
+
+        for i, term_postings in enumerate(postings):
+            if len(heap) >= k and remaining_bound[i] <= heap[0][0]:
+                skipped = sum(len(rest) for rest in postings[i:])
+                break
+            for ordinal in term_postings:
+                if ordinal in scored:
+                    continue
+                scored.add(ordinal)
+                score = self._score(ordinal, postings, weights, avg_length)
+                if len(heap) < k:
+                    heapq.heappush(heap, (score, ordinal))
+                elif (score, ordinal) > heap[0]:
+                    heapq.heapreplace(heap, (score, ordinal))
+
+        total = min(len(self), len(scored) + skipped)
+        ranked = sorted(heap, reverse=True)[offset:]
+        return [(self._doc_id(ordinal), score) for score, ordinal in ranked], total
+
+    def _score(
+        self,
+        ordinal: int,
+        postings: List[Mapping],
+        weights: List[float],
+        avg_length: float,
+    ) -> float:
+        """BM25 score of one document for the query terms."""
+        norm = self.k1 * (1 - self.b + self.b * self._doc_length(ordinal) / avg_length)
+        score = 0.0
+        for term_postings, weight in zip(postings, weights):
+            positions = term_postings.get(ordinal)
+            if positions:
+                tf = len(positions)
+                score += weight * tf * (self.k1 + 1) / (tf + norm)
+        return score
+
+    def save(self, path: Path) -> int:
+        """
+        Write the live documents of both segments to a snapshot at ``path``.
+
+        Ordinals are renumbered densely, so masked base documents are dropped.
+
+        Returns:
+            Number of documents written
+        """
+        live = [
+            ordinal for ordinal in range(self._base_size) if ordinal not in self._base_deleted
+        ] + sorted(self._ordinals.values())
+        renumbered = {ordinal: new for new, ordinal in enumerate(live)}
+
+        terms = set(self._postings)
+        if self._base is not None:
+            terms.update(self._base.iter_terms())
+        postings = {}
+        for term in terms:
+            term_postings = {
+                renumbered[ordinal]: positions
+                for ordinal, positions in self.postings(term).items()
+            }
+            if term_postings:
+                postings[term] = term_postings
+
+        write_snapshot(
+            path,
+            doc_ids=[self._doc_id(ordinal) for ordinal in live],
+            doc_lengths=[self._doc_length(ordinal) for ordinal in live],
+            doc_spans=[self._spans(ordinal) for ordinal in live],
+            postings=postings,
+            analyzer_version=ANALYZER_VERSION,
+            watermark=self.watermark,
+        )
+        return len(live)
+
+
+class IndexShard(NamedTuple):
+    """
+    Partial index over a contiguous range of posts, built offline.
+
+    Ordinals are local to the shard (``0..len(doc_ids) - 1``).
+    """
+
+    doc_ids: List[str]
+    doc_lengths: List[int]
+    doc_spans: List[Spans]
+    postings: Dict[str, Dict[int, List[int]]]
+
+    @property
+    def total_length(self) -> int:
+        return sum(self.doc_lengths)
+
+
+def build_shard(docs: List[Tuple[str, str]]) -> IndexShard:
+    """
+    Index ``(post_id, text)`` pairs into a shard.
+
+    Runs in worker processes during parallel rebuilds, so it only relies on
+    the process-wide analyzer.
+    """
+    analyzer = get_text_analyzer()
+    shard = IndexShard([], [], [], {})
+    for ordinal, (post_id, text) in enumerate(docs):
+        tokens = analyzer.analyze(text or "")
+        for token in tokens:
+            shard.postings.setdefault(token.term, {}).setdefault(ordinal, []).append(token.position)
+        shard.doc_ids.append(post_id)
+        shard.doc_lengths.append(len(tokens))
+        shard.doc_spans.append(
+            (
+                array("I", (token.position for token in tokens)),
+                array("I", (token.start for token in tokens)),
+                array("I", (token.end for token in tokens)),
+            )
+        )
+    return shard
+
+
+def merge_shard(target: IndexShard, shard: IndexShard) -> None:
+    """Append ``shard`` to ``target``, shifting its ordinals past ``target``'s documents."""
+    offset = len(target.doc_ids)
+    target.doc_ids.extend(shard.doc_ids)
+    target.doc_lengths.extend(shard.doc_lengths)
+    target.doc_spans.extend(shard.doc_spans)
+    for term, postings in shard.postings.items():
+        merged = target.postings.get(term)
+        if merged is None:
+            target.postings[term] = {ordinal + offset: positions for ordinal, positions in postings.items()}
+        else:
+            for ordinal, positions in postings.items():
+                merged[ordinal + offset] = positions
+
+
+@lru_cache()
+def get_search_index() -> SearchIndex:
+    """Get the process-wide search index."""
+    return SearchIndex()
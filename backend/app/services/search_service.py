@@ -0,0 +1,446 @@
+"""Search service dispatching to the configured search backend."""
+from datetime import datetime
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import BASE_DIR, get_settings
+from app.core.logging import get_logger
+from app.models.post import Post
+from app.models.tag import Tag
+from app.models.tag_count import TagCount
+from app.services.counts import estimate_rows
+from app.services.fulltext import trigram_rank, ts_rank
+from app.services.post_hydrator import PAGE_LOAD_OPTIONS
+from app.services.post_service import PostService
+from app.services.query_parser import SearchQuery, parse_query
+from app.services.search_cache import get_search_cache
+from app.services.search_index import get_search_index
+from app.services.search_snapshot import IndexSnapshot
+from app.services.snippets import hits_from_tokens, make_snippet
+from app.services.suggest_index import get_suggest_index
+from app.services.suggest_service import SuggestService
+from app.services.text_analyzer import ANALYZER_VERSION, get_text_analyzer
+
+logger = get_logger(__name__)
+
+class PlanStep(NamedTuple):
+    """A clause of a search query plan."""
+
+    clause: str
+    source: str  # "index" (in-memory search index) or "database"
+    estimate: Optional[int]  # Upper bound of matching posts, if known
+
+
+class SearchService:
+    """Service for ranked post search."""
+
+    @staticmethod
+    async def load_index(session: AsyncSession) -> int:
+        """
+        Bring up the in-memory search index at worker startup.
+
+        If a snapshot is configured and was written by the current analyzer,
+        it is mapped as the index base and only posts written since its
+        watermark are replayed. Otherwise the index is built from the
+        database and, if configured, saved as the new snapshot.
+
+        Returns:
+            Number of posts indexed from the database
+        """
+        index = get_search_index()
+        path = SearchService.snapshot_path()
+        snapshot = SearchService._open_snapshot(path) if path else None
+        if snapshot is None:
+            count = await SearchService.build_index(session)
+            if path:
+                SearchService.save_snapshot()
+            return count
+
+        index.reset(snapshot)
+        count = await SearchService.build_index(session, since=snapshot.watermark)
+        logger.info(f"Loaded search index snapshot with {snapshot.num_docs} posts from {path}")
+        return count
+
+    @staticmethod
+    async def build_index(
+        session: AsyncSession,
+        batch_size: int = 1000,
+        since: Optional[datetime] = None,
+    ) -> int:
+        """
+        Load posts into the in-memory search index.
+
+        Posts are streamed from the database in batches instead of being
+        loaded all at once. With ``since``, only posts written after it are
+        (re-)indexed.
+
+        Returns:
+            Number of indexed posts
+        """
+        index = get_search_index()
+        query = select(Post.id, Post.content, Post.updated_at)
+        if since is not None:
+            query = query.where(Post.updated_at > since)
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        count = 0
+        async for post_id, content, updated_at in result:
+            index.add(post_id, content or "", updated_at=updated_at)
+            count += 1
+
+        logger.info(f"Indexed {count} posts into the search index")
+        return count
+
+    @staticmethod
+    def snapshot_path() -> Optional[Path]:
+        """Configured snapshot location, if any."""
+        path = get_settings().search_snapshot_path
+        return BASE_DIR / path if path else None
+
+    @staticmethod
+    def _open_snapshot(path: Path) -> Optional[IndexSnapshot]:
+        """Map a snapshot if it exists and matches the current analyzer."""
+        if not path.exists():
+            return None
+        try:
+            snapshot = IndexSnapshot(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search index snapshot {path}: {e}")
+            return None
+        if snapshot.analyzer_version != ANALYZER_VERSION:
+            logger.info(
+                f"Ignoring search index snapshot {path} built by analyzer "
+                f"{snapshot.analyzer_version!r} (current: {ANALYZER_VERSION!r})"
+            )
+            snapshot.close()
+            return None
+        return snapshot
+
+    @staticmethod
+    def save_snapshot() -> int:
+        """
+        Write the current index to the configured snapshot and map it back.
+
+        This also compacts the index: the in-memory delta and the masked base
+        documents are folded into the new base. If this worker has loaded
+        its suggestion index, the word vocabulary is saved alongside.
+
+        Returns:
+            Number of posts in the snapshot
+        """
+        path = SearchService.snapshot_path()
+        if path is None:
+            raise ValueError("SEARCH_SNAPSHOT_PATH is not configured")
+
+        index = get_search_index()
+        count = index.save(path)
+        suggest_index = get_suggest_index()
+        if suggest_index.loaded:
+            SuggestService.save_words(
+                SuggestService.words_path(), suggest_index.word_counts(), index.watermark
+            )
+        index.reset(IndexSnapshot(path))
+        logger.info(f"Wrote search index snapshot with {count} posts to {path}")
+        return count
+
+    @staticmethod
+    async def search(
+        session: AsyncSession,
+        query: str,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> tuple[List[Post], int]:
+        """
+        Search posts, ranked by relevance where the backend supports it.
+
+        ``query`` may carry structured clauses (see ``parse_query``). Channel,
+        tag and date clauses run as indexed database filters, phrases are
+        verified against the term positions of the search index (or the
+        ``tsvector`` with the postgres backend).
+
+        Result pages are served from the search cache when possible; only the
+        posts of the page are then loaded from the database.
+        """
+        settings = get_settings()
+        cache = get_search_cache()
+        if not cache.enabled:
+            return await SearchService._search_uncached(session, query, skip, limit)
+
+        key = cache.make_key(settings.search_backend, query, skip, limit)
+        cached = cache.get(key)
+        if cached is not None:
+            return await SearchService._load_ranked(session, cached.post_ids), cached.total
+
+        posts, total = await SearchService._search_uncached(session, query, skip, limit)
+        # Term invalidation mirrors the in-memory index; other backends rely on the TTL
+        if settings.search_backend == "memory":
+            terms = get_text_analyzer().terms(parse_query(query).match_text)
+        else:
+            terms = ()
+        cache.put(key, [post.id for post in posts], total, terms)
+        return posts, total
+
+    @staticmethod
+    def snippets(posts: List[Post], query: str, max_chars: int) -> dict[str, str]:
+        """
+        Highlighted snippet of each post for the words and phrases of ``query``.
+
+        With the memory backend, matches come from the token offsets stored in
+        the index; other backends analyze the post text here.
+        """
+        index = get_search_index()
+        analyzer = get_text_analyzer()
+        use_index = get_settings().search_backend == "memory"
+        query = parse_query(query).match_text
+        query_terms = analyzer.terms(query)
+
+        snippets = {}
+        for post in posts:
+            content = post.content or ""
+            if use_index and post.id in index:
+                hits, weights = index.highlights(post.id, query)
+            else:
+                hits, weights = hits_from_tokens(analyzer.analyze(content), query_terms), {}
+            snippets[post.id] = make_snippet(content, hits, weights, max_chars)
+        return snippets
+
+    @staticmethod
+    async def _search_uncached(
+        session: AsyncSession,
+        query: str,
+        skip: int,
+        limit: int,
+    ) -> tuple[List[Post], int]:
+        """Run a search against the configured backend."""
+        settings = get_settings()
+        parsed = parse_query(query)
+        if not parsed.has_text or settings.search_backend not in ("memory", "postgres", "trigram"):
+            # Nothing to rank by: filter in the database, newest first
+            posts, total, _ = await PostService.get_all(
+                session=session,
+                skip=skip,
+                limit=limit,
+                search_query=query,
+            )
+            return posts, total
+        if settings.search_backend == "postgres":
+            return await SearchService._search_postgres(session, parsed, skip, limit)
+        if settings.search_backend == "trigram":
+            return await SearchService._search_trigram(session, parsed, skip, limit)
+
+        if parsed.has_filters:
+            return await SearchService._search_filtered(session, parsed, skip, limit)
+        hits, total = get_search_index().search(
+            parsed.text,
+            limit=limit,
+            offset=skip,
+            phrases=parsed.phrases,
+        )
+        posts = await SearchService._load_ranked(session, [post_id for post_id, _ in hits])
+        return posts, total
+
+    @staticmethod
+    async def plan(session: AsyncSession, parsed: SearchQuery) -> List[PlanStep]:
+        """
+        Order the clauses of a query by their estimated number of matches.
+
+        Words and phrases are estimated from the document frequencies of the
+        search index, tags from their ``tag_counts`` counters and channels
+        from the planner's row estimate (one ``EXPLAIN``, nothing is
+        executed). Date ranges have no estimate and go last.
+        """
+        index = get_search_index()
+        steps = []
+        if parsed.text:
+            steps.append(PlanStep(parsed.text, "index", index.estimate(parsed.text)))
+        for phrase in parsed.phrases:
+            steps.append(PlanStep(f'"{phrase}"', "index", index.estimate("", [phrase])))
+        if parsed.channels:
+            steps.append(PlanStep(
+                " ".join(f"channel:{channel}" for channel in parsed.channels),
+                "database",
+                await estimate_rows(
+                    session, select(Post.id).where(Post.channel_username.in_(parsed.channels))
+                ),
+            ))
+        if parsed.tags:
+            result = await session.execute(
+                select(Tag.name, TagCount.post_count)
+                .join(TagCount, TagCount.tag_id == Tag.id)
+                .where(Tag.name.in_(parsed.tags))
+            )
+            tag_counts = dict(result.all())
+            for tag_name in parsed.tags:
+                steps.append(PlanStep(f"tag:{tag_name}", "database", tag_counts.get(tag_name, 0)))
+        if parsed.after or parsed.before:
+            steps.append(PlanStep("published_at", "database", None))
+        return sorted(steps, key=lambda step: (step.estimate is None, step.estimate or 0))
+
+    @staticmethod
+    async def _search_filtered(
+        session: AsyncSession,
+        parsed: SearchQuery,
+        skip: int,
+        limit: int,
+    ) -> tuple[List[Post], int]:
+        """
+        Rank posts with the search index, restricted by the channel, tag and date clauses.
+
+        If a database clause is the most selective and matches at most
+        ``search_max_filter_ids`` posts, the filters run first and the index
+        only ranks the posts they return. Otherwise the index ranks first and
+        the filters are checked for growing windows of the ranking until the
+        page is full, so neither side hands its whole match set to the other.
+        If the filters reject nearly the whole ranking and match more than
+        ``search_max_filter_ids`` posts themselves, postgres ranks with the
+        ``search_vector``. Content is never scanned in any case.
+        """
+        cap = get_settings().search_max_filter_ids
+        plan = await SearchService.plan(session, parsed)
+        logger.debug(f"Search plan for {parsed}: {plan}")
+
+        if plan[0].source == "database":
+            post_ids = await SearchService._filter_ids(session, parsed, cap + 1)
+            if len(post_ids) <= cap:
+                return await SearchService._rank_within(session, parsed, post_ids, skip, limit)
+
+        index = get_search_index()
+        needed = skip + limit
+        window = min(max(needed * 4, 100), cap)
+        passed: List[str] = []
+        checked = 0
+        while True:
+            hits, index_total = index.search(parsed.text, limit=window, phrases=parsed.phrases)
+            window_ids = [post_id for post_id, _ in hits[checked:]]
+            if window_ids:
+                result = await session.execute(
+                    select(Post.id).where(
+                        *PostService.filter_conditions(parsed),
+                        PostService.id_in(window_ids),
+                    )
+                )
+                allowed = set(result.scalars().all())
+                passed.extend(post_id for post_id in window_ids if post_id in allowed)
+            checked = len(hits)
+            exhausted = checked < window or checked >= index_total
+            if exhausted or len(passed) > needed or window >= cap:
+                break
+            window = min(window * 4, cap)
+
+        if exhausted:
+            total = len(passed)
+        elif len(passed) > needed:
+            # Extrapolate the pass rate of the checked prefix to the whole ranking
+            total = max(len(passed), round(index_total * len(passed) / checked))
+        else:
+            # The filters reject nearly all top matches: let them run first
+            # after all, or leave ranking to postgres if they match too many
+            post_ids = await SearchService._filter_ids(session, parsed, cap + 1)
+            if len(post_ids) > cap:
+                return await SearchService._search_postgres(session, parsed, skip, limit)
+            return await SearchService._rank_within(session, parsed, post_ids, skip, limit)
+
+        posts = await SearchService._load_ranked(session, passed[skip:needed])
+        return posts, total
+
+    @staticmethod
+    async def _filter_ids(
+        session: AsyncSession,
+        parsed: SearchQuery,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """IDs of up to ``limit`` posts passing the channel, tag and date clauses of a query."""
+        query = select(Post.id).where(*PostService.filter_conditions(parsed))
+        if limit is not None:
+            query = query.limit(limit)
+        result = await session.execute(query)
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def _rank_within(
+        session: AsyncSession,
+        parsed: SearchQuery,
+        post_ids: List[str],
+        skip: int,
+        limit: int,
+    ) -> tuple[List[Post], int]:
+        """Rank a page of ``post_ids`` with the search index."""
+        hits, total = get_search_index().search(
+            parsed.text,
+            limit=limit,
+            offset=skip,
+            phrases=parsed.phrases,
+            post_ids=post_ids,
+        )
+        posts = await SearchService._load_ranked(session, [post_id for post_id, _ in hits])
+        return posts, total
+
+    @staticmethod
+    async def _search_postgres(
+        session: AsyncSession,
+        parsed: SearchQuery,
+        skip: int,
+        limit: int,
+    ) -> tuple[List[Post], int]:
+        """Search with the GIN-indexed ``tsvector`` column, ranked by ``ts_rank_cd``."""
+        conditions = [
+            *PostService.filter_conditions(parsed),
+            *await PostService.text_conditions(session, parsed),
+        ]
+        count_result = await session.execute(
+            select(func.count()).select_from(Post).where(*conditions)
+        )
+        total = count_result.scalar() or 0
+
+        result = await session.execute(
+            select(Post)
+            .options(*PAGE_LOAD_OPTIONS)
+            .where(*conditions)
+            .order_by(ts_rank(parsed.match_text).desc(), Post.published_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), total
+
+    @staticmethod
+    async def _search_trigram(
+        session: AsyncSession,
+        parsed: SearchQuery,
+        skip: int,
+        limit: int,
+    ) -> tuple[List[Post], int]:
+        """Substring and fuzzy search over trigram indexes, ranked by word similarity."""
+        conditions = [
+            *PostService.filter_conditions(parsed),
+            *await PostService.text_conditions(session, parsed),
+        ]
+        count_result = await session.execute(
+            select(func.count()).select_from(Post).where(*conditions)
+        )
+        total = count_result.scalar() or 0
+
+        result = await session.execute(
+            select(Post)
+            .options(*PAGE_LOAD_OPTIONS)
+            .where(*conditions)
+            .order_by(trigram_rank(Post.content, parsed.match_text).desc(), Post.published_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), total
+
+    @staticmethod
+    async def _load_ranked(session: AsyncSession, post_ids: List[str]) -> List[Post]:
+        """Load posts by ID, keeping the order of ``post_ids``."""
+        if not post_ids:
+            return []
+
+        result = await session.execute(
+            select(Post)
+            .options(*PAGE_LOAD_OPTIONS)
+            .where(Post.id.in_(post_ids))
+        )
+        posts = {post.id: post for post in result.scalars().all()}
+        return [posts[post_id] for post_id in post_ids if post_id in posts]
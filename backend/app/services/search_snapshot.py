@@ -0,0 +1,347 @@
+"""Compact memory-mapped snapshots of the search index."""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+MAGIC = b"TGSI"
+FORMAT_VERSION = 1
+
+# magic, format version, analyzer version, docs, terms, total length,
+# watermark (POSIX timestamp, 0 if unknown), then the section offsets
+HEADER = struct.Struct("<4sI16sIIQd")
+SECTIONS = (
+    "doc_id_offsets",  # Q[docs + 1] into doc_ids
+    "doc_ids",  # UTF-8 post IDs
+    "doc_lengths",  # I[docs]
+    "id_order",  # I[docs]: ordinals sorted by post ID
+    "doc_data_offsets",  # Q[docs + 1] into doc_data
+    "doc_data",  # varints per doc: token spans, then term ordinals
+    "term_offsets",  # Q[terms + 1] into terms
+    "terms",  # UTF-8 terms, sorted bytewise
+    "doc_freqs",  # I[terms]
+    "posting_offsets",  # Q[terms + 1] into postings
+    "postings",  # varints per term: (ordinal delta, tf, position deltas...)*
+)
+SECTION_TABLE = struct.Struct(f"<{len(SECTIONS)}Q")
+ALIGNMENT = 8
+
+# (positions, starts, ends) of a document's tokens, in text order
+Spans = Tuple[array, array, array]
+
+
+def _put_varint(buffer: bytearray, value: int) -> None:
+    """Append an unsigned LEB128 varint."""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _get_varint(data, offset: int) -> Tuple[int, int]:
+    """Decode an unsigned LEB128 varint, returning (value, next offset)."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _offsets_array(chunks: Sequence[bytes]) -> array:
+    """Start offsets of consecutive chunks, plus the end of the last one."""
+    offsets = array("Q", [0])
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        offsets.append(total)
+    return offsets
+
+
+def write_snapshot(
+    path: Path,
+    doc_ids: Sequence[str],
+    doc_lengths: Sequence[int],
+    doc_spans: Sequence[Spans],
+    postings: Dict[str, Dict[int, List[int]]],
+    analyzer_version: str,
+    watermark: Optional[datetime] = None,
+) -> None:
+    """
+    Write an index snapshot to ``path`` (atomically replacing it).
+
+    Documents are identified by dense ordinals ``0..len(doc_ids) - 1``;
+    ``postings`` maps each term to ``{ordinal: positions}``. Readers that
+    still map a previous snapshot keep their view of the replaced file.
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("Search index snapshots are only supported on little-endian hosts")
+
+    num_docs = len(doc_ids)
+    terms = sorted(postings, key=lambda term: term.encode())
+    encoded_terms = [term.encode() for term in terms]
+    encoded_ids = [post_id.encode() for post_id in doc_ids]
+
+    # Posting lists, and the term ordinals of every document
+    doc_terms: List[List[int]] = [[] for _ in range(num_docs)]
+    posting_chunks = []
+    doc_freqs = array("I")
+    for term_ordinal, term in enumerate(terms):
+        chunk = bytearray()
+        previous = 0
+        term_postings = postings[term]
+        for ordinal in sorted(term_postings):
+            positions = term_postings[ordinal]
+            _put_varint(chunk, ordinal - previous)
+            _put_varint(chunk, len(positions))
+            last_position = 0
+            for position in positions:
+                _put_varint(chunk, position - last_position)
+                last_position = position
+            previous = ordinal
+            doc_terms[ordinal].append(term_ordinal)
+        posting_chunks.append(bytes(chunk))
+        doc_freqs.append(len(term_postings))
+
+    doc_chunks = []
+    for ordinal in range(num_docs):
+        chunk = bytearray()
+        positions, starts, ends = doc_spans[ordinal]
+        _put_varint(chunk, len(positions))
+        last_position = last_start = 0
+        for position, start, end in zip(positions, starts, ends):
+            _put_varint(chunk, position - last_position)
+            _put_varint(chunk, start - last_start)
+            _put_varint(chunk, end - start)
+            last_position, last_start = position, start
+        _put_varint(chunk, len(doc_terms[ordinal]))
+        last_term = 0
+        for term_ordinal in doc_terms[ordinal]:
+            _put_varint(chunk, term_ordinal - last_term)
+            last_term = term_ordinal
+        doc_chunks.append(bytes(chunk))
+
+    sections = {
+        "doc_id_offsets": _offsets_array(encoded_ids).tobytes(),
+        "doc_ids": b"".join(encoded_ids),
+        "doc_lengths": array("I", doc_lengths).tobytes(),
+        "id_order": array("I", sorted(range(num_docs), key=encoded_ids.__getitem__)).tobytes(),
+        "doc_data_offsets": _offsets_array(doc_chunks).tobytes(),
+        "doc_data": b"".join(doc_chunks),
+        "term_offsets": _offsets_array(encoded_terms).tobytes(),
+        "terms": b"".join(encoded_terms),
+        "doc_freqs": doc_freqs.tobytes(),
+        "posting_offsets": _offsets_array(posting_chunks).tobytes(),
+        "postings": b"".join(posting_chunks),
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        offset = HEADER.size + SECTION_TABLE.size
+        offsets = []
+        for name in SECTIONS:
+            offset += -offset % ALIGNMENT
+            offsets.append(offset)
+            offset += len(sections[name])
+
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                analyzer_version.encode()[:16],
+                num_docs,
+                len(terms),
+                sum(doc_lengths),
+                watermark.replace(tzinfo=timezone.utc).timestamp() if watermark else 0.0,
+            )
+        )
+        f.write(SECTION_TABLE.pack(*offsets))
+        for name, section_offset in zip(SECTIONS, offsets):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(sections[name])
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class IndexSnapshot:
+    """
+    Read-only view of a snapshot through ``mmap``.
+
+    Nothing is loaded up front: the term dictionary and the post ID table
+    are binary-searched in place, and posting lists are decoded on demand
+    (the most recently used ones are kept decoded). Several workers mapping
+    the same file share its pages through the OS page cache.
+    """
+
+    def __init__(self, path: Path, posting_cache_size: int = 1024):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = memoryview(self._mmap)
+
+        (
+            magic,
+            version,
+            analyzer_version,
+            self.num_docs,
+            self.num_terms,
+            self.total_length,
+            watermark,
+        ) = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._sections = {}
+            self.close()
+            raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} search index snapshot")
+
+        self.analyzer_version = analyzer_version.rstrip(b"\0").decode()
+        self.watermark = (
+            datetime.fromtimestamp(watermark, timezone.utc).replace(tzinfo=None) if watermark else None
+        )
+
+        offsets = SECTION_TABLE.unpack_from(self._data, HEADER.size)
+        ends = list(offsets[1:]) + [len(self._data)]
+        self._sections = {
+            name: self._data[start:end] for name, start, end in zip(SECTIONS, offsets, ends)
+        }
+        counts = {
+            "doc_id_offsets": self.num_docs + 1,
+            "doc_lengths": self.num_docs,
+            "id_order": self.num_docs,
+            "doc_data_offsets": self.num_docs + 1,
+            "term_offsets": self.num_terms + 1,
+            "doc_freqs": self.num_terms,
+            "posting_offsets": self.num_terms + 1,
+        }
+        for name, count in counts.items():
+            fmt = "Q" if name.endswith("offsets") else "I"
+            size = count * struct.calcsize(fmt)
+            self._sections[name] = self._sections[name][:size].cast(fmt)
+
+        self._decoded_postings = lru_cache(maxsize=posting_cache_size)(self._decode_postings)
+
+    def close(self) -> None:
+        """Release the mapping."""
+        for view in self._sections.values():
+            view.release()
+        self._sections = {}
+        self._data.release()
+        self._mmap.close()
+
+    def _slice(self, offsets: str, blob: str, i: int) -> memoryview:
+        table = self._sections[offsets]
+        return self._sections[blob][table[i]:table[i + 1]]
+
+    def doc_id(self, ordinal: int) -> str:
+        return bytes(self._slice("doc_id_offsets", "doc_ids", ordinal)).decode()
+
+    def doc_length(self, ordinal: int) -> int:
+        return self._sections["doc_lengths"][ordinal]
+
+    def ordinal(self, post_id: str) -> Optional[int]:
+        """Ordinal of a post, by binary search over the sorted ID table."""
+        key = post_id.encode()
+        order = self._sections["id_order"]
+        lo, hi = 0, self.num_docs
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self._slice("doc_id_offsets", "doc_ids", order[mid])) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.num_docs:
+            ordinal = order[lo]
+            if bytes(self._slice("doc_id_offsets", "doc_ids", ordinal)) == key:
+                return ordinal
+        return None
+
+    def term_ordinal(self, term: str) -> Optional[int]:
+        """Ordinal of a term, by binary search over the term dictionary."""
+        key = term.encode()
+        lo, hi = 0, self.num_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self._slice("term_offsets", "terms", mid)) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.num_terms and bytes(self._slice("term_offsets", "terms", lo)) == key:
+            return lo
+        return None
+
+    def term(self, term_ordinal: int) -> str:
+        return bytes(self._slice("term_offsets", "terms", term_ordinal)).decode()
+
+    def iter_terms(self) -> Iterator[str]:
+        """All terms, in dictionary order."""
+        for term_ordinal in range(self.num_terms):
+            yield self.term(term_ordinal)
+
+    def doc_freq(self, term: str) -> int:
+        term_ordinal = self.term_ordinal(term)
+        return self._sections["doc_freqs"][term_ordinal] if term_ordinal is not None else 0
+
+    def postings(self, term: str) -> Dict[int, List[int]]:
+        """``{ordinal: positions}`` of a term (empty if absent). Do not mutate."""
+        term_ordinal = self.term_ordinal(term)
+        if term_ordinal is None:
+            return {}
+        return self._decoded_postings(term_ordinal)
+
+    def _decode_postings(self, term_ordinal: int) -> Dict[int, List[int]]:
+        data = self._slice("posting_offsets", "postings", term_ordinal)
+        postings = {}
+        offset = 0
+        ordinal = 0
+        while offset < len(data):
+            delta, offset = _get_varint(data, offset)
+            ordinal += delta
+            tf, offset = _get_varint(data, offset)
+            positions = []
+            position = 0
+            for _ in range(tf):
+                delta, offset = _get_varint(data, offset)
+                position += delta
+                positions.append(position)
+            postings[ordinal] = positions
+        return postings
+
+    def _doc_data(self, ordinal: int) -> Tuple[Spans, List[int]]:
+        data = self._slice("doc_data_offsets", "doc_data", ordinal)
+        positions, starts, ends = array("I"), array("I"), array("I")
+        count, offset = _get_varint(data, 0)
+        position = start = 0
+        for _ in range(count):
+            delta, offset = _get_varint(data, offset)
+            position += delta
+            delta, offset = _get_varint(data, offset)
+            start += delta
+            length, offset = _get_varint(data, offset)
+            positions.append(position)
+            starts.append(start)
+            ends.append(start + length)
+
+        term_ordinals = []
+        count, offset = _get_varint(data, offset)
+        term_ordinal = 0
+        for _ in range(count):
+            delta, offset = _get_varint(data, offset)
+            term_ordinal += delta
+            term_ordinals.append(term_ordinal)
+        return (positions, starts, ends), term_ordinals
+
+    def doc_spans(self, ordinal: int) -> Spans:
+        return self._doc_data(ordinal)[0]
+
+    def doc_terms(self, ordinal: int) -> Tuple[str, ...]:
+        return tuple(self.term(term_ordinal) for term_ordinal in self._doc_data(ordinal)[1])
@@ -0,0 +1,190 @@
+"""Keeping a worker's in-memory search structures in step with the database."""
+import asyncio
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional
+
+from sqlalchemy import ARRAY, String, any_, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.versions import committed_version
+from app.models.post import Post
+from app.services.data_version_service import DataVersionService
+from app.services.search_cache import get_search_cache
+from app.services.search_index import get_search_index
+from app.services.suggest_index import get_suggest_index
+from app.services.suggest_service import SuggestService
+from app.services.tag_bitmap_service import CHANGE_REPLAY_OVERLAP, database_now
+
+logger = get_logger(__name__)
+
+# Data version scope bumped by every commit writing posts
+SEARCH_SCOPE = "search"
+# Scope bumped by tag and tag counter writes
+TAGS_SCOPE = "tags"
+
+
+class SearchSyncState:
+    """What this worker's search structures have applied so far."""
+
+    def __init__(self):
+        # Data versions and database time of the last pass (None until started)
+        self.version: Optional[int] = None
+        self.tags_version: Optional[int] = None
+        self.watermark: Optional[datetime] = None
+        # ``updated_at`` each recently written post was applied at
+        self.applied: Dict[str, datetime] = {}
+
+
+@lru_cache()
+def get_search_sync_state() -> SearchSyncState:
+    """Get the process-wide search sync state."""
+    return SearchSyncState()
+
+
+class SearchSyncService:
+    """
+    Service applying post writes to the search index, search cache and suggestions.
+
+    This worker's writes are applied right after their commit
+    (``index_post``); those of other workers and scripts by ``catch_up``,
+    which a background task runs every ``search_sync_interval_seconds``.
+    """
+
+    @staticmethod
+    def index_post(
+        session: AsyncSession,
+        post: Post,
+        previous_content: Optional[str] = None,
+    ) -> None:
+        """
+        Bring the in-memory search structures up to date with a committed post.
+
+        Cached search pages for any term the post had or now has are dropped,
+        and the suggestion word counts move from the previous content to the
+        new one. If no other commit wrote posts since the last one applied,
+        the state moves to the version of this commit.
+        """
+        SearchSyncService._apply(post.id, post.content or "", post.updated_at, previous_content)
+        state = get_search_sync_state()
+        version = committed_version(session, SEARCH_SCOPE)
+        if version is not None and state.version is not None and version == state.version + 1:
+            state.version = version
+
+    @staticmethod
+    def _apply(
+        post_id: str,
+        content: str,
+        updated_at: datetime,
+        previous_content: Optional[str] = None,
+        count_words: bool = True,
+    ) -> None:
+        if count_words:
+            suggest_index = get_suggest_index()
+            if previous_content is not None:
+                suggest_index.add_text(previous_content, delta=-1)
+            suggest_index.add_text(content)
+
+        if get_settings().search_backend == "memory":
+            index = get_search_index()
+            previous_terms = index.terms_of(post_id)
+            index.add(post_id, content, updated_at=updated_at)
+            get_search_cache().invalidate_terms(set(previous_terms).union(index.terms_of(post_id)))
+        get_search_sync_state().applied[post_id] = updated_at
+
+    @staticmethod
+    async def start(session: AsyncSession) -> None:
+        """
+        Start tracking writes from the current database state.
+
+        Call before the search index is loaded: posts committed in between
+        are then replayed (and replace their indexed version) rather than lost.
+        """
+        state = get_search_sync_state()
+        state.version = await DataVersionService.get_version(session, SEARCH_SCOPE)
+        state.tags_version = await DataVersionService.get_version(session, TAGS_SCOPE)
+        state.watermark = await session.scalar(select(database_now))
+        result = await session.execute(
+            select(Post.id, Post.updated_at).where(
+                Post.updated_at >= state.watermark - CHANGE_REPLAY_OVERLAP
+            )
+        )
+        state.applied = dict(result.all())
+
+    @staticmethod
+    async def catch_up(session: AsyncSession) -> int:
+        """
+        Apply the posts and tag counts other processes wrote since the previous pass.
+
+        Tags and their counts are reloaded when the ``tags`` version moved.
+        When the ``search`` version moved, the posts whose ``updated_at``
+        falls after the previous pass (minus ``CHANGE_REPLAY_OVERLAP``) are
+        listed and those not yet applied at that ``updated_at`` are read and
+        applied. New posts count towards channel and word suggestions; for
+        posts edited elsewhere the previous content is unknown, so their word
+        counts are left to the next vocabulary load.
+
+        Returns:
+            Number of posts applied
+        """
+        state = get_search_sync_state()
+        if state.watermark is None:
+            await SearchSyncService.start(session)
+            return 0
+
+        suggest_index = get_suggest_index()
+        tags_version = await DataVersionService.get_version(session, TAGS_SCOPE)
+        if tags_version != state.tags_version:
+            if suggest_index.loaded:
+                await SuggestService.load_tags(session)
+            state.tags_version = tags_version
+
+        version = await DataVersionService.get_version(session, SEARCH_SCOPE)
+        if version == state.version:
+            return 0
+
+        now = await session.scalar(select(database_now))
+        since = state.watermark - CHANGE_REPLAY_OVERLAP
+        result = await session.execute(
+            select(Post.id, Post.updated_at).where(Post.updated_at >= since)
+        )
+        changed = [
+            post_id
+            for post_id, updated_at in result.all()
+            if state.applied.get(post_id) != updated_at
+        ]
+        if changed:
+            # One array parameter, as in PostService.id_in
+            result = await session.execute(
+                select(
+                    Post.id, Post.content, Post.updated_at, Post.created_at, Post.channel_username
+                ).where(Post.id == any_(literal(changed, ARRAY(String))))
+            )
+            for post_id, content, updated_at, created_at, channel_username in result.all():
+                new = post_id not in state.applied and created_at >= since
+                if new:
+                    suggest_index.add_channel_count(channel_username, 1)
+                SearchSyncService._apply(post_id, content or "", updated_at, count_words=new)
+
+        state.version = version
+        state.watermark = now
+        recent = now - CHANGE_REPLAY_OVERLAP
+        state.applied = {
+            post_id: applied_at for post_id, applied_at in state.applied.items() if applied_at >= recent
+        }
+        return len(changed)
+
+    @staticmethod
+    async def run_periodic_sync(interval_seconds: float) -> None:
+        """Catch up forever, sleeping ``interval_seconds`` between passes."""
+        from app.db.session import AsyncSessionLocal
+
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                async with AsyncSessionLocal() as session:
+                    await SearchSyncService.catch_up(session)
+            except Exception as e:
+                logger.error(f"Search catch-up failed: {e}", exc_info=True)
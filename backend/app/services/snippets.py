@@ -0,0 +1,114 @@
+"""Highlighted snippets for search hits."""
+from collections import Counter
+from html import escape
+from typing import Dict, List, Sequence, Tuple
+
+from app.services.text_analyzer import Token
+
+ELLIPSIS = "…"
+MARK_OPEN = "<mark>"
+MARK_CLOSE = "</mark>"
+
+# (start, end, term) of a matched token in the original text
+Hit = Tuple[int, int, str]
+
+
+def hits_from_tokens(tokens: Sequence[Token], terms: Sequence[str]) -> List[Hit]:
+    """Matched tokens of an already analyzed text."""
+    wanted = set(terms)
+    return [(token.start, token.end, token.term) for token in tokens if token.term in wanted]
+
+
+def best_window(hits: Sequence[Hit], weights: Dict[str, float], max_chars: int) -> Tuple[int, int]:
+    """
+    Find the run of hits that fits in ``max_chars`` with the best score.
+
+    A window scores the summed weight of the distinct terms it contains, with
+    the number of hits as a tie-breaker. Hits are scanned once with two
+    pointers.
+
+    Returns:
+        Tuple of (first hit index, one past the last hit index)
+    """
+    best = (-1.0, 0)
+    best_range = (0, 0)
+    counts: Counter = Counter()
+    distinct_weight = 0.0
+    j = 0
+    for i, (start, _, _) in enumerate(hits):
+        while j < len(hits) and hits[j][1] - start <= max_chars:
+            term = hits[j][2]
+            if counts[term] == 0:
+                distinct_weight += weights.get(term, 1.0)
+            counts[term] += 1
+            j += 1
+
+        score = (distinct_weight, j - i)
+        if j > i and score > best:
+            best = score
+            best_range = (i, j)
+
+        if j > i:
+            term = hits[i][2]
+            counts[term] -= 1
+            if counts[term] == 0:
+                distinct_weight -= weights.get(term, 1.0)
+        else:
+            j = i + 1
+    return best_range
+
+
+def make_snippet(
+    text: str,
+    hits: Sequence[Hit],
+    weights: Dict[str, float],
+    max_chars: int = 200,
+) -> str:
+    """
+    Cut the best window of ``text`` and wrap matched tokens in ``<mark>``.
+
+    The window is centered on its hits, widened to ``max_chars`` and snapped
+    to whitespace so that words are not cut, unless a single token fills the
+    window. Text outside the marks is HTML-escaped. Without hits the
+    beginning of the text is returned.
+    """
+    if not text:
+        return ""
+
+    first, last = best_window(hits, weights, max_chars) if hits else (0, 0)
+    hits = hits[first:last]
+    if hits:
+        window_start, window_end = hits[0][0], hits[-1][1]
+    else:
+        window_start = window_end = 0
+
+    slack = max(max_chars - (window_end - window_start), 0)
+    start = max(window_start - slack // 2, 0)
+    end = min(start + max(max_chars, window_end - window_start), len(text))
+    start = max(min(start, end - max_chars), 0)
+
+    # Snap to whitespace without giving up any hit. Where there is none to
+    # snap to (a single long token), keep the hard cut at ``max_chars``
+    snapped = start
+    while 0 < snapped < window_start and not text[snapped - 1].isspace():
+        snapped += 1
+    if snapped == 0 or text[snapped - 1].isspace():
+        start = snapped
+    snapped = end
+    while window_end < snapped < len(text) and not text[snapped].isspace():
+        snapped -= 1
+    if snapped == len(text) or text[snapped].isspace():
+        end = snapped
+
+    parts = [ELLIPSIS] if start > 0 else []
+    cursor = start
+    for hit_start, hit_end, _ in hits:
+        if hit_start < cursor:
+            continue
+        parts.append(escape(text[cursor:hit_start]))
+        parts.append(MARK_OPEN + escape(text[hit_start:hit_end]) + MARK_CLOSE)
+        cursor = hit_end
+    parts.append(escape(text[cursor:end]))
+    if end < len(text):
+        parts.append(ELLIPSIS)
+    return "".join(parts).strip()
@@ -0,0 +1,295 @@
+"""In-memory prefix tries for autocomplete suggestions."""
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from app.core.config import get_settings
+from app.services.text_analyzer import TextAnalyzer, get_text_analyzer
+
+
+class _Node:
+    """Trie node holding the top keys of its subtree."""
+
+    __slots__ = ("children", "key", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.key: Optional[str] = None  # Key ending at this node
+        self.top: List[str] = []  # Best keys of the subtree, best first
+
+
+class PrefixTrie:
+    """
+    Prefix trie ranking completions by weight.
+
+    Every node caches the ``top_n`` heaviest keys of its subtree, so a lookup
+    only walks the prefix and copies one short list, independently of how
+    many keys share the prefix. Weight updates repair the cached lists along
+    the key's path only.
+    """
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self._root = _Node()
+        self._weights: Dict[str, int] = {}
+        self._labels: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._weights
+
+    def weight(self, key: str) -> Optional[int]:
+        return self._weights.get(key)
+
+    def _rank(self, key: str) -> Tuple[int, str]:
+        return -self._weights[key], key
+
+    def _path(self, key: str, create: bool = False) -> List[_Node]:
+        """Nodes from the root to ``key`` (shorter if the key is absent)."""
+        node = self._root
+        path = [node]
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    break
+                child = node.children[char] = _Node()
+            node = child
+            path.append(node)
+        return path
+
+    def set(self, key: str, weight: int, label: Optional[str] = None) -> None:
+        """Insert ``key`` or change its weight."""
+        previous = self._weights.get(key)
+        self._weights[key] = weight
+        if label is not None:
+            self._labels[key] = label
+
+        path = self._path(key, create=True)
+        path[-1].key = key
+        if previous is None or weight >= previous:
+            for node in path:
+                self._promote(node, key)
+        else:
+            for node in reversed(path):
+                if key in node.top:
+                    self._recompute(node)
+
+    def remove(self, key: str) -> bool:
+        """Remove ``key``, pruning nodes left empty."""
+        if key not in self._weights:
+            return False
+
+        path = self._path(key)
+        del self._weights[key]
+        self._labels.pop(key, None)
+        path[-1].key = None
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            if depth and not node.children and node.key is None:
+                del path[depth - 1].children[key[depth - 1]]
+            elif key in node.top:
+                self._recompute(node)
+        return True
+
+    def _promote(self, node: _Node, key: str) -> None:
+        """Account for ``key`` becoming heavier in ``node``'s subtree."""
+        top = node.top
+        if key not in top:
+            if len(top) >= self.top_n and self._rank(key) >= self._rank(top[-1]):
+                return
+            top.append(key)
+        top.sort(key=self._rank)
+        del top[self.top_n:]
+
+    def _recompute(self, node: _Node) -> None:
+        """Rebuild ``node``'s top list from its own key and its children's lists."""
+        candidates = {key for child in node.children.values() for key in child.top}
+        if node.key is not None:
+            candidates.add(node.key)
+        node.top = sorted(candidates, key=self._rank)[:self.top_n]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Heaviest ``(label, weight)`` completions of ``prefix``."""
+        path = self._path(prefix)
+        if len(path) != len(prefix) + 1:
+            return []
+        return [
+            (self._labels.get(key, key), self._weights[key])
+            for key in path[-1].top[:limit]
+        ]
+
+
+class SuggestIndex:
+    """
+    Autocomplete over tag names, channel usernames and frequent content words.
+
+    Tags are ranked by post count, channels by number of posts and words by
+    the number of posts containing them. A content word only becomes a
+    suggestion once it appears in ``min_term_count`` posts, which keeps typos
+    and one-off tokens out of the trie.
+
+    The index is filled on first use (see ``SuggestService.ensure_loaded``);
+    channel and word counts changed before that are left to the load.
+    """
+
+    def __init__(
+        self,
+        analyzer: Optional[TextAnalyzer] = None,
+        top_n: int = 10,
+        min_term_count: int = 3,
+        min_term_length: int = 3,
+    ):
+        self.analyzer = analyzer or get_text_analyzer()
+        self.min_term_count = min_term_count
+        self.min_term_length = min_term_length
+        self.tags = PrefixTrie(top_n)
+        self.channels = PrefixTrie(top_n)
+        self.terms = PrefixTrie(top_n)
+        self._term_counts: Counter = Counter()
+        self._tag_names: Dict[int, str] = {}
+        self.loaded = False
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize a key or a typed prefix."""
+        return TextAnalyzer.normalize(text.strip().lstrip("@#"))
+
+    def set_tag(self, tag_id: int, name: str, post_count: int) -> None:
+        """Insert a tag or replace its name and count."""
+        previous = self._tag_names.get(tag_id)
+        if previous is not None and previous != name:
+            self.tags.remove(self.normalize(previous))
+        self._tag_names[tag_id] = name
+        self.tags.set(self.normalize(name), max(post_count, 0), label=name)
+
+    def has_tag(self, tag_id: int) -> bool:
+        """Whether the tag's name is known."""
+        return tag_id in self._tag_names
+
+    def add_tag_count(self, tag_id: int, delta: int) -> bool:
+        """
+        Adjust a known tag's count.
+
+        Returns:
+            False if the tag is unknown (its name must be supplied via ``set_tag``)
+        """
+        name = self._tag_names.get(tag_id)
+        if name is None:
+            return False
+        key = self.normalize(name)
+        self.tags.set(key, max((self.tags.weight(key) or 0) + delta, 0))
+        return True
+
+    def rename_tag(self, tag_id: int, name: str) -> None:
+        """Rename a known tag, keeping its count."""
+        previous = self._tag_names.get(tag_id)
+        if previous is not None:
+            self.set_tag(tag_id, name, self.tags.weight(self.normalize(previous)) or 0)
+
+    def remove_tag(self, tag_id: int) -> None:
+        """Forget a deleted tag."""
+        name = self._tag_names.pop(tag_id, None)
+        if name is not None:
+            self.tags.remove(self.normalize(name))
+
+    def retain_tags(self, tag_ids: Set[int]) -> None:
+        """Forget every tag not in ``tag_ids``."""
+        for tag_id in set(self._tag_names) - tag_ids:
+            self.remove_tag(tag_id)
+
+    def tag_count(self, name: str) -> Optional[int]:
+        """Post count of a tag, if known."""
+        return self.tags.weight(self.normalize(name))
+
+    def channel_count(self, username: str) -> Optional[int]:
+        """Post count of a channel, if known."""
+        return self.channels.weight(self.normalize(username))
+
+    def add_channel_count(self, username: str, delta: int) -> None:
+        """Adjust the post count of a channel, inserting it if needed."""
+        if not self.loaded:
+            return
+        key = self.normalize(username)
+        self.channels.set(key, max((self.channels.weight(key) or 0) + delta, 0), label=username)
+
+    def set_channel_count(self, username: str, post_count: int) -> None:
+        """Insert a channel or replace its post count."""
+        self.channels.set(self.normalize(username), max(post_count, 0), label=username)
+
+    def words(self, text: str) -> Set[str]:
+        """Distinct words of a text that are eligible as suggestions."""
+        return {
+            token.surface
+            for token in self.analyzer.analyze(text)
+            if len(token.surface) >= self.min_term_length and not token.surface.isdigit()
+        }
+
+    def add_text(self, text: str, delta: int = 1) -> None:
+        """Count (or with ``delta=-1`` uncount) the distinct words of a post."""
+        if not self.loaded:
+            return
+        self.add_words(self.words(text), delta)
+
+    def add_words(self, words: Iterable[str], delta: int = 1) -> None:
+        """Count (or uncount) the words of one post."""
+        for word in words:
+            count = self._term_counts[word] + delta
+            if count > 0:
+                self._term_counts[word] = count
+            else:
+                self._term_counts.pop(word, None)
+
+            if count >= self.min_term_count:
+                self.terms.set(word, count)
+            elif word in self.terms:
+                self.terms.remove(word)
+
+    def load_word_counts(self, counts: Mapping[str, int]) -> None:
+        """Add the post counts of many words at once (e.g. from a saved vocabulary)."""
+        for word, delta in counts.items():
+            count = self._term_counts[word] + delta
+            self._term_counts[word] = count
+            if count >= self.min_term_count:
+                self.terms.set(word, count)
+
+    def word_counts(self) -> Mapping[str, int]:
+        """Post count of every word seen, including those below ``min_term_count``."""
+        return self._term_counts
+
+    def suggest(self, prefix: str, limit: int = 10) -> Dict[str, List[Tuple[str, int]]]:
+        """Completions of ``prefix`` per kind."""
+        key = self.normalize(prefix)
+        if not key:
+            return {"tags": [], "channels": [], "terms": []}
+        return {
+            "tags": self.tags.complete(key, limit),
+            "channels": self.channels.complete(key, limit),
+            "terms": self.terms.complete(key, limit),
+        }
+
+
+@lru_cache()
+def get_suggest_index() -> SuggestIndex:
+    """Get the process-wide suggestion index."""
+    settings = get_settings()
+    return SuggestIndex(
+        top_n=settings.suggest_top_n,
+        min_term_count=settings.suggest_min_term_count,
+    )
+
+
+def count_words(texts: Iterable[str]) -> Counter:
+    """
+    Post counts of the words of ``texts``.
+
+    Runs in worker processes during parallel rebuilds, so it only relies on
+    the process-wide suggestion index settings.
+    """
+    index = get_suggest_index()
+    counts: Counter = Counter()
+    for text in texts:
+        counts.update(index.words(text or ""))
+    return counts
@@ -0,0 +1,164 @@
+"""Loading and maintenance of the autocomplete index."""
+import asyncio
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import BASE_DIR, get_settings
+from app.core.logging import get_logger
+from app.db.versions import call_after_commit
+from app.models.channel import Channel
+from app.models.post import Post
+from app.models.tag import Tag
+from app.models.tag_count import TagCount
+from app.services.suggest_index import SuggestIndex, get_suggest_index
+from app.services.text_analyzer import ANALYZER_VERSION
+
+logger = get_logger(__name__)
+
+# Suffix of the word vocabulary saved next to the search index snapshot
+WORDS_FILE_SUFFIX = ".words"
+
+_load_lock = asyncio.Lock()
+
+
+class SuggestService:
+    """Service keeping the in-memory suggestion index in sync with the database."""
+
+    @staticmethod
+    async def ensure_loaded(session: AsyncSession) -> SuggestIndex:
+        """The suggestion index, built on its first use in this worker."""
+        index = get_suggest_index()
+        if not index.loaded:
+            async with _load_lock:
+                if not index.loaded:
+                    await SuggestService.build_index(session)
+        return index
+
+    @staticmethod
+    async def build_index(session: AsyncSession, batch_size: int = 1000) -> None:
+        """
+        Load tags, channels and content words into the suggestion index.
+
+        Word counts come from the vocabulary saved with the search index
+        snapshot, if there is one for the current analyzer, plus the posts
+        written after it. Without one, the content of every post is read.
+        """
+        index = get_suggest_index()
+        await SuggestService.load_tags(session)
+
+        result = await session.execute(
+            select(Post.channel_username, func.count()).group_by(Post.channel_username)
+        )
+        for username, post_count in result.all():
+            index.set_channel_count(username, post_count)
+        result = await session.execute(select(Channel.username))
+        for username in result.scalars().all():
+            if index.channel_count(username) is None:
+                index.set_channel_count(username, 0)
+
+        query = select(Post.content)
+        path = SuggestService.words_path()
+        vocabulary = SuggestService.read_words(path) if path else None
+        if vocabulary is not None:
+            watermark, counts = vocabulary
+            index.load_word_counts(counts)
+            if watermark is not None:
+                query = query.where(Post.updated_at > watermark)
+        stream = await session.stream(query.execution_options(yield_per=batch_size))
+        async for (content,) in stream:
+            index.add_words(index.words(content or ""))
+        index.loaded = True
+
+        logger.info(
+            f"Built suggestion index with {len(index.tags)} tags, "
+            f"{len(index.channels)} channels and {len(index.terms)} terms"
+        )
+
+    @staticmethod
+    def words_path() -> Optional[Path]:
+        """Vocabulary file next to the configured search index snapshot, if any."""
+        path = get_settings().search_snapshot_path
+        return BASE_DIR / f"{path}{WORDS_FILE_SUFFIX}" if path else None
+
+    @staticmethod
+    def save_words(path: Path, counts: Mapping[str, int], watermark: Optional[datetime]) -> None:
+        """
+        Write word post counts to ``path`` (atomically replacing it).
+
+        ``watermark`` is the latest ``updated_at`` of the counted posts; later
+        posts are counted on top when the file is loaded.
+        """
+        header = {
+            "analyzer_version": ANALYZER_VERSION,
+            "watermark": watermark.isoformat() if watermark else None,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            for word, count in counts.items():
+                f.write(f"{word}\t{count}\n")
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def read_words(path: Path) -> Optional[Tuple[Optional[datetime], Dict[str, int]]]:
+        """Watermark and word counts of a vocabulary file, if usable."""
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header.get("analyzer_version") != ANALYZER_VERSION:
+                    return None
+                counts = {}
+                for line in f:
+                    word, count = line.rstrip("\n").split("\t")
+                    counts[word] = int(count)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable suggestion vocabulary {path}: {e}")
+            return None
+        watermark = header.get("watermark")
+        return (datetime.fromisoformat(watermark) if watermark else None), counts
+
+    @staticmethod
+    async def load_tags(session: AsyncSession) -> None:
+        """(Re)load every tag with its post count, forgetting deleted tags."""
+        index = get_suggest_index()
+        result = await session.execute(
+            select(Tag.id, Tag.name, func.coalesce(TagCount.post_count, 0))
+            .outerjoin(TagCount, TagCount.tag_id == Tag.id)
+        )
+        tag_ids = set()
+        for tag_id, name, post_count in result.all():
+            index.set_tag(tag_id, name, post_count)
+            tag_ids.add(tag_id)
+        index.retain_tags(tag_ids)
+
+    @staticmethod
+    async def apply_tag_deltas(session: AsyncSession, deltas: Dict[int, int]) -> None:
+        """
+        Mirror tag counter deltas once the session's transaction commits.
+
+        Names of tags not seen yet are looked up now, in the transaction
+        that may have created them; the index itself only changes after the
+        commit, so a rolled back transaction leaves it untouched.
+        """
+        index = get_suggest_index()
+        unknown = [tag_id for tag_id in deltas if not index.has_tag(tag_id)]
+        names: Dict[int, str] = {}
+        if unknown:
+            result = await session.execute(select(Tag.id, Tag.name).where(Tag.id.in_(unknown)))
+            names = dict(result.all())
+
+        def apply() -> None:
+            for tag_id, delta in deltas.items():
+                if not index.add_tag_count(tag_id, delta) and tag_id in names:
+                    index.set_tag(tag_id, names[tag_id], delta)
+
+        call_after_commit(session, apply)
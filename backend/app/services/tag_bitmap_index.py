@@ -0,0 +1,183 @@
+"""In-memory tag to post bitmaps over timeline-ordered post ordinals."""
+from bisect import bisect_left
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.services.bitmaps import RoaringBitmap
+from app.services.tag_expression import TagAnd, TagExpression, TagNot, TagOr, TagTerm
+
+TimelineKey = Tuple[datetime, str]
+
+
+class TagBitmapIndex:
+    """
+    One compressed bitmap of post ordinals per tag.
+
+    Every post gets a dense ordinal in ``(published_at, id)`` order, so a
+    tag expression is evaluated with bitmap AND / OR / ANDNOT, counted
+    without touching the database, and paged newest first by walking the
+    result from its highest ordinal. Posts arriving out of timeline order
+    (history backfills) are appended and the ordinals are renumbered once,
+    on the next read.
+    """
+
+    def __init__(self):
+        self._keys: List[TimelineKey] = []  # Ordinal -> (published_at, post_id)
+        self._ordinals: Dict[str, int] = {}
+        self._tags: Dict[str, RoaringBitmap] = {}
+        self._all = RoaringBitmap()
+        self._ordered = True
+        # Catch-up state (see TagBitmapService): the "tag_bitmap" data version
+        # and database time of the last pass (None until first loaded), and
+        # the ``changed_at`` each recently changed post was applied at
+        self.version: Optional[int] = None
+        self.watermark: Optional[datetime] = None
+        self.applied: Dict[str, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def tag_count(self) -> int:
+        return len(self._tags)
+
+    def size_in_bytes(self) -> int:
+        """Approximate payload size of all bitmaps."""
+        return self._all.size_in_bytes() + sum(bitmap.size_in_bytes() for bitmap in self._tags.values())
+
+    def set_post(self, post_id: str, published_at: datetime, tag_names: Iterable[str]) -> None:
+        """Add a post, or replace its tags if it is already indexed."""
+        ordinal = self._ordinals.get(post_id)
+        if ordinal is None:
+            key = (published_at, post_id)
+            if self._keys and key < self._keys[-1]:
+                self._ordered = False
+            ordinal = len(self._keys)
+            self._keys.append(key)
+            self._ordinals[post_id] = ordinal
+            self._all.add(ordinal)
+
+        names = set(tag_names)
+        for name, bitmap in list(self._tags.items()):
+            if name not in names and ordinal in bitmap:
+                bitmap.discard(ordinal)
+                if not bitmap:
+                    del self._tags[name]
+        for name in names:
+            self._tags.setdefault(name, RoaringBitmap()).add(ordinal)
+
+    def load(self, posts: Iterable[TimelineKey], tags: Iterable[Tuple[str, str]]) -> None:
+        """
+        Bulk-build from ``(published_at, post_id)`` rows and ``(post_id, tag name)`` pairs.
+
+        Replaces the current contents.
+        """
+        self._keys = sorted(posts)
+        self._ordinals = {post_id: ordinal for ordinal, (_, post_id) in enumerate(self._keys)}
+        self._all = RoaringBitmap(range(len(self._keys)))
+        ordinals: Dict[str, List[int]] = {}
+        for post_id, name in tags:
+            ordinal = self._ordinals.get(post_id)
+            if ordinal is not None:
+                ordinals.setdefault(name, []).append(ordinal)
+        self._tags = {name: RoaringBitmap(values) for name, values in ordinals.items()}
+        self._ordered = True
+
+    def rename_tag(self, old_name: str, new_name: str) -> None:
+        """Rename a tag, merging it into ``new_name`` if that tag has posts."""
+        bitmap = self._tags.pop(old_name, None)
+        if bitmap is not None:
+            target = self._tags.get(new_name)
+            self._tags[new_name] = bitmap | target if target is not None else bitmap
+
+    def remove_tag(self, name: str) -> None:
+        self._tags.pop(name, None)
+
+    def evaluate(self, expression: TagExpression) -> RoaringBitmap:
+        """Ordinals of the posts matching an expression."""
+        self._ensure_ordered()
+        return self._evaluate(expression)
+
+    def count(self, expression: TagExpression) -> int:
+        """Number of posts matching an expression."""
+        return len(self.evaluate(expression))
+
+    def page(
+        self,
+        expression: TagExpression,
+        limit: int,
+        skip: int = 0,
+        before: Optional[TimelineKey] = None,
+    ) -> Tuple[List[str], int, bool]:
+        """
+        Newest matching posts, after skipping ``skip`` or strictly before a timeline key.
+
+        Returns:
+            Tuple of (post IDs, total matches, whether more posts follow)
+        """
+        matches = self.evaluate(expression)
+        below = bisect_left(self._keys, before) if before is not None else None
+        post_ids = []
+        for position, ordinal in enumerate(matches.descending(below)):
+            if position < skip:
+                continue
+            if len(post_ids) == limit:
+                return post_ids, len(matches), True
+            post_ids.append(self._keys[ordinal][1])
+        return post_ids, len(matches), False
+
+    def _evaluate(self, expression: TagExpression) -> RoaringBitmap:
+        if isinstance(expression, TagTerm):
+            return self._tags.get(expression.name, RoaringBitmap())
+        if isinstance(expression, TagNot):
+            return self._all - self._evaluate(expression.operand)
+        if isinstance(expression, TagOr):
+            result = RoaringBitmap()
+            for operand in expression.operands:
+                result = result | self._evaluate(operand)
+            return result
+
+        # AND: intersect the positive operands smallest first, then subtract
+        # the negated ones instead of complementing them
+        positives = [
+            self._evaluate(operand) for operand in expression.operands
+            if not isinstance(operand, TagNot)
+        ]
+        negatives = [
+            self._evaluate(operand.operand) for operand in expression.operands
+            if isinstance(operand, TagNot)
+        ]
+        positives.sort(key=len)
+        result = positives[0] if positives else self._all
+        for bitmap in positives[1:]:
+            if not result:
+                break
+            result = result & bitmap
+        for bitmap in negatives:
+            if not result:
+                break
+            result = result - bitmap
+        return result
+
+    def _ensure_ordered(self) -> None:
+        """Renumber ordinals after out-of-order inserts so they follow the timeline."""
+        if self._ordered:
+            return
+        order = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+        remap = [0] * len(order)
+        for ordinal, previous in enumerate(order):
+            remap[previous] = ordinal
+        self._keys = [self._keys[previous] for previous in order]
+        self._ordinals = {post_id: ordinal for ordinal, (_, post_id) in enumerate(self._keys)}
+        self._tags = {
+            name: RoaringBitmap(remap[ordinal] for ordinal in bitmap)
+            for name, bitmap in self._tags.items()
+        }
+        self._ordered = True
+
+
+@lru_cache()
+def get_tag_bitmap_index() -> TagBitmapIndex:
+    """Get the process-wide tag bitmap index."""
+    return TagBitmapIndex()
@@ -0,0 +1,184 @@
+"""Loading and maintenance of the tag bitmap index."""
+import asyncio
+from datetime import timedelta
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import ARRAY, String, any_, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.db.versions import committed_version
+from app.models.post import Post, changed_at
+from app.models.post_tag import PostTag
+from app.models.tag import Tag
+from app.services.data_version_service import DataVersionService
+from app.services.tag_bitmap_index import TagBitmapIndex, get_tag_bitmap_index
+
+logger = get_logger(__name__)
+
+# Data version scope bumped by every commit writing posts, tags or post_tags
+BITMAP_SCOPE = "tag_bitmap"
+
+# Posts changed this long before the previous catch-up are read again: a
+# transaction stamps ``changed_at`` when it starts, but only becomes visible
+# when it commits
+CHANGE_REPLAY_OVERLAP = timedelta(minutes=5)
+
+# Database clock, in the naive UTC of the timestamp columns
+database_now = func.timezone("utc", func.now())
+
+_load_task: Optional[asyncio.Task] = None
+
+
+class TagBitmapService:
+    """Service keeping the in-memory tag bitmaps in sync with the database."""
+
+    @staticmethod
+    async def current_index() -> TagBitmapIndex:
+        """
+        The bitmap index, waiting for its initial load if that is still running.
+
+        Requests never rebuild the index: this process's writes are applied
+        after their commit by ``sync_posts``, those of other workers and
+        scripts by ``catch_up``, which a background task runs every
+        ``tag_bitmap_refresh_seconds``.
+        """
+        global _load_task
+        index = get_tag_bitmap_index()
+        if index.watermark is None:
+            # One load shared by every waiter, restarted if the last one failed
+            if _load_task is None or _load_task.done():
+                _load_task = asyncio.create_task(TagBitmapService._load())
+            await asyncio.shield(_load_task)
+        return index
+
+    @staticmethod
+    async def _load() -> None:
+        from app.db.session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as session:
+            await TagBitmapService.build_index(session)
+
+    @staticmethod
+    async def build_index(session: AsyncSession, batch_size: int = 10000) -> None:
+        """Load every post and tag association into the bitmap index."""
+        index = get_tag_bitmap_index()
+        # Read before the rows: commits in between are replayed by the next catch-up
+        version = await DataVersionService.get_version(session, BITMAP_SCOPE)
+        now = await session.scalar(select(database_now))
+        recent = now - CHANGE_REPLAY_OVERLAP
+
+        stream = await session.stream(
+            select(Post.published_at, Post.id, changed_at).execution_options(yield_per=batch_size)
+        )
+        posts = []
+        applied = {}
+        async for published_at, post_id, post_changed_at in stream:
+            posts.append((published_at, post_id))
+            if post_changed_at >= recent:
+                applied[post_id] = post_changed_at
+        stream = await session.stream(
+            select(PostTag.post_id, Tag.name)
+            .join(Tag, Tag.id == PostTag.tag_id)
+            .execution_options(yield_per=batch_size)
+        )
+        tags = [(post_id, name) async for post_id, name in stream]
+        index.load(posts, tags)
+        index.version = version
+        index.watermark = now
+        index.applied = applied
+        logger.info(
+            f"Built tag bitmap index with {len(index)} posts and {index.tag_count} tags "
+            f"({index.size_in_bytes() / 1024:.0f} KiB of bitmaps)"
+        )
+
+    @staticmethod
+    async def catch_up(session: AsyncSession) -> int:
+        """
+        Apply the posts other processes changed since the previous pass.
+
+        Nothing is read but the version unless it moved past the one the index
+        is at. Then only the posts whose ``changed_at`` falls after the
+        previous pass (minus ``CHANGE_REPLAY_OVERLAP``) are listed, and those
+        not yet applied at that ``changed_at`` are re-read.
+
+        Returns:
+            Number of posts re-read
+        """
+        index = get_tag_bitmap_index()
+        if index.watermark is None:
+            return 0
+        version = await DataVersionService.get_version(session, BITMAP_SCOPE)
+        if version == index.version:
+            return 0
+
+        now = await session.scalar(select(database_now))
+        result = await session.execute(
+            select(Post.id, changed_at).where(changed_at >= index.watermark - CHANGE_REPLAY_OVERLAP)
+        )
+        changed = [
+            post_id
+            for post_id, post_changed_at in result.all()
+            if index.applied.get(post_id) != post_changed_at
+        ]
+        await TagBitmapService.sync_posts(session, changed)
+
+        index.version = version
+        index.watermark = now
+        recent = now - CHANGE_REPLAY_OVERLAP
+        index.applied = {
+            post_id: applied_at for post_id, applied_at in index.applied.items() if applied_at >= recent
+        }
+        return len(changed)
+
+    @staticmethod
+    async def run_periodic_sync(interval_seconds: float) -> None:
+        """Load the index, then catch it up forever, sleeping ``interval_seconds`` between passes."""
+        from app.db.session import AsyncSessionLocal
+
+        while True:
+            try:
+                await TagBitmapService.current_index()
+                async with AsyncSessionLocal() as session:
+                    await TagBitmapService.catch_up(session)
+            except Exception as e:
+                logger.error(f"Tag bitmap catch-up failed: {e}", exc_info=True)
+            await asyncio.sleep(interval_seconds)
+
+    @staticmethod
+    async def sync_posts(session: AsyncSession, post_ids: Iterable[str]) -> None:
+        """
+        Mirror the committed tags of posts into the index.
+
+        Call after the commit, so a rollback cannot leave the index ahead of
+        the database. If no other commit bumped the ``tag_bitmap`` version
+        since the one the index is at, the index moves to the version of this
+        commit, so the next catch-up has nothing to read.
+        """
+        index = get_tag_bitmap_index()
+        post_ids = list(set(post_ids))
+        if index.watermark is None or not post_ids:
+            # Not loaded yet: the load or the next catch-up reads them
+            return
+
+        # One array parameter, as in PostService.id_in: catch-ups may pass many IDs
+        ids = literal(post_ids, ARRAY(String))
+        result = await session.execute(
+            select(PostTag.post_id, Tag.name)
+            .join(Tag, Tag.id == PostTag.tag_id)
+            .where(PostTag.post_id == any_(ids))
+        )
+        tag_names: Dict[str, Set[str]] = {}
+        for post_id, name in result.all():
+            tag_names.setdefault(post_id, set()).add(name)
+
+        result = await session.execute(
+            select(Post.id, Post.published_at, changed_at).where(Post.id == any_(ids))
+        )
+        for post_id, published_at, post_changed_at in result.all():
+            index.set_post(post_id, published_at, tag_names.get(post_id, ()))
+            index.applied[post_id] = post_changed_at
+
+        version = committed_version(session, BITMAP_SCOPE)
+        if version is not None and index.version is not None and version == index.version + 1:
+            index.version = version
@@ -0,0 +1,92 @@
+"""Tag usage counter maintenance."""
+import asyncio
+from collections import Counter
+from typing import Dict, Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.post_tag import PostTag
+from app.models.tag import Tag
+from app.models.tag_count import TagCount
+from app.services.suggest_service import SuggestService
+
+logger = get_logger(__name__)
+
+
+class TagCountService:
+    """Service keeping the ``tag_counts`` table in sync with ``post_tags``."""
+
+    @staticmethod
+    def deltas(added: Iterable[int] = (), removed: Iterable[int] = ()) -> Dict[int, int]:
+        """Build a ``{tag_id: delta}`` mapping from added and removed tag IDs."""
+        counter = Counter(added)
+        counter.subtract(removed)
+        return {tag_id: delta for tag_id, delta in counter.items() if delta}
+
+    @staticmethod
+    async def apply_deltas(session: AsyncSession, deltas: Dict[int, int]) -> None:
+        """
+        Adjust tag counters by the given deltas.
+
+        Runs as a single upsert in the caller's transaction and does not
+        commit, so the counters change atomically with the ``post_tags`` rows.
+        The suggestion index follows once the transaction commits.
+        """
+        if not deltas:
+            return
+
+        stmt = insert(TagCount).values(
+            [{"tag_id": tag_id, "post_count": delta} for tag_id, delta in deltas.items()]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TagCount.tag_id],
+            set_={"post_count": TagCount.post_count + stmt.excluded.post_count},
+        )
+        await session.execute(stmt)
+        await SuggestService.apply_tag_deltas(session, deltas)
+
+    @staticmethod
+    async def reconcile(session: AsyncSession) -> int:
+        """
+        Recompute all tag counters from ``post_tags``.
+
+        Only counters that drifted are written.
+
+        Returns:
+            Number of counters that were corrected
+        """
+        actual = (
+            select(Tag.id, func.count(PostTag.tag_id))
+            .outerjoin(PostTag, Tag.id == PostTag.tag_id)
+            .group_by(Tag.id)
+        )
+        stmt = insert(TagCount).from_select(["tag_id", "post_count"], actual)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TagCount.tag_id],
+            set_={"post_count": stmt.excluded.post_count},
+            where=TagCount.post_count != stmt.excluded.post_count,
+        ).returning(TagCount.tag_id)
+
+        result = await session.execute(stmt)
+        corrected = len(result.all())
+        await session.commit()
+        await SuggestService.load_tags(session)
+        return corrected
+
+    @staticmethod
+    async def run_periodic_reconcile(interval_seconds: int) -> None:
+        """Reconcile tag counters forever, sleeping ``interval_seconds`` between runs."""
+        from app.db.session import AsyncSessionLocal
+
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                async with AsyncSessionLocal() as session:
+                    corrected = await TagCountService.reconcile(session)
+                if corrected:
+                    logger.warning(f"Reconciled {corrected} drifted tag counters")
+            except Exception as e:
+                logger.error(f"Tag counter reconciliation failed: {e}", exc_info=True)
@@ -0,0 +1,141 @@
+"""Boolean tag expressions: ``nlp AND (llm OR agents) AND NOT hiring``."""
+import re
+from typing import List, NamedTuple, Tuple, Union
+
+# Tag names, quoted names, parentheses and the operators (AND / OR / NOT or & | -)
+TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([&|-])|([^\s()"&|]+))')
+
+OPERATORS = {"AND": "&", "OR": "|", "NOT": "-"}
+
+
+class TagTerm(NamedTuple):
+    """Posts carrying the tag."""
+
+    name: str
+
+
+class TagNot(NamedTuple):
+    """Posts not matching the operand."""
+
+    operand: "TagExpression"
+
+
+class TagAnd(NamedTuple):
+    """Posts matching every operand."""
+
+    operands: Tuple["TagExpression", ...]
+
+
+class TagOr(NamedTuple):
+    """Posts matching any operand."""
+
+    operands: Tuple["TagExpression", ...]
+
+
+TagExpression = Union[TagTerm, TagNot, TagAnd, TagOr]
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    """Split an expression into ``(kind, value)`` tokens."""
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = TOKEN_RE.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Invalid tag expression near {text[position:]!r}")
+        position = match.end()
+        opening, closing, quoted, symbol, word = match.groups()
+        if opening:
+            tokens.append(("(", opening))
+        elif closing:
+            tokens.append((")", closing))
+        elif quoted is not None:
+            tokens.append(("tag", quoted))
+        elif symbol:
+            tokens.append(("op", symbol))
+        elif word in OPERATORS:
+            tokens.append(("op", OPERATORS[word]))
+        else:
+            tokens.append(("tag", word))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent: OR binds loosest, then AND (also implicit), then NOT."""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> Tuple[str, str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else ("end", "")
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> TagExpression:
+        expression = self.parse_or()
+        if self.peek()[0] != "end":
+            raise ValueError(f"Unexpected {self.peek()[1]!r} in tag expression")
+        return expression
+
+    def parse_or(self) -> TagExpression:
+        operands = [self.parse_and()]
+        while self.peek() == ("op", "|"):
+            self.take()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else TagOr(tuple(operands))
+
+    def parse_and(self) -> TagExpression:
+        operands = [self.parse_not()]
+        while True:
+            kind, value = self.peek()
+            if (kind, value) == ("op", "&"):
+                self.take()
+            elif not (kind in ("tag", "(") or (kind, value) == ("op", "-")):
+                break
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else TagAnd(tuple(operands))
+
+    def parse_not(self) -> TagExpression:
+        kind, value = self.take()
+        if (kind, value) == ("op", "-"):
+            return TagNot(self.parse_not())
+        if kind == "tag":
+            if not value:
+                raise ValueError("Empty tag name in tag expression")
+            return TagTerm(value)
+        if kind == "(":
+            expression = self.parse_or()
+            if self.take()[0] != ")":
+                raise ValueError("Unbalanced parentheses in tag expression")
+            return expression
+        raise ValueError(f"Expected a tag in tag expression, got {value or 'end of input'!r}")
+
+
+def parse_tag_expression(text: str) -> TagExpression:
+    """
+    Parse a boolean tag expression.
+
+    ``AND`` (or ``&``, or nothing between two operands) binds tighter than
+    ``OR`` (``|``); ``NOT`` (``-``) applies to the operand that follows.
+    Operators are upper case; quote tag names containing spaces or
+    parentheses.
+
+    Raises:
+        ValueError: If the expression is empty or malformed
+    """
+    tokens = _tokenize(text)
+    if not tokens:
+        raise ValueError("Empty tag expression")
+    return _Parser(tokens).parse()
+
+
+def any_of(tag_names: List[str]) -> TagExpression:
+    """Expression matching posts with any of ``tag_names`` (feed filter semantics)."""
+    terms = tuple(TagTerm(name) for name in dict.fromkeys(tag_names))
+    return terms[0] if len(terms) == 1 else TagOr(terms)
+
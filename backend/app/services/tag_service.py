@@ -1,12 +1,22 @@
 """Tag service for database operations."""
+from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import select, func
+from sqlalchemy import delete, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.tag import Tag
+from app.db.versions import mark_changed
 from app.models.post_tag import PostTag
+from app.models.tag import Tag
+from app.models.tag_count import TagCount
 from app.schemas.tag import TagCreate
+from app.services.feed_membership_service import FeedMembershipService
+from app.services.feed_service import FeedService
+from app.services.saved_search_service import SavedSearchService
+from app.services.suggest_index import get_suggest_index
+from app.services.tag_bitmap_index import get_tag_bitmap_index
+from app.services.tag_count_service import TagCountService
 
 
 class TagService:
@@ -19,6 +29,7 @@ class TagService:
         session.add(tag)
         await session.commit()
         await session.refresh(tag)
+        get_suggest_index().set_tag(tag.id, tag.name, 0)
         return tag
 
     @staticmethod
@@ -41,13 +52,45 @@ class TagService:
             return tag
         return await TagService.create(session, tag_data)
 
+    @staticmethod
+    async def get_or_create_many(
+        session: AsyncSession,
+        tags_data: List[TagCreate],
+    ) -> dict[str, Tag]:
+        """
+        Get or create tags by name with one insert and one select.
+
+        Missing tags are created with the requested author type; existing
+        tags keep theirs. Does not commit.
+
+        Returns:
+            Mapping of tag name to tag, in request order
+        """
+        by_name = {tag_data.name: tag_data for tag_data in tags_data}
+        if not by_name:
+            return {}
+
+        now = datetime.utcnow()
+        await session.execute(
+            insert(Tag)
+            .values(
+                [
+                    {"name": tag_data.name, "author_type": tag_data.author_type, "created_at": now}
+                    for tag_data in by_name.values()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[Tag.name])
+        )
+        result = await session.execute(select(Tag).where(Tag.name.in_(list(by_name))))
+        tags = {tag.name: tag for tag in result.scalars().all()}
+        return {name: tags[name] for name in by_name if name in tags}
+
     @staticmethod
     async def get_all_with_counts(session: AsyncSession) -> List[tuple[Tag, int]]:
-        """Get all tags with their usage counts."""
+        """Get all tags with their usage counts from the maintained counters."""
         result = await session.execute(
-            select(Tag, func.count(PostTag.tag_id).label("usage_count"))
-            .outerjoin(PostTag, Tag.id == PostTag.tag_id)
-            .group_by(Tag.id)
+            select(Tag, TagCount.post_count)
+            .outerjoin(TagCount, Tag.id == TagCount.tag_id)
             .order_by(Tag.name)
         )
         return [(tag, count or 0) for tag, count in result.all()]
@@ -59,13 +102,151 @@ class TagService:
         return list(result.scalars().all())
 
     @staticmethod
-    async def delete(session: AsyncSession, tag_id: int) -> bool:
-        """Delete a tag."""
+    async def delete(session: AsyncSession, tag_id: int, chunk_size: int = 5000) -> bool:
+        """
+        Delete a tag.
+
+        Its ``post_tags`` rows are removed in chunks of ``chunk_size``, each in
+        its own short transaction, and the tag is dropped from feed filters
+        (whose membership is then rebuilt in the background) and from saved
+        search queries, in the transaction deleting the tag.
+        """
         tag = await TagService.get_by_id(session, tag_id)
         if not tag:
             return False
 
-        await session.delete(tag)
+        while True:
+            chunk = select(PostTag.post_id).where(PostTag.tag_id == tag.id).limit(chunk_size)
+            result = await session.execute(
+                delete(PostTag)
+                .where(PostTag.tag_id == tag.id, PostTag.post_id.in_(chunk))
+                .returning(PostTag.post_id)
+            )
+            removed = len(result.all())
+            if not removed:
+                break
+            await TagCountService.apply_deltas(session, {tag.id: -removed})
+            await session.commit()
+
+        feeds = await FeedService.replace_tag_in_filters(session, tag.name, None)
+        await SavedSearchService.replace_tag_in_queries(session, tag.name, None)
+        for feed in feeds:
+            await FeedMembershipService.reset(session, feed)
+        await session.execute(delete(Tag).where(Tag.id == tag.id))
         await session.commit()
+        get_suggest_index().remove_tag(tag.id)
+        get_tag_bitmap_index().remove_tag(tag.name)
+        for feed in feeds:
+            if feed.tag_filters:
+                FeedMembershipService.start_in_background(feed.id)
         return True
 
+    @staticmethod
+    async def merge(
+        session: AsyncSession,
+        source: Tag,
+        target: Tag,
+        chunk_size: int = 5000,
+    ) -> Tag:
+        """
+        Merge ``source`` into ``target`` and delete ``source``.
+
+        Each chunk moves up to ``chunk_size`` associations with one statement:
+        a DELETE ... RETURNING feeding an INSERT ... ON CONFLICT DO NOTHING,
+        so posts that already carry ``target`` are simply deduplicated.
+        Feed filters and saved search queries referencing ``source`` are
+        rewritten to ``target`` (saved searches are re-anchored), and
+        the membership of every feed filtering on ``target`` is rebuilt in
+        the background (posts moved from ``source`` may have joined them).
+        """
+        if source.id == target.id:
+            return target
+
+        while True:
+            chunk = select(PostTag.post_id).where(PostTag.tag_id == source.id).limit(chunk_size)
+            moved = (
+                delete(PostTag)
+                .where(PostTag.tag_id == source.id, PostTag.post_id.in_(chunk))
+                .returning(PostTag.post_id, PostTag.author_type)
+                .cte("moved")
+            )
+            inserted = (
+                insert(PostTag)
+                .from_select(
+                    ["post_id", "tag_id", "author_type"],
+                    select(moved.c.post_id, literal(target.id), moved.c.author_type),
+                )
+                .on_conflict_do_nothing()
+                .returning(PostTag.post_id)
+                .cte("inserted")
+            )
+            result = await session.execute(
+                select(
+                    select(func.count()).select_from(moved).scalar_subquery(),
+                    select(func.count()).select_from(inserted).scalar_subquery(),
+                )
+            )
+            removed, added = result.one()
+            if not removed:
+                break
+            # The DML runs inside CTEs, which the session does not see as writes
+            mark_changed(session, ["post_tags"])
+            await TagCountService.apply_deltas(session, {source.id: -removed, target.id: added})
+            await session.commit()
+
+        await FeedService.replace_tag_in_filters(session, source.name, target.name)
+        await SavedSearchService.replace_tag_in_queries(session, source.name, target.name)
+        feeds = await FeedMembershipService.feeds_with_tags(session, [target.name])
+        for feed in feeds:
+            await FeedMembershipService.reset(session, feed)
+        await session.execute(delete(Tag).where(Tag.id == source.id))
+        await session.commit()
+        result = await session.execute(
+            select(TagCount.post_count).where(TagCount.tag_id == target.id)
+        )
+        suggest_index = get_suggest_index()
+        suggest_index.remove_tag(source.id)
+        # Suggest the target with its committed count, posts moved from the source included
+        suggest_index.set_tag(target.id, target.name, result.scalar_one_or_none() or 0)
+        get_tag_bitmap_index().rename_tag(source.name, target.name)
+        for feed in feeds:
+            FeedMembershipService.start_in_background(feed.id)
+        await session.refresh(target)
+        return target
+
+    @staticmethod
+    async def rename(
+        session: AsyncSession,
+        tag: Tag,
+        new_name: str,
+        chunk_size: int = 5000,
+    ) -> Tag:
+        """
+        Rename a tag.
+
+        If a tag named ``new_name`` already exists, ``tag`` is merged into it.
+        Feeds filtering on the old name and saved searches requiring it
+        follow the rename with the same posts; feeds that already filtered on
+        the unused ``new_name`` gain the tag's posts and are rebuilt.
+        """
+        if new_name == tag.name:
+            return tag
+
+        existing = await TagService.get_by_name(session, new_name)
+        if existing:
+            return await TagService.merge(session, tag, existing, chunk_size=chunk_size)
+
+        old_name = tag.name
+        feeds = await FeedMembershipService.feeds_with_tags(session, [new_name])
+        for feed in feeds:
+            await FeedMembershipService.reset(session, feed)
+        await session.execute(update(Tag).where(Tag.id == tag.id).values(name=new_name))
+        await FeedService.replace_tag_in_filters(session, old_name, new_name)
+        await SavedSearchService.replace_tag_in_queries(session, old_name, new_name)
+        await session.commit()
+        get_suggest_index().rename_tag(tag.id, new_name)
+        get_tag_bitmap_index().rename_tag(old_name, new_name)
+        for feed in feeds:
+            FeedMembershipService.start_in_background(feed.id)
+        await session.refresh(tag)
+        return tag
@@ -0,0 +1,127 @@
+"""Multilingual text analyzer shared by search indexing and querying."""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+import snowballstemmer
+
+from app.core.config import get_settings
+
+# Bump whenever analysis output changes: persisted index snapshots built by
+# another version are discarded and rebuilt.
+ANALYZER_VERSION = "1"
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+CYRILLIC_RE = re.compile(r"[Ѐ-ӿ]")
+LATIN_RE = re.compile(r"[a-z]")
+
+# Snowball stemmer name per detected language
+STEMMERS = {
+    "ru": "russian",
+    "en": "english",
+}
+
+STOPWORDS = {
+    "en": frozenset(
+        """
+        a about above after again against all am an and any are as at be because been
+        before being below between both but by can did do does doing down during each
+        few for from further had has have having he her here hers herself him himself
+        his how i if in into is it its itself just me more most my myself no nor not
+        now of off on once only or other our ours ourselves out over own same she
+        should so some such than that the their theirs them themselves then there
+        these they this those through to too under until up very was we were what
+        when where which while who whom why will with you your yours yourself
+        yourselves
+        """.split()
+    ),
+    "ru": frozenset(
+        """
+        а без более бы был была были было быть в вам вас весь во вот все всего всех
+        вы где да даже для до его ее если есть еще же за здесь и из или им их к как
+        какой когда кто ли либо мне может мы на над надо наш не него нее нет ни них
+        но ну о об однако он она они оно от очень по под при с со так также такой
+        там те тем то того тоже той только том ты у уже хотя чего чей чем что чтобы
+        чье чья эта эти это я
+        """.split()
+    ),
+}
+
+
+class Token(NamedTuple):
+    """An analyzed token with its location in the original text."""
+
+    term: str  # Index term (normalized and stemmed)
+    surface: str  # Normalized surface form
+    position: int  # Word position, counting stopwords
+    start: int  # Start offset in the original text
+    end: int  # End offset in the original text
+
+
+class TextAnalyzer:
+    """
+    Turn mixed Russian/English text into index terms.
+
+    Pipeline per word: Unicode normalization (NFKC, case folding, ``ё`` ->
+    ``е``), per-token language detection by script, stopword removal and
+    Snowball stemming. Stems are memoized in a bounded LRU cache keyed by
+    (word, language), which absorbs most of the work because the vocabulary
+    is heavily skewed. Stopwords are dropped but still consume a position,
+    so phrase distances stay faithful to the original text.
+    """
+
+    def __init__(self, stem_cache_size: int = 100_000):
+        self._stemmers = {
+            language: snowballstemmer.stemmer(name) for language, name in STEMMERS.items()
+        }
+        self._stem = lru_cache(maxsize=stem_cache_size)(self._stem_uncached)
+
+    @staticmethod
+    def normalize(word: str) -> str:
+        """Normalize a word: NFKC, case folding and ``ё`` -> ``е``."""
+        return unicodedata.normalize("NFKC", word).casefold().replace("ё", "е")
+
+    @staticmethod
+    def detect_language(word: str) -> Optional[str]:
+        """Detect the language of a normalized word from its script."""
+        if CYRILLIC_RE.search(word):
+            return "ru"
+        if LATIN_RE.search(word):
+            return "en"
+        return None
+
+    def _stem_uncached(self, word: str, language: Optional[str]) -> Optional[str]:
+        """Stem a normalized word, or return None for stopwords."""
+        if language is None:
+            return word
+        if word in STOPWORDS[language]:
+            return None
+        return self._stemmers[language].stemWord(word)
+
+    def analyze(self, text: str) -> List[Token]:
+        """Analyze text into tokens carrying positions and original offsets."""
+        tokens = []
+        if not text:
+            return tokens
+
+        for position, match in enumerate(WORD_RE.finditer(text)):
+            surface = self.normalize(match.group())
+            term = self._stem(surface, self.detect_language(surface))
+            if term:
+                tokens.append(Token(term, surface, position, match.start(), match.end()))
+        return tokens
+
+    def terms(self, text: str) -> List[str]:
+        """Index terms of a text, in order (used for queries)."""
+        return [token.term for token in self.analyze(text)]
+
+    def cache_info(self):
+        """Stem cache statistics (hits, misses, maxsize, currsize)."""
+        return self._stem.cache_info()
+
+
+@lru_cache()
+def get_text_analyzer() -> TextAnalyzer:
+    """Get the process-wide text analyzer."""
+    return TextAnalyzer(stem_cache_size=get_settings().analyzer_stem_cache_size)
@@ -0,0 +1,37 @@
+"""Add data version counters
+
+Revision ID: 30640ff13e7a
+Revises: dafcd36a0f9a
+Create Date: 2026-10-18 21:07:33.415926
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '30640ff13e7a'
+down_revision: Union[str, None] = 'dafcd36a0f9a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('data_versions',
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+    # Counters start at the current time so that validators handed out
+    # against an older copy of the database never match
+    op.execute(
+        "INSERT INTO data_versions (scope, version) "
+        "SELECT scope, (extract(epoch FROM now()) * 1000)::bigint "
+        "FROM unnest(ARRAY['posts', 'tags', 'feeds']) AS scope"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
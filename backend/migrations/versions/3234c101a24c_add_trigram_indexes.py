@@ -0,0 +1,43 @@
+"""Add trigram indexes for substring and fuzzy search
+
+Revision ID: 3234c101a24c
+Revises: 0a828ea126e1
+Create Date: 2026-10-18 15:37:09.870442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3234c101a24c'
+down_revision: Union[str, None] = '0a828ea126e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ('ix_posts_content_trgm', 'posts', 'content'),
+    ('ix_posts_channel_name_trgm', 'posts', 'channel_name'),
+    ('ix_channels_username_trgm', 'channels', 'username'),
+    ('ix_channels_name_trgm', 'channels', 'name'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table_name, column_name in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column_name: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,90 @@
+"""Add post changed_at
+
+Revision ID: 4c1d9e7a2b50
+Revises: 6985f3cdd0ce
+Create Date: 2026-10-19 09:12:44.108263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1d9e7a2b50'
+down_revision: Union[str, None] = '6985f3cdd0ce'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION touch_tagged_posts() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE posts SET changed_at = timezone('utc', now())
+        WHERE id IN (SELECT post_id FROM changed_rows);
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER post_tags_inserted AFTER INSERT ON post_tags
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_tagged_posts()
+    """,
+    """
+    CREATE TRIGGER post_tags_deleted AFTER DELETE ON post_tags
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_tagged_posts()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION touch_posts_of_renamed_tag() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE posts SET changed_at = timezone('utc', now())
+        WHERE id IN (SELECT post_id FROM post_tags WHERE tag_id = NEW.id);
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER tags_renamed AFTER UPDATE OF name ON tags
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION touch_posts_of_renamed_tag()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION touch_moved_post() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.changed_at := timezone('utc', now());
+        RETURN NEW;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER posts_moved BEFORE UPDATE OF published_at ON posts
+    FOR EACH ROW WHEN (OLD.published_at IS DISTINCT FROM NEW.published_at)
+    EXECUTE FUNCTION touch_moved_post()
+    """,
+)
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('changed_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE posts SET changed_at = updated_at")
+    op.alter_column(
+        'posts', 'changed_at', nullable=False, server_default=sa.text("timezone('utc', now())")
+    )
+    op.create_index('ix_posts_changed_at', 'posts', ['changed_at'], unique=False)
+    for statement in TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS posts_moved ON posts")
+    op.execute("DROP TRIGGER IF EXISTS tags_renamed ON tags")
+    op.execute("DROP TRIGGER IF EXISTS post_tags_deleted ON post_tags")
+    op.execute("DROP TRIGGER IF EXISTS post_tags_inserted ON post_tags")
+    op.execute("DROP FUNCTION IF EXISTS touch_moved_post()")
+    op.execute("DROP FUNCTION IF EXISTS touch_posts_of_renamed_tag()")
+    op.execute("DROP FUNCTION IF EXISTS touch_tagged_posts()")
+    op.drop_index('ix_posts_changed_at', table_name='posts')
+    op.drop_column('posts', 'changed_at')
@@ -0,0 +1,35 @@
+"""Add post tag author type
+
+Revision ID: 6985f3cdd0ce
+Revises: 30640ff13e7a
+Create Date: 2026-10-18 23:41:09.527318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6985f3cdd0ce'
+down_revision: Union[str, None] = '30640ff13e7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Created by the initial migration for tags.author_type
+authortype = sa.Enum('LLM', 'HUMAN', name='authortype', create_type=False)
+
+
+def upgrade() -> None:
+    op.add_column('post_tags', sa.Column('author_type', authortype, server_default='HUMAN', nullable=False))
+
+    # Existing assignments were not recorded: attribute them to the tag's author
+    op.execute(
+        "UPDATE post_tags SET author_type = tags.author_type "
+        "FROM tags WHERE tags.id = post_tags.tag_id AND tags.author_type = 'LLM'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('post_tags', 'author_type')
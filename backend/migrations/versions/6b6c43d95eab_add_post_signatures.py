@@ -0,0 +1,45 @@
+"""Add post MinHash signatures and LSH buckets
+
+Revision ID: 6b6c43d95eab
+Revises: a74516df3bcc
+Create Date: 2026-10-18 18:20:47.916352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b6c43d95eab'
+down_revision: Union[str, None] = 'a74516df3bcc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing posts are indexed by scripts/backfill_related.py (or on first lookup)
+    op.create_table('post_signatures',
+    sa.Column('post_id', sa.String(), nullable=False),
+    sa.Column('version', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.Column('shingles', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    op.create_table('post_lsh_buckets',
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.Column('post_id', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'post_id')
+    )
+    op.create_index(op.f('ix_post_lsh_buckets_post_id'), 'post_lsh_buckets', ['post_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_post_lsh_buckets_post_id'), table_name='post_lsh_buckets')
+    op.drop_table('post_lsh_buckets')
+    op.drop_table('post_signatures')
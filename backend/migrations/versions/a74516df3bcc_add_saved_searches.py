@@ -0,0 +1,55 @@
+"""Add saved searches
+
+Revision ID: a74516df3bcc
+Revises: b7da52740430
+Create Date: 2026-10-18 17:42:09.531287
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a74516df3bcc'
+down_revision: Union[str, None] = 'b7da52740430'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('saved_searches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('query', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('saved_search_terms',
+    sa.Column('term', sa.String(length=255), nullable=False),
+    sa.Column('saved_search_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['saved_search_id'], ['saved_searches.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('term', 'saved_search_id')
+    )
+    op.create_index(op.f('ix_saved_search_terms_saved_search_id'), 'saved_search_terms', ['saved_search_id'], unique=False)
+    op.create_table('saved_search_matches',
+    sa.Column('saved_search_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.String(), nullable=False),
+    sa.Column('matched_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['saved_search_id'], ['saved_searches.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('saved_search_id', 'post_id')
+    )
+    op.create_index(op.f('ix_saved_search_matches_post_id'), 'saved_search_matches', ['post_id'], unique=False)
+    op.create_index('ix_saved_search_matches_search_matched', 'saved_search_matches', ['saved_search_id', 'matched_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_saved_search_matches_search_matched', table_name='saved_search_matches')
+    op.drop_index(op.f('ix_saved_search_matches_post_id'), table_name='saved_search_matches')
+    op.drop_table('saved_search_matches')
+    op.drop_index(op.f('ix_saved_search_terms_saved_search_id'), table_name='saved_search_terms')
+    op.drop_table('saved_search_terms')
+    op.drop_table('saved_searches')
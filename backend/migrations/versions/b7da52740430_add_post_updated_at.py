@@ -0,0 +1,31 @@
+"""Add post updated_at
+
+Revision ID: b7da52740430
+Revises: 3234c101a24c
+Create Date: 2026-10-18 16:48:31.205718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7da52740430'
+down_revision: Union[str, None] = '3234c101a24c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Content has not been edited since ingestion as far as we know
+    op.execute("UPDATE posts SET updated_at = created_at")
+    op.alter_column('posts', 'updated_at', nullable=False)
+    op.create_index(op.f('ix_posts_updated_at'), 'posts', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_posts_updated_at'), table_name='posts')
+    op.drop_column('posts', 'updated_at')
@@ -0,0 +1,40 @@
+"""Add tag usage counters
+
+Revision ID: b7f015e5dd3e
+Revises: bbbd4bc83143
+Create Date: 2026-10-18 11:03:17.550921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7f015e5dd3e'
+down_revision: Union[str, None] = 'bbbd4bc83143'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tag_counts',
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.Column('post_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tag_id')
+    )
+    op.create_index(op.f('ix_post_tags_tag_id'), 'post_tags', ['tag_id'], unique=False)
+
+    op.execute(
+        "INSERT INTO tag_counts (tag_id, post_count) "
+        "SELECT tags.id, count(post_tags.tag_id) FROM tags "
+        "LEFT OUTER JOIN post_tags ON tags.id = post_tags.tag_id "
+        "GROUP BY tags.id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_post_tags_tag_id'), table_name='post_tags')
+    op.drop_table('tag_counts')
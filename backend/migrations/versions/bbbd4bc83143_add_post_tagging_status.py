@@ -0,0 +1,47 @@
+"""Add post tagging status
+
+Revision ID: bbbd4bc83143
+Revises: 023fabacfafa
+Create Date: 2026-10-18 10:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bbbd4bc83143'
+down_revision: Union[str, None] = '023fabacfafa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+taggingstatus = sa.Enum('PENDING', 'PROCESSING', 'TAGGED', 'FAILED', name='taggingstatus')
+
+
+def upgrade() -> None:
+    taggingstatus.create(op.get_bind(), checkfirst=True)
+    op.add_column('posts', sa.Column('tagging_status', taggingstatus, server_default='PENDING', nullable=False))
+    op.add_column('posts', sa.Column('tagging_claimed_at', sa.DateTime(), nullable=True))
+
+    # Posts that already carry tags are not part of the backlog
+    op.execute(
+        "UPDATE posts SET tagging_status = 'TAGGED' "
+        "WHERE EXISTS (SELECT 1 FROM post_tags WHERE post_tags.post_id = posts.id)"
+    )
+
+    op.create_index(
+        'ix_posts_tagging_backlog',
+        'posts',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("tagging_status IN ('PENDING', 'PROCESSING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_tagging_backlog', table_name='posts')
+    op.drop_column('posts', 'tagging_claimed_at')
+    op.drop_column('posts', 'tagging_status')
+    taggingstatus.drop(op.get_bind(), checkfirst=True)
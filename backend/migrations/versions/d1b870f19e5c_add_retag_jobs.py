@@ -0,0 +1,45 @@
+"""Add re-tag jobs and post tagger version
+
+Revision ID: d1b870f19e5c
+Revises: b7f015e5dd3e
+Create Date: 2026-10-18 12:26:02.114873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1b870f19e5c'
+down_revision: Union[str, None] = 'b7f015e5dd3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('tagger_version', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True))
+    op.create_table('retag_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tagger_version', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('status', sa.Enum('RUNNING', 'COMPLETED', 'FAILED', name='retagjobstatus'), nullable=False),
+    sa.Column('chunk_size', sa.Integer(), nullable=False),
+    sa.Column('concurrency', sa.Integer(), nullable=False),
+    sa.Column('checkpoint_post_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('processed', sa.Integer(), nullable=False),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(length=1000), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_retag_jobs_tagger_version'), 'retag_jobs', ['tagger_version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_retag_jobs_tagger_version'), table_name='retag_jobs')
+    op.drop_table('retag_jobs')
+    sa.Enum(name='retagjobstatus').drop(op.get_bind(), checkfirst=True)
+    op.drop_column('posts', 'tagger_version')
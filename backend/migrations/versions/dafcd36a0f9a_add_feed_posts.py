@@ -0,0 +1,38 @@
+"""Add materialized feed membership
+
+Revision ID: dafcd36a0f9a
+Revises: e11778821f0d
+Create Date: 2026-10-18 19:24:51.708314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dafcd36a0f9a'
+down_revision: Union[str, None] = 'e11778821f0d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing feeds start unmaterialized and are backfilled at startup
+    op.create_table('feed_posts',
+    sa.Column('feed_id', sa.Integer(), nullable=False),
+    sa.Column('published_at', sa.DateTime(), nullable=False),
+    sa.Column('post_id', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['feed_id'], ['feeds.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('feed_id', 'published_at', 'post_id')
+    )
+    op.create_index(op.f('ix_feed_posts_post_id'), 'feed_posts', ['post_id'], unique=False)
+    op.add_column('feeds', sa.Column('materialized_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feeds', 'materialized_at')
+    op.drop_index(op.f('ix_feed_posts_post_id'), table_name='feed_posts')
+    op.drop_table('feed_posts')
@@ -0,0 +1,28 @@
+"""Add keyset pagination indexes
+
+Revision ID: e11778821f0d
+Revises: 6b6c43d95eab
+Create Date: 2026-10-18 18:57:13.402861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e11778821f0d'
+down_revision: Union[str, None] = '6b6c43d95eab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_posts_published_at_id', 'posts', ['published_at', 'id'], unique=False)
+    op.create_index('ix_bookmarks_created_at_id', 'bookmarks', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookmarks_created_at_id', table_name='bookmarks')
+    op.drop_index('ix_posts_published_at_id', table_name='posts')
@@ -0,0 +1,49 @@
+"""CLI script to materialize the membership of custom feeds."""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+
+from app.core.logging import setup_logging
+from app.db.session import AsyncSessionLocal
+from app.models.feed import Feed
+from app.services.feed_membership_service import FeedMembershipService
+
+# Setup logging
+setup_logging()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--feed-id", type=int, default=None, help="Only this feed")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Posts per transaction")
+    parser.add_argument("--all", action="store_true", help="Also re-check materialized feeds (adds missing rows)")
+    return parser.parse_args()
+
+
+async def main():
+    """
+    Backfill every feed that is not materialized yet (as the API does at
+    startup), or the given feed. Safe to interrupt and re-run.
+    """
+    args = parse_args()
+    started = time.perf_counter()
+    total = 0
+    async with AsyncSessionLocal() as session:
+        query = select(Feed.id)
+        if args.feed_id is not None:
+            query = query.where(Feed.id == args.feed_id)
+        elif not args.all:
+            query = query.where(Feed.materialized_at.is_(None))
+        feed_ids = list((await session.execute(query.order_by(Feed.id))).scalars().all())
+        for feed_id in feed_ids:
+            count = await FeedMembershipService.backfill(session, feed_id, chunk_size=args.chunk_size)
+            print(f"Feed {feed_id}: {count} posts")
+            total += count
+    seconds = max(time.perf_counter() - started, 1e-9)
+    print(f"Backfilled {total} feed posts in {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,35 @@
+"""CLI script to compute MinHash signatures and LSH buckets for existing posts."""
+import argparse
+import asyncio
+import time
+
+from app.core.logging import setup_logging
+from app.db.session import AsyncSessionLocal
+from app.services.related_service import RelatedService
+
+# Setup logging
+setup_logging()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=500, help="Posts per transaction")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many posts")
+    return parser.parse_args()
+
+
+async def main():
+    """
+    Index every post that has no signature yet, or one computed with other
+    MinHash settings. Safe to interrupt and re-run.
+    """
+    args = parse_args()
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        count = await RelatedService.backfill(session, batch_size=args.batch_size, limit=args.limit)
+    seconds = max(time.perf_counter() - started, 1e-9)
+    print(f"Indexed {count} posts in {seconds:.2f}s ({count / seconds:,.0f} posts/sec)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
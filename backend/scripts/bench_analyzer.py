@@ -0,0 +1,45 @@
+"""CLI script to benchmark the search text analyzer in tokens/sec."""
+import asyncio
+import sys
+import time
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.core.logging import setup_logging
+from app.db.session import AsyncSessionLocal
+from app.models.post import Post
+from app.services.text_analyzer import TextAnalyzer
+
+# Setup logging
+setup_logging()
+
+
+def run_pass(analyzer: TextAnalyzer, texts: list[str]) -> tuple[int, float]:
+    """Analyze every text once, returning (tokens, seconds)."""
+    started = time.perf_counter()
+    tokens = sum(len(analyzer.analyze(text)) for text in texts)
+    return tokens, time.perf_counter() - started
+
+
+async def main():
+    """Analyze the latest posts with a cold and then a warm stem cache."""
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Post.content).order_by(Post.published_at.desc()).limit(limit)
+        )
+        texts = [content or "" for content in result.scalars().all()]
+
+    analyzer = TextAnalyzer(stem_cache_size=get_settings().analyzer_stem_cache_size)
+    print(f"Analyzing {len(texts)} posts")
+    for label in ("cold", "warm"):
+        tokens, seconds = run_pass(analyzer, texts)
+        rate = tokens / seconds if seconds else 0.0
+        print(f"{label}: {tokens} tokens in {seconds:.3f}s ({rate:,.0f} tokens/sec)")
+    print(f"Stem cache: {analyzer.cache_info()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
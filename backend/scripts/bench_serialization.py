@@ -0,0 +1,81 @@
+"""CLI script to benchmark post page serialization in microseconds per post."""
+import asyncio
+import sys
+import time
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import select
+
+from app.core.logging import setup_logging
+from app.db.session import AsyncSessionLocal
+from app.models.post import Post
+from app.schemas.post import PostSchema
+from app.services.post_hydrator import PAGE_ADAPTER, PAGE_LOAD_OPTIONS, PostHydrator
+
+# Setup logging
+setup_logging()
+
+# How FastAPI encodes a route declared with ``response_model=dict``
+DICT_RESPONSE_FIELD = create_model_field(name="Response_dict", type_=dict, mode="serialization")
+
+
+def envelope(data: list) -> dict:
+    return {"data": data, "total": len(data), "has_more": True, "next_cursor": None}
+
+
+async def schema_path(hydrator: PostHydrator, posts: list[Post]) -> bytes:
+    """Previous path: schema validate + dump per post, then response_model validation and encoding."""
+    data = []
+    for post in posts:
+        post_dict = PostSchema.model_validate(post).model_dump()
+        post_dict["tags"] = list(hydrator._tags.get(post.id, ()))
+        post_dict["is_bookmarked"] = post.id in hydrator._bookmarked
+        data.append(post_dict)
+    return await serialize_response(
+        field=DICT_RESPONSE_FIELD, response_content=envelope(data), dump_json=True
+    )
+
+
+async def page_path(hydrator: PostHydrator, posts: list[Post]) -> bytes:
+    """Current path: rows to payload dicts, encoded once by ``PAGE_ADAPTER``."""
+    return PAGE_ADAPTER.dump_json(envelope([hydrator.to_dict(post) for post in posts]))
+
+
+async def run(path, hydrator: PostHydrator, posts: list[Post], rounds: int) -> float:
+    """Serialize the page ``rounds`` times, returning microseconds per post."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await path(hydrator, posts)
+    return (time.perf_counter() - started) / (rounds * len(posts)) * 1e6
+
+
+async def main():
+    """Serialize a page of the latest posts through both paths."""
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Post).options(*PAGE_LOAD_OPTIONS).order_by(Post.published_at.desc()).limit(limit)
+        )
+        posts = list(result.scalars().all())
+        hydrator = PostHydrator(session)
+        await hydrator.load(posts)
+
+    if not posts:
+        print("No posts to serialize")
+        return
+
+    before = await schema_path(hydrator, posts)
+    after = await page_path(hydrator, posts)
+    print(f"Serializing pages of {len(posts)} posts ({len(after)} bytes), {rounds} rounds")
+    print(f"Output identical: {before == after}")
+    for label, path in (("schema + response_model", schema_path), ("page adapter", page_path)):
+        await run(path, hydrator, posts, max(1, rounds // 10))  # Warm up
+        per_post = await run(path, hydrator, posts, rounds)
+        print(f"{label}: {per_post:.2f} us/post ({per_post * len(posts) / 1000:.3f} ms/page)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""CLI script to rebuild the search index snapshot offline, in parallel."""
+import argparse
+import asyncio
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import select
+
+from app.core.logging import setup_logging
+from app.db.session import AsyncSessionLocal
+from app.models.post import Post
+from app.services.search_index import IndexShard, build_shard, merge_shard
+from app.services.search_service import SearchService
+from app.services.search_snapshot import write_snapshot
+from app.services.suggest_index import count_words
+from app.services.suggest_service import WORDS_FILE_SUFFIX, SuggestService
+from app.services.text_analyzer import ANALYZER_VERSION
+
+# Setup logging
+setup_logging()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--shard-size", type=int, default=5000, help="Posts per shard")
+    parser.add_argument("--output", type=Path, default=None, help="Snapshot path (default: SEARCH_SNAPSHOT_PATH)")
+    return parser.parse_args()
+
+
+async def main():
+    """
+    Stream posts in primary-key order through a server-side cursor, index
+    consecutive ID ranges (shards) in a process pool and merge the shards,
+    in order, into one snapshot. The suggestion word counts of the same
+    posts are saved next to it.
+    """
+    args = parse_args()
+    output = args.output or SearchService.snapshot_path()
+    if output is None:
+        raise SystemExit("No output path: pass --output or set SEARCH_SNAPSHOT_PATH")
+
+    loop = asyncio.get_running_loop()
+    merged = IndexShard([], [], [], {})
+    word_counts: Counter = Counter()
+    watermark = None
+    pending: deque[tuple[Future, Future]] = deque()
+    started = time.perf_counter()
+    analyze_done = started
+
+    def merge_next() -> None:
+        shard, words = pending.popleft()
+        merge_shard(merged, shard.result())
+        word_counts.update(words.result())
+
+    print(f"Reindexing with {args.workers} workers, {args.shard_size} posts per shard")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(
+                select(Post.id, Post.content, Post.updated_at)
+                .order_by(Post.id)
+                .execution_options(yield_per=args.shard_size)
+            )
+            async for partition in result.partitions(args.shard_size):
+                docs = [(post_id, content) for post_id, content, _ in partition]
+                for _, _, updated_at in partition:
+                    if watermark is None or updated_at > watermark:
+                        watermark = updated_at
+                pending.append((
+                    pool.submit(build_shard, docs),
+                    pool.submit(count_words, [content for _, content in docs]),
+                ))
+
+                # Bound memory: keep at most two shards per worker in flight
+                while len(pending) > 2 * args.workers:
+                    await loop.run_in_executor(None, merge_next)
+
+        while pending:
+            await loop.run_in_executor(None, merge_next)
+        analyze_done = time.perf_counter()
+
+    write_snapshot(
+        output,
+        doc_ids=merged.doc_ids,
+        doc_lengths=merged.doc_lengths,
+        doc_spans=merged.doc_spans,
+        postings=merged.postings,
+        analyzer_version=ANALYZER_VERSION,
+        watermark=watermark,
+    )
+    words_output = output.with_name(f"{output.name}{WORDS_FILE_SUFFIX}")
+    SuggestService.save_words(words_output, word_counts, watermark)
+    finished = time.perf_counter()
+
+    posts = len(merged.doc_ids)
+    tokens = merged.total_length
+    analyze_seconds = max(analyze_done - started, 1e-9)
+    print(f"Indexed {posts} posts ({tokens} tokens, {len(merged.postings)} terms)")
+    print(
+        f"  stream + analyze + merge: {analyze_seconds:.2f}s "
+        f"({posts / analyze_seconds:,.0f} posts/sec, {tokens / analyze_seconds:,.0f} tokens/sec)"
+    )
+    print(f"  write snapshot: {finished - analyze_done:.2f}s ({output.stat().st_size:,} bytes)")
+    print(f"  suggestion vocabulary: {len(word_counts)} words in {words_output}")
+    print(f"  total: {finished - started:.2f}s")
+    print(f"Wrote {output}; API workers load it on their next start")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
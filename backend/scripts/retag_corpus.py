@@ -0,0 +1,33 @@
+"""CLI script to re-tag the whole corpus against a tagger version."""
+import asyncio
+import sys
+
+from app.core.config import get_settings
+from app.core.logging import setup_logging
+from app.db.session import AsyncSessionLocal
+from app.services.retag_service import RetagService
+
+# Setup logging
+setup_logging()
+
+
+async def main():
+    """Create or resume a re-tag job and run it to completion."""
+    settings = get_settings()
+    tagger_version = sys.argv[1] if len(sys.argv) > 1 else settings.tagger_version
+
+    async with AsyncSessionLocal() as session:
+        job = await RetagService.get_or_create_job(
+            session,
+            tagger_version=tagger_version,
+            chunk_size=settings.retag_chunk_size,
+            concurrency=settings.retag_max_concurrency,
+        )
+
+    print(f"Re-tagging corpus with {tagger_version} (job {job.id}, resuming after {job.checkpoint_post_id!r})")
+    job = await RetagService.run(job.id)
+    print(f"Job {job.id} {job.status.value}: {job.processed} posts processed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+"""After-commit callbacks run on commit only, and once."""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.versions import call_after_commit, track_data_versions
+
+
+class TrackedSession(Session):
+    pass
+
+
+track_data_versions(TrackedSession)
+
+
+def make_session():
+    return TrackedSession(create_engine("sqlite://"))
+
+
+def test_callbacks_run_after_commit_in_order():
+    calls = []
+    with make_session() as session:
+        session.connection()
+        call_after_commit(session, lambda: calls.append(1))
+        call_after_commit(session, lambda: calls.append(2))
+        assert calls == []
+        session.commit()
+        assert calls == [1, 2]
+
+        session.connection()
+        session.commit()
+        assert calls == [1, 2]
+
+
+def test_rollback_drops_callbacks():
+    calls = []
+    with make_session() as session:
+        session.connection()
+        call_after_commit(session, lambda: calls.append(1))
+        session.rollback()
+
+        session.connection()
+        session.commit()
+        assert calls == []
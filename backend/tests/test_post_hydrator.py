@@ -0,0 +1,114 @@
+"""PostHydrator issues a fixed number of queries per page, whatever its size."""
+import asyncio
+import json
+from datetime import datetime
+
+from app.models.post import Post
+from app.models.tag import AuthorType, Tag
+from app.services.post_hydrator import RELATED_PAGE_ADAPTER, SEARCH_PAGE_ADAPTER, PostHydrator
+
+TAG = Tag(id=1, name="nlp", author_type=AuthorType.LLM, created_at=datetime(2024, 1, 1))
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def scalars(self):
+        return FakeResult([row[0] for row in self._rows])
+
+
+class CountingSession:
+    """Answers the hydrator's tag and bookmark queries and counts them."""
+
+    def __init__(self, tagged=(), bookmarked=()):
+        self.tagged = set(tagged)
+        self.bookmarked = set(bookmarked)
+        self.executes = 0
+
+    async def execute(self, statement):
+        self.executes += 1
+        (post_ids,) = [
+            value for value in statement.compile().params.values() if isinstance(value, list)
+        ]
+        if "post_tags" in str(statement):
+            return FakeResult([(post_id, TAG) for post_id in post_ids if post_id in self.tagged])
+        return FakeResult([(post_id,) for post_id in post_ids if post_id in self.bookmarked])
+
+
+def make_posts(count):
+    return [
+        Post(
+            id=f"channel:{number}",
+            channel_name="Channel",
+            channel_username="channel",
+            content=f"Post {number}",
+            original_url=f"https://t.me/channel/{number}",
+            published_at=datetime(2024, 1, 1, 12, number % 60),
+        )
+        for number in range(count)
+    ]
+
+
+def hydrate(posts, **kwargs):
+    session = CountingSession(tagged=[posts[0].id], bookmarked=[posts[-1].id])
+    hydrator = PostHydrator(session)
+    payloads = asyncio.run(hydrator.hydrate(posts, **kwargs))
+    return hydrator, session, payloads
+
+
+def test_query_count_does_not_grow_with_page_size():
+    _, single_session, _ = hydrate(make_posts(1))
+    _, page_session, _ = hydrate(make_posts(50))
+
+    assert single_session.executes == page_session.executes == 2
+
+
+def test_bookmarked_page_skips_bookmark_query():
+    _, session, payloads = hydrate(make_posts(20), bookmarked=True)
+
+    assert session.executes == 1
+    assert all(payload["is_bookmarked"] for payload in payloads)
+
+
+def test_payloads_carry_tags_and_bookmark_flags():
+    posts = make_posts(3)
+    _, _, payloads = hydrate(posts)
+
+    assert [payload["id"] for payload in payloads] == [post.id for post in posts]
+    assert [[tag["name"] for tag in payload["tags"]] for payload in payloads] == [["nlp"], [], []]
+    assert [payload["is_bookmarked"] for payload in payloads] == [False, False, True]
+
+
+def test_loaded_posts_are_not_fetched_again():
+    posts = make_posts(10)
+    session = CountingSession()
+    hydrator = PostHydrator(session)
+
+    async def load_twice():
+        await hydrator.load(posts)
+        await hydrator.load(posts[:5])
+
+    asyncio.run(load_twice())
+    assert session.executes == 2
+
+
+def test_page_adapters_keep_per_post_fields():
+    _, _, payloads = hydrate(make_posts(2))
+    hits = []
+    for payload in payloads:
+        hit = dict(payload, snippet="<mark>Post</mark>")
+        del hit["content"]
+        hits.append(hit)
+    page = {"data": hits, "total": 2, "total_is_estimate": True, "has_more": False, "next_cursor": None}
+
+    encoded = json.loads(SEARCH_PAGE_ADAPTER.dump_json(page))
+    assert [hit["snippet"] for hit in encoded["data"]] == ["<mark>Post</mark>"] * 2
+    assert "content" not in encoded["data"][0]
+
+    related = [dict(payload, similarity=0.5, shared_tags=1) for payload in payloads]
+    encoded = json.loads(RELATED_PAGE_ADAPTER.dump_json({"data": related}))
+    assert [(post["similarity"], post["shared_tags"]) for post in encoded["data"]] == [(0.5, 1)] * 2
@@ -0,0 +1,131 @@
+"""Listing routes issue the same statements for small and large pages.
+
+Statements are counted at the driver (``before_cursor_execute``), so lazy
+loads and hydration queries count as well. Needs a Postgres database:
+set ``TEST_DATABASE_URL``; the tests work in a schema of their own and drop
+it afterwards.
+"""
+import asyncio
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+
+from app.db.session import get_session
+from app.main import app
+from app.models.bookmark import Bookmark
+from app.models.post import Post
+from app.models.post_tag import PostTag
+from app.models.tag import Tag
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+SCHEMA = "route_queries_test"
+POSTS = 60
+PAGE_SIZES = (5, 50)
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_async_engine(
+        TEST_DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1),
+        poolclass=NullPool,
+        connect_args={"options": f"-csearch_path={SCHEMA},public"},
+    )
+    asyncio.run(_create(engine))
+    yield engine
+    asyncio.run(_drop(engine))
+
+
+async def _create(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSession(engine) as session:
+        tags = [Tag(name=f"tag-{number}") for number in range(3)]
+        session.add_all(tags)
+        await session.flush()
+        published = datetime(2024, 1, 1)
+        for number in range(POSTS):
+            post_id = f"channel:{number}"
+            session.add(
+                Post(
+                    id=post_id,
+                    channel_name="Channel",
+                    channel_username="channel",
+                    content=f"Post {number}",
+                    original_url=f"https://t.me/channel/{number}",
+                    published_at=published + timedelta(minutes=number),
+                )
+            )
+            await session.flush()
+            session.add_all(PostTag(post_id=post_id, tag_id=tag.id) for tag in tags[: number % 4])
+            session.add(Bookmark(post_id=post_id, created_at=published + timedelta(minutes=number)))
+        await session.commit()
+
+
+async def _drop(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await engine.dispose()
+
+
+@contextmanager
+def count_statements(engine):
+    """Collect the SQL of every statement sent to the database."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def statements_for(engine, path: str):
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_session():
+        async with sessions() as session:
+            yield session
+            await session.commit()
+
+    async def request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(path)
+        assert response.status_code == 200
+        return response.json()
+
+    app.dependency_overrides[get_session] = override_session
+    try:
+        with count_statements(engine) as statements:
+            page = asyncio.run(request())
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+    return page, statements
+
+
+@pytest.mark.parametrize("route", ["/api/posts", "/api/bookmarks"])
+def test_statement_count_does_not_grow_with_page_size(engine, route):
+    counts = []
+    for limit in PAGE_SIZES:
+        page, statements = statements_for(engine, f"{route}?limit={limit}&count=exact")
+        assert len(page["data"]) == limit
+        assert any(payload["tags"] for payload in page["data"])
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
@@ -0,0 +1,23 @@
+"""Saved queries follow tag renames, merges and deletions."""
+from app.services.query_parser import parse_query
+from app.services.saved_search_service import replace_tag_clause
+
+
+def test_rename_rewrites_every_clause_of_the_tag():
+    query = replace_tag_clause('llama tag:nlp "open weights" TAG:"nlp" tag:nlpx', "nlp", "ml")
+
+    assert query == 'llama tag:ml "open weights" TAG:ml tag:nlpx'
+    assert parse_query(query).tags == ("ml", "nlpx")
+
+
+def test_new_names_with_spaces_are_quoted():
+    query = replace_tag_clause("tag:nlp llama", "nlp", "machine learning")
+
+    assert parse_query(query).tags == ("machine learning",)
+    assert parse_query(query).text == "llama"
+
+
+def test_delete_drops_the_clause_and_keeps_the_rest():
+    query = replace_tag_clause('llama tag:nlp  "open  weights" tag:ml tag:nlp', "nlp", None)
+
+    assert query == 'llama "open  weights" tag:ml'
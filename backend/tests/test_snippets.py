@@ -0,0 +1,20 @@
+"""Snippet windows are snapped to whitespace, or cut hard when there is none."""
+from app.services.snippets import ELLIPSIS, make_snippet
+
+
+def test_window_snaps_to_whitespace():
+    text = "alpha beta gamma delta epsilon zeta eta theta"
+    snippet = make_snippet(text, [(11, 16, "gamma")], {}, 20)
+
+    assert "<mark>gamma</mark>" in snippet
+    assert snippet.startswith(ELLIPSIS) and snippet.endswith(ELLIPSIS)
+    for word in snippet.replace("<mark>", " ").replace("</mark>", " ").strip(ELLIPSIS).split():
+        assert word in text.split()
+
+
+def test_long_token_is_cut_hard():
+    assert make_snippet("x" * 500, [(0, 500, "x")], {}, 50) == "x" * 50 + ELLIPSIS
+
+
+def test_long_token_without_hits_is_cut_hard():
+    assert make_snippet("y" * 500, [], {}, 50) == "y" * 50 + ELLIPSIS
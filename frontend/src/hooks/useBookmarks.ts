@@ -12,6 +12,8 @@ export function useBookmarks(limit = 20, page = 1) {
       bookmarksApi.getBookmarks({
         limit,
         offset,
+        // The page numbers of BookmarksPage come from `total`
+        count: 'exact',
       }),
   });
 }
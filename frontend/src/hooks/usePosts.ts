@@ -28,6 +28,8 @@ export function usePosts({ feed_id, tags, search, limit = 20, page = 1 }: UsePos
         feed_id,
         tags,
         search,
+        // The page numbers of PostList come from `total`
+        count: 'exact',
       });
       console.log('[DEBUG] usePosts: queryFn COMPLETED with result', result);
       return result;
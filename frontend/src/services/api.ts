@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { Post, Feed, Tag, PaginatedResponse, Channel } from '@/types';
+import type { Post, Feed, Tag, PaginatedResponse, Channel, CountMode } from '@/types';
 
 const api = axios.create({
   baseURL: import.meta.env.VITE_API_URL || 'http://localhost:8000/api',
@@ -92,6 +92,7 @@ export const postsApi = {
     feed_id?: string;
     tags?: string[];
     search?: string;
+    count?: CountMode;
   }): Promise<PaginatedResponse<Post>> => {
     console.log('[DEBUG] postsApi.getPosts: Called with params', params);
     console.log('[DEBUG] postsApi.getPosts: MOCK_DATA_ENABLED =', MOCK_DATA_ENABLED);
@@ -324,7 +325,7 @@ export const bookmarksApi = {
     await api.delete(`/bookmarks/${postId}`);
   },
 
-  getBookmarks: async (params: { limit?: number; offset?: number }): Promise<PaginatedResponse<Post>> => {
+  getBookmarks: async (params: { limit?: number; offset?: number; count?: CountMode }): Promise<PaginatedResponse<Post>> => {
     if (MOCK_DATA_ENABLED) {
       await new Promise((resolve) => setTimeout(resolve, 300));
       const { limit = 20, offset = 0 } = params;
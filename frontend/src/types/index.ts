@@ -24,10 +24,14 @@ export interface Feed {
   created_at: string;
 }
 
+// How listing endpoints compute `total`: numbered pagination needs 'exact'
+export type CountMode = 'exact' | 'estimate' | 'none';
+
 export interface PaginatedResponse<T> {
   data: T[];
   total: number;
   has_more: boolean;
+  next_cursor?: string | null;
 }
 
 export interface Channel {